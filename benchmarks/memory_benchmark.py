@@ -0,0 +1,171 @@
+"""
+Measure the peak memory (RSS) of the detection steps over a synthetic trace.
+
+The same run is executed twice, in separate processes: with the compact representations
+(classes with __slots__) and with equivalent classes that keep a per-instance __dict__, which
+is how the classes were stored before. Usage:
+
+    python benchmarks/memory_benchmark.py --nodes 2000 --sessions 100000 --steps 2
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+import argparse
+import itertools
+import os
+import os.path as path
+import resource
+import subprocess
+import sys
+import tempfile
+from random import Random
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+CONFIGURATION = """
+[basic]
+trace_file = {trace_file}
+friend_threshold = 3
+inactive_threshold = 2
+nrof_nodes = {nodes}
+scan_interval = 60
+output_dir = {directory}
+trace_cache = false
+
+[step1]
+enable_output = false
+output_prefix = step1-
+enable_filtering = true
+size_threshold = 3
+
+[step2]
+enable_output = false
+output_prefix = step2-
+enable_filtering = false
+encounters_threshold = 2
+
+[step3]
+enable_output = false
+output_prefix = step3-
+enable_filtering = false
+encounters_threshold = 2
+size_threshold = 3
+
+[step4]
+output_prefix = step4-
+simulation_time = 1296000
+message_ttl = 1296000
+"""
+
+# Classes with compact representations, by module
+COMPACT_CLASSES = (
+    ('mgb.shared.period', 'Period'),
+    ('mgb.local_detection.scan_clock', 'ScanClock'),
+    ('mgb.local_detection.connection', 'Connection'),
+    ('mgb.local_detection.neighbor', 'Neighbor'),
+    ('mgb.local_detection.neighborhood', 'Neighborhood'),
+    ('mgb.local_detection.archived_group', 'ArchivedGroup'),
+    ('mgb.group_merging.group_encounter', 'GroupEncounter'),
+    ('mgb.group_merging.merged_group', 'MergedGroup'),
+    ('mgb.neighborhood_inspection.multi_merged_group', 'MultiMergedGroup'),
+)
+
+
+def write_trace(trace_file: str, nodes: int, sessions: int, seed: int) -> None:
+    """Write a trace where small groups of nodes meet for some scan periods."""
+    rng = Random(seed)
+    pending = []
+    with open(trace_file, 'w') as output:
+        for session in range(sessions):
+            time = session * 10.0
+            # Close the connections of finished meetings
+            while pending and pending[0][0] <= time:
+                end, members = pending.pop(0)
+                for node1, node2 in itertools.combinations(members, 2):
+                    output.write(f"{end:.1f} CONN {node1} {node2} down\n")
+            busy = {node for _, members in pending for node in members}
+            members = sorted(rng.sample(range(nodes), rng.randint(3, 6)))
+            if busy.intersection(members):
+                continue
+            for node1, node2 in itertools.combinations(members, 2):
+                output.write(f"{time:.1f} CONN {node1} {node2} up\n")
+            pending.append((time + rng.randint(3, 30) * 60, members))
+            pending.sort()
+        for end, members in pending:
+            for node1, node2 in itertools.combinations(members, 2):
+                output.write(f"{end:.1f} CONN {node1} {node2} down\n")
+
+
+def use_dict_classes() -> None:
+    """Replace the compact classes by subclasses with a per-instance __dict__."""
+    import importlib
+    replacements = {}
+    for module_name, class_name in COMPACT_CLASSES:
+        original = getattr(importlib.import_module(module_name), class_name)
+        replacements[original] = type(class_name, (original,), {})
+    for module in list(sys.modules.values()):
+        if module is None or not module.__name__.startswith('mgb'):
+            continue
+        for name, value in list(vars(module).items()):
+            if isinstance(value, type) and value in replacements:
+                setattr(module, name, replacements[value])
+
+
+def run_child(mode: str, config_file: str, steps: int) -> None:
+    """Run the first steps of the algorithm and print the peak RSS in KiB."""
+    from mgb.shared import Configuration
+    from mgb.local_detection import LocalDetectionRunner
+    from mgb.group_merging import GroupMergingRunner
+    from mgb.neighborhood_inspection import NeighborhoodInspectionRunner
+    if mode == 'dict':
+        use_dict_classes()
+
+    config = Configuration(config_file)
+    result = LocalDetectionRunner(config).run()
+    if steps >= 2:
+        result = GroupMergingRunner(config).run(result)
+    if steps >= 3:
+        # The runner performs all the configured rounds, as the pipeline does
+        result = NeighborhoodInspectionRunner(config).run(result)
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--nodes', type=int, default=2000)
+    parser.add_argument('--sessions', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--steps', type=int, choices=(1, 2, 3), default=2,
+                        help="Run the steps from 1 up to this one.")
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'CONFIG'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(*args.child, args.steps)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='mgb-benchmark-') as directory:
+        trace_file = path.join(directory, 'trace.txt')
+        write_trace(trace_file, args.nodes, args.sessions, args.seed)
+        config_file = path.join(directory, 'config.ini')
+        with open(config_file, 'w') as output:
+            output.write(CONFIGURATION.format(trace_file=trace_file, nodes=args.nodes,
+                                              directory=directory))
+        print(f"Trace with {path.getsize(trace_file) / 2 ** 20:.1f} MiB, {args.nodes} nodes, "
+              f"steps 1 to {args.steps}")
+
+        peaks = {}
+        for mode in ('dict', 'slots'):
+            output = subprocess.run([sys.executable, __file__, '--child', mode, config_file,
+                                     '--steps', str(args.steps)],
+                                    check=True, stdout=subprocess.PIPE, universal_newlines=True,
+                                    env=dict(os.environ, PYTHONHASHSEED='0'))
+            peaks[mode] = int(output.stdout.split()[-1]) / 1024
+            print(f"{mode:>6}: peak RSS {peaks[mode]:8.1f} MiB")
+        print(f"Reduction: {100 * (1 - peaks['slots'] / peaks['dict']):.1f}%")
+
+
+if __name__ == '__main__':
+    main()
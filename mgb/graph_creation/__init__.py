@@ -6,7 +6,8 @@ path to send messages through.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jun 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
-from mgb.graph_creation.graph_creation_runner import GraphCreationRunner
\ No newline at end of file
+from mgb.graph_creation.graph_store import GraphStore, GraphStoreWriter, GroupGraph, to_csr
+from mgb.graph_creation.graph_creation_runner import GraphCreationRunner
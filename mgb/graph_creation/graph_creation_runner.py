@@ -6,16 +6,18 @@ path to send messages through.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jun 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
+from mgb.graph_creation.graph_store import GraphStoreWriter
 from mgb.neighborhood_inspection import MultiMergedGroup
 from mgb.shared import Configuration
 import logging
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import networkx as nx
-from itertools import permutations
-from math import exp, log
+from itertools import chain
+from math import exp
+import numpy as np
 import pickle
 import os.path as path
 import json
@@ -31,6 +33,13 @@ class GraphCreationRunner(object):
         self._logger.info('Starting creating group graphs.')
         simulation_time = self.config.step4_simulation_time
         message_ttl = self.config.step4_message_ttl
+        output_format = self.config.step4_output_format
+        if output_format not in ('pickle', 'csr'):
+            raise RuntimeError(f"Invalid group graph output format {output_format}.")
+        store = None
+        if output_format == 'csr':
+            store = GraphStoreWriter(path.join(
+                self.config.output_dir, f"{self.config.step4_output_prefix}graphs.mgbgraph"))
 
         for uid, multi_merged_groups in input.items():
             self._logger.debug(f"Processing device {uid}.")
@@ -49,21 +58,27 @@ class GraphCreationRunner(object):
                 groups_weight[group_id] = weight
                 self._logger.debug(f"Group weight {weight}")
 
-            # Build the graph
+            # Build the graph. Only the groups that share members are connected, since the edge
+            # weight of the other pairs is infinite
             self._logger.debug(f"Building the graph")
+            first, second, shared = self._overlaps(multi_merged_groups)
+            sizes = np.array([len(group.members) for group in multi_merged_groups],
+                             dtype=np.int64)
+            weights = np.array([groups_weight[group_id] for group_id in groups_identified],
+                               dtype=np.float64)
+            group_similarity = shared / (sizes[first] + sizes[second] - shared)
+            edge_weight = weights[first] * weights[second] * group_similarity
+            with np.errstate(divide='ignore'):
+                edge_weight = -np.log(edge_weight)
+            if store is not None:
+                # The store has the groups members and encounters too
+                store.add(uid, multi_merged_groups, first, second, edge_weight)
+                continue
             graph = nx.Graph()
-            for group_a_id, group_b_id in permutations(groups_identified, 2):
-                group_a = groups_identified[group_a_id]
-                group_b = groups_identified[group_b_id]
-                group_similarity = len(group_a.members & group_b.members) / len(group_a.members | group_b.members)
-                edge_weight = groups_weight[group_a_id] * groups_weight[group_b_id] * group_similarity
-                self._logger.debug(f"Calculating edge ({group_a_id}, {group_b_id}) with weight {edge_weight}")
-                if edge_weight == 0:
-                    edge_weight = float('inf')
-                else:
-                    edge_weight = -log(edge_weight)
-                graph.add_edge(group_a_id, group_b_id, weight=edge_weight)
-                self._logger.debug(f"Added edge ({group_a_id}, {group_b_id}) with weight {edge_weight}")
+            graph.add_nodes_from(groups_identified)
+            graph.add_weighted_edges_from(zip(first.tolist(), second.tolist(),
+                                              edge_weight.tolist()))
+            self._logger.debug(f"Added {graph.number_of_edges()} edges")
 
             prefix = self.config
             graph_filename = path.join(
@@ -85,3 +100,34 @@ class GraphCreationRunner(object):
                     "encounters": [[p.begin, p.end] for p in group.periods]
                 } for (identifier, group) in groups_identified.items()]
                 json.dump(output_data, groups_output)
+        if store is not None:
+            store.close()
+
+    @staticmethod
+    def _overlaps(groups: List[MultiMergedGroup]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Count the members shared by each pair of groups, from the group x member incidence
+        entries sorted by member: the groups of a member are contiguous, and each one is paired
+        with the next ones.
+        :param groups: The groups.
+        :return: The first and second groups of the pairs that share members, with the first one
+        lower, and the number of members shared, sorted by pair.
+        """
+        sizes = np.array([len(group.members) for group in groups], dtype=np.int64)
+        members = np.fromiter(chain.from_iterable(group.members for group in groups),
+                              dtype=np.int64, count=int(sizes.sum()))
+        owners = np.repeat(np.arange(len(groups), dtype=np.int64), sizes)
+        order = np.lexsort((owners, members))
+        members, owners = members[order], owners[order]
+
+        boundaries = np.flatnonzero(members[1:] != members[:-1]) + 1
+        starts = np.r_[0, boundaries]
+        ends = np.r_[boundaries, len(members)]
+        partners = np.repeat(ends, ends - starts) - np.arange(len(members)) - 1
+        first = np.repeat(np.arange(len(members)), partners)
+        offsets = np.arange(len(first)) - np.repeat(np.cumsum(partners) - partners, partners)
+        second = first + 1 + offsets
+
+        pairs, shared = np.unique(owners[first] * len(groups) + owners[second],
+                                  return_counts=True)
+        return pairs // len(groups), pairs % len(groups), shared
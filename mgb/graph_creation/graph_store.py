@@ -0,0 +1,261 @@
+"""
+Define the GraphStore class, a memory-mappable file with the group graphs of every device, and
+the GraphStoreWriter class that creates it.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Iterator, Sequence, Tuple
+import logging
+import networkx as nx
+import numpy as np
+from mgb.neighborhood_inspection import MultiMergedGroup
+from mgb.shared import ColumnFile
+
+
+def to_csr(number_of_groups: int, first: np.ndarray, second: np.ndarray,
+           weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert the edges of a group graph to compressed sparse row arrays, with each edge in both
+    directions and the neighbors of each group in increasing order.
+    :param number_of_groups: The number of groups.
+    :param first: The first group of each edge.
+    :param second: The second group of each edge.
+    :param weights: The weight of each edge.
+    :return: The indptr, indices and weights arrays.
+    """
+    sources = np.concatenate((first, second)).astype(np.int64)
+    targets = np.concatenate((second, first))
+    order = np.lexsort((targets, sources))
+    indptr = np.zeros(number_of_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=number_of_groups), out=indptr[1:])
+    return indptr, targets[order].astype(np.int32), np.concatenate((weights, weights))[order]
+
+
+class GroupGraph(object):
+    """The group graph of a device, as compressed sparse row (CSR) arrays.
+
+    The groups are identified by their position, as in the graph created by the group graph
+    step. The neighbors of group i are indices[indptr[i]:indptr[i + 1]], in increasing order,
+    with the edge weights at the same positions of weights. Each edge is stored in both
+    directions. The arrays are read-only views of the store file.
+    """
+
+    __slots__ = ('uid', 'indptr', 'indices', 'weights', '_member_offsets', '_members',
+                 '_period_offsets', '_periods')
+
+    def __init__(self, uid: int, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 member_offsets: np.ndarray, members: np.ndarray, period_offsets: np.ndarray,
+                 periods: np.ndarray) -> None:
+        """Create the graph over the stored arrays.
+
+        :param uid: The device identifier.
+        :param indptr: The position of the first neighbor of each group, and the number of
+        neighbors at the end.
+        :param indices: The neighbors of each group.
+        :param weights: The weight of the edge to each neighbor.
+        :param member_offsets: The position of the first member of each group in members, and
+        the position after the last member at the end.
+        :param members: The members of the groups.
+        :param period_offsets: The position of the first encounter of each group in periods, and
+        the position after the last encounter at the end.
+        :param periods: The begin and end of the encounters of the groups.
+        """
+        self.uid = uid
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self._member_offsets = member_offsets
+        self._members = members
+        self._period_offsets = period_offsets
+        self._periods = periods
+
+    @property
+    def number_of_groups(self) -> int:
+        """The number of groups (graph nodes)."""
+        return len(self.indptr) - 1
+
+    @property
+    def number_of_edges(self) -> int:
+        """The number of edges, counting each one once."""
+        return len(self.indices) // 2
+
+    def neighbors(self, group: int) -> np.ndarray:
+        """The neighbors of a group, in increasing order."""
+        return self.indices[self.indptr[group]:self.indptr[group + 1]]
+
+    def neighbor_weights(self, group: int) -> np.ndarray:
+        """The weights of the edges to the neighbors of a group."""
+        return self.weights[self.indptr[group]:self.indptr[group + 1]]
+
+    def members(self, group: int) -> np.ndarray:
+        """The members of a group, in increasing order."""
+        return self._members[self._member_offsets[group]:self._member_offsets[group + 1]]
+
+    def periods(self, group: int) -> np.ndarray:
+        """The encounters of a group, one row with the begin and end of each one."""
+        return self._periods[self._period_offsets[group]:self._period_offsets[group + 1]]
+
+    def to_networkx(self) -> nx.Graph:
+        """Build the networkx graph, equal to the one pickled by the group graph step."""
+        graph = nx.Graph()
+        graph.add_nodes_from(range(self.number_of_groups))
+        sources = np.repeat(np.arange(self.number_of_groups), np.diff(self.indptr))
+        upper = sources < self.indices
+        graph.add_weighted_edges_from(zip(sources[upper].tolist(),
+                                          self.indices[upper].tolist(),
+                                          self.weights[upper].tolist()))
+        return graph
+
+    def __repr__(self) -> str:
+        return f"GroupGraph(uid={self.uid}, groups={self.number_of_groups}, " \
+               f"edges={self.number_of_edges})"
+
+
+class GraphStore(object):
+    """Read the group graphs of all devices from a memory-mapped store file.
+
+    The store is a column file (see ColumnFile), whose header records the number of devices,
+    groups and edges. The arrays of all devices are concatenated, and the offset table (the
+    devices, group_offsets and edge_offsets columns) gives the slice of each device:
+     - the groups of the device at position p are group_offsets[p] to group_offsets[p + 1] in
+       the member_offsets and period_offsets columns, that point into the members and periods
+       columns;
+     - its CSR row pointers are the group_offsets[p] + p to group_offsets[p + 1] + p + 1 values
+       of the indptr column, relative to edge_offsets[p] in the indices and weights columns.
+    Loading a graph only slices the mapped columns, so no data is copied or parsed.
+    """
+
+    MAGIC = b'MGBGRAPH'
+    VERSION = 1
+    COLUMNS = (('devices', '<i8'), ('group_offsets', '<i8'), ('edge_offsets', '<i8'),
+               ('indptr', '<i8'), ('indices', '<i4'), ('weights', '<f8'),
+               ('member_offsets', '<i8'), ('members', '<i8'),
+               ('period_offsets', '<i8'), ('periods', '<f8'))
+
+    def __init__(self, graph_file: str) -> None:
+        """Map the store file.
+
+        :param graph_file: The store file path.
+        :raises ValueError: If the file is not a valid store file.
+        """
+        self._graph_file = graph_file
+        _, self._columns = ColumnFile(graph_file, self.MAGIC, self.VERSION).read()
+        self._positions = {uid: position
+                           for position, uid in enumerate(self._columns['devices'].tolist())}
+
+    @property
+    def graph_file(self) -> str:
+        """The store file path."""
+        return self._graph_file
+
+    @property
+    def devices(self) -> np.ndarray:
+        """The identifiers of the devices, in the order they were stored."""
+        return self._columns['devices']
+
+    def graph(self, uid: int) -> GroupGraph:
+        """Access the group graph of a device.
+
+        :param uid: The device identifier.
+        :return: The graph, over views of the store file.
+        :raises KeyError: If the device is not in the store.
+        """
+        position = self._positions[uid]
+        columns = self._columns
+        first_group, last_group = columns['group_offsets'][position:position + 2].tolist()
+        first_edge, last_edge = columns['edge_offsets'][position:position + 2].tolist()
+        return GroupGraph(
+            uid,
+            columns['indptr'][first_group + position:last_group + position + 1],
+            columns['indices'][first_edge:last_edge],
+            columns['weights'][first_edge:last_edge],
+            columns['member_offsets'][first_group:last_group + 1],
+            columns['members'],
+            columns['period_offsets'][first_group:last_group + 1],
+            columns['periods'].reshape(-1, 2)
+        )
+
+    def __getitem__(self, uid: int) -> GroupGraph:
+        return self.graph(uid)
+
+    def __contains__(self, uid: int) -> bool:
+        return uid in self._positions
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+class GraphStoreWriter(object):
+    """Write the group graphs of the devices in a store file (see GraphStore).
+
+    Each graph is written out as it is added, so the graphs are not kept in memory.
+    """
+
+    __slots__ = ('_graph_file', '_writer', '_devices', '_groups', '_edges', '_members',
+                 '_periods', '_logger')
+
+    def __init__(self, graph_file: str) -> None:
+        """Create a writer without graphs.
+
+        :param graph_file: The store file path.
+        """
+        self._graph_file = graph_file
+        self._writer = ColumnFile(graph_file, GraphStore.MAGIC, GraphStore.VERSION).writer(
+            GraphStore.COLUMNS)
+        for name in ('group_offsets', 'edge_offsets', 'member_offsets', 'period_offsets'):
+            self._writer.append(name, np.zeros(1, dtype=np.int64))
+        self._devices = 0
+        self._groups = 0
+        self._edges = 0
+        self._members = 0
+        self._periods = 0
+        self._logger = logging.getLogger("GraphStore")
+
+    def add(self, uid: int, groups: Sequence[MultiMergedGroup], first: np.ndarray,
+            second: np.ndarray, weights: np.ndarray) -> None:
+        """Add the group graph of a device.
+
+        :param uid: The device identifier.
+        :param groups: The groups, identified by their position.
+        :param first: The first group of each edge.
+        :param second: The second group of each edge.
+        :param weights: The weight of each edge.
+        """
+        indptr, indices, weights = to_csr(len(groups), first, second, weights)
+
+        sizes = np.array([len(group.members) for group in groups], dtype=np.int64)
+        counts = np.array([len(group.periods) for group in groups], dtype=np.int64)
+        members = np.array([member for group in groups for member in group.members],
+                           dtype=np.int64)
+        periods = np.array([bound for group in groups for period in group.periods
+                             for bound in (period.begin, period.end)], dtype=np.float64)
+
+        writer = self._writer
+        writer.append('devices', np.array([uid], dtype=np.int64))
+        writer.append('indptr', indptr)
+        writer.append('indices', indices)
+        writer.append('weights', weights)
+        writer.append('members', members)
+        writer.append('periods', periods)
+        writer.append('member_offsets', self._members + np.cumsum(sizes))
+        writer.append('period_offsets', self._periods + np.cumsum(counts))
+        self._devices += 1
+        self._groups += len(groups)
+        self._edges += len(indices)
+        self._members += len(members)
+        self._periods += int(counts.sum())
+        writer.append('group_offsets', np.array([self._groups], dtype=np.int64))
+        writer.append('edge_offsets', np.array([self._edges], dtype=np.int64))
+
+    def close(self) -> None:
+        """Complete the store file with the graphs added."""
+        header = {'devices': self._devices, 'groups': self._groups, 'edges': self._edges // 2}
+        self._writer.close(header)
+        self._logger.info(f"Stored {self._devices} group graphs in {self._graph_file}")
@@ -7,9 +7,11 @@ Coefficient.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jun 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
 from mgb.group_merging.group_encounter import GroupEncounter
 from mgb.group_merging.merged_group import MergedGroup
+from mgb.group_merging.merged_group_index import MergedGroupIndex
+from mgb.group_merging.group_merger import GroupMerger
 from mgb.group_merging.group_merging_runner import GroupMergingRunner
\ No newline at end of file
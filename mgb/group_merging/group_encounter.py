@@ -4,11 +4,10 @@ Defines the GroupEncounter class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jun 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
-from typing import Set
-from mgb.shared import Period
+from mgb.shared import MemberSet, Period
 
 
 class GroupEncounter(object):
@@ -16,7 +15,9 @@ class GroupEncounter(object):
     Encapsulates information of a group encounter.
     """
 
-    def __init__(self, members: Set[int], start: float, end: float):
+    __slots__ = ('period', 'members')
+
+    def __init__(self, members: MemberSet, start: float, end: float):
         """
         Create a new group encounter.
         :param members: The members present in the encounter.
@@ -26,14 +27,10 @@ class GroupEncounter(object):
         self.period = Period(start, end)
         self.members = members
 
-    def get_similarity_coefficient(self, devices: Set[int]) -> float:
+    def get_similarity_coefficient(self, devices: MemberSet) -> float:
         """
         Return the group similarity considering internal members and a given devices set.
         :param devices: The devices set to check similarity with.
         :return: The similarity coefficient (varies from 0 to 1.0).
         """
-        # safe guard for division by zero
-        if not (self.members or devices):
-            return 0.0
-
-        return len(self.members & devices) / len(self.members | devices)
+        return self.members.similarity(devices)
@@ -0,0 +1,66 @@
+"""
+Define the GroupMerger class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List
+from mgb.group_merging import GroupEncounter, MergedGroup, MergedGroupIndex
+from mgb.shared import MemberSet
+
+if TYPE_CHECKING:
+    # The local detection runner creates mergers, so the module can not be imported here
+    from mgb.local_detection import ArchivedGroup
+
+
+class GroupMerger(object):
+    """
+    Merge the groups archived by each device into the device merged groups, one group at a time.
+
+    It can be given to the local detection engines as the function called with each archived
+    group, so the groups are merged as soon as they are archived and only the merged groups are
+    kept in memory. The groups of a device must be merged in the order they were archived.
+    """
+
+    __slots__ = ('_size_threshold', '_indexes')
+
+    def __init__(self, size_threshold: int = 0):
+        """
+        Creates a merger without groups.
+        :param size_threshold: The minimum number of members of a group. Smaller groups are
+        discarded, as the local detection step filtering does.
+        """
+        self._size_threshold = size_threshold
+        self._indexes: Dict[int, MergedGroupIndex] = {}
+
+    def __call__(self, uid: int, group: 'ArchivedGroup') -> None:
+        """
+        Merge an archived group in the first similar merged group of the device.
+        :param uid: The device identifier.
+        :param group: The archived group.
+        """
+        if len(group.members) < self._size_threshold:
+            return
+        index = self._indexes.get(uid)
+        if index is None:
+            index = self._indexes[uid] = MergedGroupIndex()
+        # The members are copied, since the merged groups update them
+        index.merge(GroupEncounter(MemberSet(group.members), group.started, group.ended))
+
+    def merged(self, uids: Iterable[int]) -> Dict[int, List[MergedGroup]]:
+        """
+        Access the merged groups of each device.
+        :param uids: The devices identifiers, including the ones without groups.
+        :return: The merged groups of each device, in creation order.
+        """
+        result = {}
+        for uid in uids:
+            index = self._indexes.get(uid)
+            result[uid] = [] if index is None else index.groups
+        return result
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self._indexes.values())
@@ -4,13 +4,13 @@ Define the GroupMergingRunner class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jun 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
 from mgb.shared import Configuration
 from typing import Dict, List
-from mgb.local_detection import Neighborhood
-from mgb.group_merging import GroupEncounter, MergedGroup
+from mgb.local_detection import ArchivedGroup
+from mgb.group_merging import GroupMerger, MergedGroup
 import logging
 import os.path as path
 import json
@@ -25,37 +25,31 @@ class GroupMergingRunner(object):
         self.config = config
         self._logger = logging.getLogger('GroupMerging')
 
-    def run(self, input: Dict[int, List[Neighborhood]]) -> Dict[int, List[MergedGroup]]:
+    def run(self, input: Dict[int, List[ArchivedGroup]]) -> Dict[int, List[MergedGroup]]:
         """
         Execute the merging group step.
         :param input: The groups detected by each device in the previous step.
         :return: Merged groups for each device.
         """
         self._logger.info("Starting merging groups.")
-        merged_by_device = {}
-
+        # Each group is merged in the first similar group of its device, in archiving order
+        merger = GroupMerger()
         for uid, neighborhood_list in input.items():
             self._logger.debug(f"Merging groups of device {uid}")
-            if not neighborhood_list:
-                merged_by_device[uid] = []
-                continue
+            for group in neighborhood_list:
+                merger(uid, group)
 
-            encounters = [
-                GroupEncounter(set(neighborhood.entities), neighborhood.started, neighborhood.ended)
-                for neighborhood in neighborhood_list
-            ]
-            first_encounter = encounters.pop(0)
-            merged_groups = [MergedGroup(first_encounter)]
-            for encounter in encounters:
-                has_merged = False
-                for merged_group in merged_groups:
-                    if merged_group.try_merge(encounter):
-                        has_merged = True
-                        break
-                if not has_merged:
-                    merged_groups.append(MergedGroup(encounter))
+        return self.format_output(merger.merged(input))
 
-            merged_by_device[uid] = merged_groups
+    def format_output(self, merged_by_device: Dict[int, List[MergedGroup]]
+                      ) -> Dict[int, List[MergedGroup]]:
+        """
+        Filter the merged groups and write the output files, if enabled.
+        :param merged_by_device: The merged groups of each device.
+        :return: Merged groups for each device.
+        """
+        merged_by_device = dict(merged_by_device)
+        for uid, merged_groups in merged_by_device.items():
             if self.config.step2_enable_filtering:
                 self._logger.debug(f"Filtering merged groups for device {uid}")
                 merged_by_device[uid] = [
@@ -4,7 +4,7 @@ Define the MergedGroup class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jun 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
 from mgb.group_merging import GroupEncounter
@@ -15,6 +15,8 @@ class MergedGroup(object):
     Encapsulates the data of merged groups.
     """
 
+    __slots__ = ('members', 'periods')
+
     def __init__(self, encounter: GroupEncounter):
         """
         Creates a merged group instance.
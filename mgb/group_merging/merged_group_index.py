@@ -0,0 +1,132 @@
+"""
+Define the MergedGroupIndex class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from mgb.group_merging import GroupEncounter, MergedGroup
+from mgb.shared.member_set import popcount
+
+
+class MergedGroupIndex(object):
+    """
+    Keep the merged groups of a device, in creation order, with an inverted index from each
+    member to the groups that contain it.
+
+    An encounter is merged in the first group with similarity coefficient of at least 0.5, as
+    trying each group in order does, but only a few groups are compared with it:
+     - a similarity of 0.5 requires sharing at least half of the encounter members, so a
+       similar group contains at least one of the (n - ceil(n / 2) + 1) encounter members with
+       fewer groups (the device itself, that is in every group, is usually left out);
+     - the similarity is bounded by the ratio of the sizes, so groups with less than half or
+       more than twice the encounter size are skipped.
+
+    The groups can be of other types, built by a factory from the first encounter, like the
+    multi merged groups of the neighborhood inspection step, whose encounters are groups too.
+    """
+
+    __slots__ = ('_factory', '_groups', '_sizes', '_bitmaps', '_members', '_changed', '_merged')
+
+    def __init__(self, factory: Callable[[Any], Any] = MergedGroup):
+        """
+        Creates an empty index.
+        :param factory: Creates a group from its first encounter.
+        """
+        self._factory = factory
+        self._groups: List[Any] = []
+        self._sizes: List[int] = []
+        self._bitmaps: List[int] = []
+        self._members: Dict[int, List[int]] = {}
+        # Positions of the groups whose members changed, in order, and the group and number of
+        # changes when each keyed encounter was last merged
+        self._changed: List[int] = []
+        self._merged: Dict[Hashable, Tuple[int, int]] = {}
+
+    @property
+    def groups(self) -> List[Any]:
+        """
+        The merged groups, in creation order.
+        """
+        return self._groups
+
+    def append(self, group: Any) -> None:
+        """
+        Add a group after the others, without merging it.
+        :param group: The group.
+        """
+        position = len(self._groups)
+        self._groups.append(group)
+        self._sizes.append(len(group.members))
+        self._bitmaps.append(group.members.bits)
+        for member in group.members:
+            self._members.setdefault(member, []).append(position)
+
+    def merge(self, encounter: GroupEncounter, key: Optional[Hashable] = None) -> Any:
+        """
+        Merge an encounter in the first similar group, or create a new group with it.
+        :param encounter: The encounter to merge.
+        :param key: Identifies an encounter merged many times. It can only be given when merging
+        an encounter in a group that already contains it changes nothing. A repeated encounter
+        is skipped when it would go to the group that received it the last time: no group
+        before that one changed its members since, and that group is still similar.
+        :return: The group that received the encounter.
+        """
+        if key is not None:
+            merged = self._merged.get(key)
+            if merged is not None:
+                position, changes = merged
+                bits = encounter.members.bits
+                other = self._bitmaps[position]
+                if all(changed >= position for changed in self._changed[changes:]) and \
+                        2 * popcount(bits & other) >= popcount(bits | other):
+                    return self._groups[position]
+
+        position = self._find(encounter)
+        if position is None:
+            position = len(self._groups)
+            group = self._factory(encounter)
+            self.append(group)
+        else:
+            group = self._groups[position]
+            added = encounter.members - group.members
+            group.try_merge(encounter)
+            if added:
+                self._sizes[position] = len(group.members)
+                self._bitmaps[position] = group.members.bits
+                self._changed.append(position)
+                for member in added:
+                    self._members.setdefault(member, []).append(position)
+        if key is not None:
+            self._merged[key] = (position, len(self._changed))
+        return group
+
+    def _find(self, encounter: GroupEncounter) -> Optional[int]:
+        """
+        Find the first group similar to an encounter.
+        :param encounter: The encounter.
+        :return: The group position or None if there is no similar group.
+        """
+        size = len(encounter.members)
+        if not size:
+            return None
+        prefix = size - (size + 1) // 2 + 1
+        postings = sorted((self._members.get(member, ()) for member in encounter.members),
+                          key=len)
+        candidates = set().union(*postings[:prefix])
+        # The same test of the similarity coefficient, over the members bitmaps
+        bits = encounter.members.bits
+        for position in sorted(candidates):
+            group_size = self._sizes[position]
+            if group_size > 2 * size or 2 * group_size < size:
+                continue
+            other = self._bitmaps[position]
+            if 2 * popcount(bits & other) >= popcount(bits | other):
+                return position
+        return None
+
+    def __len__(self) -> int:
+        return len(self._groups)
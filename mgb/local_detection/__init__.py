@@ -5,12 +5,20 @@ In this step each device runs a local detection algorithm, and defines its own s
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: May 2018
-Modified: May 2018
+Modified: Oct 2026
 """
 
+from mgb.local_detection.scan_clock import ScanClock
 from mgb.local_detection.neighbor import Neighbor
 from mgb.local_detection.neighborhood import Neighborhood
+from mgb.local_detection.archived_group import ArchivedGroup, MemberSetPool
 from mgb.local_detection.device import Device
 from mgb.local_detection.connection import Connection, ConnectionType
+from mgb.local_detection.trace_reader import TraceEvents, TraceReader
+from mgb.local_detection.trace_cache import TraceCache
 from mgb.local_detection.connection_generator import ConnectionGenerator
+from mgb.local_detection.device_pool import DevicePool
+from mgb.local_detection.vectorized_detector import VectorizedDetector
+from mgb.local_detection.checkpoint import Checkpoint
 from mgb.local_detection.local_detection_runner import LocalDetectionRunner
+from mgb.local_detection.stream_runner import EventSource, JsonLinesSink, StreamRunner
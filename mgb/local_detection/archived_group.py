@@ -0,0 +1,112 @@
+"""
+Define the ArchivedGroup and MemberSetPool classes.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Dict, FrozenSet, Iterable, Optional
+from mgb.local_detection import Neighborhood
+
+
+class MemberSetPool(object):
+    """Intern member sets, so equal sets archived by different devices share the same object.
+
+    Every member of a group archives nearly the same set, so most archived sets are repeated.
+    """
+
+    __slots__ = ('_sets',)
+
+    def __init__(self) -> None:
+        """Build an empty pool."""
+        self._sets: Dict[FrozenSet[int], FrozenSet[int]] = {}
+
+    def intern(self, members: Iterable[int]) -> FrozenSet[int]:
+        """Return the pooled set equal to the given members.
+
+        :param members: The members identifiers.
+        """
+        members = frozenset(members)
+        return self._sets.setdefault(members, members)
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+
+class ArchivedGroup(object):
+    """An immutable record of a friends list archived by a device as a group.
+
+    Only the members identifiers and the period the group was seen are kept, since the next
+    steps of the algorithm do not need the neighbors counters.
+    """
+
+    __slots__ = ('_members', '_started', '_ended')
+
+    def __init__(self, members: FrozenSet[int], started: float, ended: float) -> None:
+        """Build the record.
+
+        :param members: The members identifiers, including the device that archived the group.
+        :param started: The time the group was initialized.
+        :param ended: The time the group was archived.
+        """
+        self._members = members
+        self._started = started
+        self._ended = ended
+
+    @classmethod
+    def freeze(cls, neighborhood: Neighborhood,
+               pool: Optional[MemberSetPool] = None) -> 'ArchivedGroup':
+        """Build the record of a friends list.
+
+        :param neighborhood: The friends list.
+        :param pool: The pool used to intern the members set.
+        """
+        members = (frozenset(neighborhood.entities) if pool is None
+                   else pool.intern(neighborhood.entities))
+        return cls(members, neighborhood.started, neighborhood.ended)
+
+    @property
+    def members(self) -> FrozenSet[int]:
+        """Define the members identifiers."""
+        return self._members
+
+    @property
+    def started(self) -> float:
+        """Define the time the group was initialized."""
+        return self._started
+
+    @property
+    def ended(self) -> float:
+        """Define the time the group was archived."""
+        return self._ended
+
+    def interned(self, pool: MemberSetPool) -> 'ArchivedGroup':
+        """Return an equal record whose members set is interned in the given pool.
+
+        :param pool: The pool.
+        """
+        return ArchivedGroup(pool.intern(self._members), self._started, self._ended)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ArchivedGroup):
+            return NotImplemented
+        return (self._members == other._members and self._started == other._started
+                and self._ended == other._ended)
+
+    def __hash__(self) -> int:
+        return hash((self._members, self._started, self._ended))
+
+    def __getstate__(self):
+        return self._members, self._started, self._ended
+
+    def __setstate__(self, state) -> None:
+        self._members, self._started, self._ended = state
+
+    def __repr__(self) -> str:
+        return "ArchivedGroup(members: {!r}, started: {}, ended: {})".format(
+            sorted(self._members), self._started, self._ended)
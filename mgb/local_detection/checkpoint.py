@@ -0,0 +1,122 @@
+"""
+Define the Checkpoint class, a snapshot of an ongoing local detection run.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import os
+import os.path as path
+import pickle
+import struct
+import time as clock
+
+
+class Checkpoint(object):
+    """Periodically store the state of the simulated devices, so a run can be resumed.
+
+    The snapshot file starts with a small header, followed by the pickled state:
+        [magic] [version: uint32] [pickle]
+    The state records the identity of the run (trace file and parameters), the last processed
+    period, the index of the next connection event and the engines. A snapshot is written in a
+    temporary file that replaces the previous one, so a crash while writing keeps the last one.
+    """
+
+    MAGIC = b'MGBCHKPT'
+    VERSION = 1
+
+    def __init__(self, checkpoint_file: str, identity: Dict[str, Any], periods: int = 0,
+                 minutes: float = 0) -> None:
+        """Create the checkpoint handler.
+
+        :param checkpoint_file: The snapshot file path.
+        :param identity: The values that must match for a snapshot to be resumed.
+        :param periods: Write a snapshot every number of processed periods. Zero disables it.
+        :param minutes: Write a snapshot every number of minutes. Zero disables it.
+        """
+        self._checkpoint_file = checkpoint_file
+        self._identity = identity
+        self._periods = periods
+        self._seconds = minutes * 60
+        self._saved_period = 0
+        self._saved_at = clock.monotonic()
+        self._logger = logging.getLogger("Checkpoint")
+
+    @property
+    def checkpoint_file(self) -> str:
+        """The snapshot file path."""
+        return self._checkpoint_file
+
+    @property
+    def is_enabled(self) -> bool:
+        """Check if snapshots are written periodically."""
+        return self._periods > 0 or self._seconds > 0
+
+    def is_due(self, period: int) -> bool:
+        """Check if a snapshot must be written after a period.
+
+        :param period: The last processed period.
+        """
+        if self._periods > 0 and period - self._saved_period >= self._periods:
+            return True
+        return self._seconds > 0 and clock.monotonic() - self._saved_at >= self._seconds
+
+    def save(self, period: int, event: int, engines: List[Any]) -> None:
+        """Write a snapshot.
+
+        :param period: The last processed period.
+        :param event: The index of the first event not processed yet.
+        :param engines: The engines that simulate the devices.
+        """
+        state = {'identity': self._identity, 'period': period, 'event': event,
+                 'engines': engines}
+        os.makedirs(path.dirname(path.abspath(self._checkpoint_file)), exist_ok=True)
+        temporary_file = f"{self._checkpoint_file}.tmp{os.getpid()}"
+        try:
+            with open(temporary_file, 'wb') as output:
+                output.write(self.MAGIC + struct.pack('<I', self.VERSION))
+                pickle.dump(state, output, protocol=pickle.HIGHEST_PROTOCOL)
+                output.flush()
+                os.fsync(output.fileno())
+            os.replace(temporary_file, self._checkpoint_file)
+        finally:
+            if path.exists(temporary_file):
+                os.remove(temporary_file)
+        self._saved_period = period
+        self._saved_at = clock.monotonic()
+        self._logger.info(f"Stored the state of period {period} in {self._checkpoint_file}")
+
+    def load(self) -> Optional[Tuple[int, int, List[Any]]]:
+        """Read the last snapshot.
+
+        :return: The last processed period, the index of the next event and the engines, or
+        None if there is no snapshot.
+        """
+        try:
+            with open(self._checkpoint_file, 'rb') as input:
+                prefix = input.read(len(self.MAGIC) + 4)
+                if not prefix.startswith(self.MAGIC):
+                    raise RuntimeError(f"The file {self._checkpoint_file} is not a checkpoint.")
+                version, = struct.unpack('<I', prefix[len(self.MAGIC):])
+                if version != self.VERSION:
+                    raise RuntimeError(f"The checkpoint {self._checkpoint_file} has an "
+                                       f"unsupported version {version}.")
+                state = pickle.load(input)
+        except FileNotFoundError:
+            return None
+
+        if state['identity'] != self._identity:
+            raise RuntimeError(f"The checkpoint {self._checkpoint_file} was created by a run "
+                               f"with another trace or parameters.")
+        self._saved_period = state['period']
+        self._saved_at = clock.monotonic()
+        return state['period'], state['event'], state['engines']
+
+    def remove(self) -> None:
+        """Remove the snapshot, once the run is complete."""
+        if path.exists(self._checkpoint_file):
+            os.remove(self._checkpoint_file)
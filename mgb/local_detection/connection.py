@@ -4,7 +4,7 @@ Define the Connection class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jan 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
 import enum
@@ -20,6 +20,8 @@ class Connection(object):
         Ex: 1.00 CONN 28 37 up
     """
 
+    __slots__ = ('_time', '_node1', '_node2', '_con_type')
+
     def __init__(self, line: str) -> None:
         """Initialize the connection info with a trace file line information.
         
@@ -31,6 +33,22 @@ class Connection(object):
         self._node2 = int(data[3])
         self._con_type = ConnectionType[data[4].upper()]
 
+    @classmethod
+    def from_values(cls, time: float, node1: int, node2: int, up: bool) -> 'Connection':
+        """Build a connection from already decoded values.
+
+        :param time: The connection time.
+        :param node1: The first node in the connection.
+        :param node2: The second node in the connection.
+        :param up: If the connection is opened (True) or closed (False).
+        """
+        connection = cls.__new__(cls)
+        connection._time = time
+        connection._node1 = node1
+        connection._node2 = node2
+        connection._con_type = ConnectionType.UP if up else ConnectionType.DOWN
+        return connection
+
     @property
     def time(self) -> float:
         return self._time
@@ -5,23 +5,32 @@ according to the scan interval used.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Feb 2018
-Modified: Feb 2018
+Modified: Oct 2026
 """
 
 from typing import Generator, Optional
-from mgb.local_detection import Connection
+from mgb.local_detection import Connection, TraceCache
 
 
 class ConnectionGenerator(object):
-    """Create a generator to load connections from the external file."""
+    """Create a generator to load connections from the external file.
 
-    def __init__(self, input_file: str, scan_interval: float) -> None:
+    When there is a valid trace cache for the input file the connections are read from the
+    memory-mapped cache instead of parsing the text file.
+    """
+
+    def __init__(self, input_file: str, scan_interval: float,
+                 cache_file: Optional[str] = None) -> None:
         self._input_file_path = input_file
+        self._cache_file_path = cache_file
         self._scan_interval = scan_interval
         self._cached = None
         self._limit_time: float = 0
         self._has_finished = False
         self._counter = 0
+        self._input_file = None
+        self._events = None
+        self._position = 0
 
     @property
     def has_finished(self) -> bool:
@@ -29,13 +38,33 @@ class ConnectionGenerator(object):
         return self._has_finished
 
     def __enter__(self) -> 'ConnectionGenerator':
-        """When starting the scope the input file is opened."""
-        self._input_file = open(self._input_file_path, "r", encoding="utf8")
+        """When starting the scope the trace cache or the input file is opened."""
+        self._events = TraceCache(self._input_file_path, self._cache_file_path).load()
+        if self._events is None:
+            self._input_file = open(self._input_file_path, "r", encoding="utf8")
         return self
 
     def __exit__(self, *args) -> None:
         """When exiting the scope the input file is closed."""
-        self._input_file.close()
+        if self._input_file:
+            self._input_file.close()
+        self._events = None
+
+    def _read_connection(self) -> Optional[Connection]:
+        """Read the next connection from the trace cache or the input file."""
+        if self._events is not None:
+            position = self._position
+            if position >= len(self._events):
+                return None
+            self._position += 1
+            events = self._events
+            return Connection.from_values(float(events.time[position]),
+                                          int(events.node1[position]),
+                                          int(events.node2[position]),
+                                          bool(events.up[position]))
+
+        line = self._input_file.readline()
+        return Connection(line) if line else None
 
     def __next__(self) -> Connection:
         """Define the logic of reading connections from the file."""
@@ -49,12 +78,11 @@ class ConnectionGenerator(object):
             else:
                 raise StopIteration()
 
-        line = self._input_file.readline()
-        if not line:
+        connection = self._read_connection()
+        if not connection:
             self._has_finished = True
             raise StopIteration()
 
-        connection = Connection(line)
         if connection.time <= self._limit_time:
             return connection
         else:
@@ -63,7 +91,7 @@ class ConnectionGenerator(object):
 
     def __iter__(self) -> Optional['ConnectionGenerator']:
         """Return itself as an iterator."""
-        if self._input_file or self._cached:
+        if self._input_file or self._events is not None or self._cached:
             self._limit_time += self._scan_interval
             return self
         else:
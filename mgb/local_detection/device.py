@@ -4,11 +4,12 @@ Define the Device class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jan 2018
-Modified: Jan 2018
+Modified: Oct 2026
 """
 
-from typing import Set, List
-from mgb.local_detection import Neighborhood
+from typing import Callable, Set, List, Optional, Tuple
+import heapq
+from mgb.local_detection import ArchivedGroup, MemberSetPool, Neighborhood, ScanClock
 from mgb.shared import Configuration
 
 
@@ -17,20 +18,43 @@ class Device(object):
 
     A mobile device keep track of its neighborhood and executes the local detection part
     of the algorithm.
+
+    The neighbors counters are derived from the scan clock, so a period only requires work
+    when a connection of the device changes or when a counter reaches a threshold. The periods
+    in which strangers can be promoted are kept in a priority queue, and the neighborhoods keep
+    the periods in which their members become inactive.
     """
 
-    def __init__(self, uid: int, config: Configuration) -> None:
+    def __init__(self, uid: int, config: Configuration,
+                 clock: Optional[ScanClock] = None,
+                 on_archive: Optional[Callable[[int, ArchivedGroup], None]] = None,
+                 pool: Optional[MemberSetPool] = None) -> None:
         """Initialize mobile device data.
 
         :param uid: Identifier of the mobile device.
+        :param config: The current configuration.
+        :param clock: A scan clock shared by many devices. When it is not given the device
+        keeps its own clock, advanced by each call to run_local_detection.
+        :param on_archive: Function called with the device identifier and each archived
+        friends list. When it is given the archived lists are not kept by the device.
+        :param pool: The pool used to intern the archived members sets, usually shared by many
+        devices. When it is not given the device keeps its own pool, unless the archived lists
+        are passed to on_archive.
         """
         self._uid = uid
         self._current_connections: Set[int] = set()
+        self._changed_connections: Set[int] = set()
         self._friend_threshold = config.friend_threshold
         self._inactive_threshold = config.inactive_threshold
-        self._strangers = Neighborhood(self._inactive_threshold, self._friend_threshold)
-        self._friends = Neighborhood(self._inactive_threshold, self._friend_threshold)
-        self._archived: List[Neighborhood] = []
+        self._owns_clock = clock is None
+        self._clock = ScanClock() if clock is None else clock
+        self._strangers = self._create_neighborhood()
+        self._friends = self._create_neighborhood()
+        self._promotions: List[Tuple[int, int, int]] = []
+        self._restarted = False
+        self._archived: List[ArchivedGroup] = []
+        self._on_archive = on_archive
+        self._pool = MemberSetPool() if pool is None and on_archive is None else pool
 
     def add_connection(self, uid: int) -> None:
         """Add a new connection in the list.
@@ -38,6 +62,7 @@ class Device(object):
         :param uid: Identifier of the other node in the connection.
         """
         self._current_connections.add(uid)
+        self._changed_connections.add(uid)
 
     def remove_connection(self, uid: int) -> None:
         """Remove a connection from the list.
@@ -45,6 +70,7 @@ class Device(object):
         :param uid: Identifier of the other node in the connection.
         """
         self._current_connections.remove(uid)
+        self._changed_connections.add(uid)
 
     @property
     def uid(self) -> int:
@@ -52,7 +78,7 @@ class Device(object):
         return self._uid
 
     @property
-    def archived(self) -> List[Neighborhood]:
+    def archived(self) -> List[ArchivedGroup]:
         """Access archived friends lists (groups)."""
         return self._archived
 
@@ -66,60 +92,153 @@ class Device(object):
         """Return the current list of strangers."""
         return self._strangers
 
+    @property
+    def next_period(self) -> Optional[int]:
+        """Return the next period in which the device must run even without connection changes.
+
+        It is None when nothing would happen until a connection changes.
+        """
+        candidates = [period for period in (self._strangers.next_crossing,
+                                            self._friends.next_crossing) if period is not None]
+        if self._promotions:
+            candidates.append(self._promotions[0][0])
+        if self._restarted and self._current_connections:
+            candidates.append(self._clock.period + 1)
+        return min(candidates) if candidates else None
+
     def run_local_detection(self, time: float) -> None:
-        """Run the local detection algorithm based on current state."""
-        self._update_friends_connection()
-        self._update_strangers_connection(time)
+        """Run the local detection algorithm based on current state.
+
+        When the scan clock is shared the caller is responsible for advancing it, and the
+        device must be run in every period returned by next_period.
+
+        :param time: The current simulation time.
+        """
+        if self._owns_clock:
+            self._clock.advance()
+        period = self._clock.period
+
+        new_strangers = self._update_connections()
+        self._update_strangers(period, time)
+        self._add_strangers(new_strangers, period, time)
 
         # Check if we need to archive current friend list as a group
         if not self._friends.is_active:
             # When add itself as a member the ended time is adjusted to current time
             self._friends.add(self.uid, time)
             if len(self._friends) > 2:
-                self._archived.append(self._friends)
-            self._friends = Neighborhood(self._inactive_threshold, self._friend_threshold)
-            self._strangers = Neighborhood(self._inactive_threshold, self._friend_threshold)
-
-    def _update_friends_connection(self) -> None:
-        """Update friends information based on current connections.
-
-        An entity in the friends list has its close_counter incremented if there are
-        a connection with it. Otherwise, it has its away_counter incremented.
+                # Only the members and the period are kept, the neighbors are discarded
+                group = ArchivedGroup.freeze(self._friends, self._pool)
+                if self._on_archive is not None:
+                    self._on_archive(self.uid, group)
+                else:
+                    self._archived.append(group)
+            self._friends = self._create_neighborhood()
+            self._strangers = self._create_neighborhood()
+            self._promotions.clear()
+            self._changed_connections.clear()
+            self._restarted = True
+
+    def fast_forward(self, time: float, periods: int, scan_interval: float) -> None:
+        """Run the local detection algorithm over periods without connection changes.
+
+        Only the periods in which a counter reaches a threshold are processed. The result is
+        the same of calling run_local_detection for each period.
+
+        :param time: The simulation time of the first period.
+        :param periods: The number of periods.
+        :param scan_interval: The scan interval in seconds.
         """
-        # Friend with current connection
-        for uid in (self._friends & self._current_connections):
-            self._friends[uid].increment_close()
-
-        # Friends without current connection
-        for uid in (self._friends - self._current_connections):
-            self._friends[uid].increment_away()
-
-    def _update_strangers_connection(self, time: float) -> None:
-        """Update strangers information based on current connections.
-
-        An entity in the strangers list has its close_counter incremented if there are a
-        connection with it. If there are no connection with it, the away counter is incremented.
-        New nodes are added in the strangers list. Nodes with a number of connections greater
-        than the threshold, are transferred to friends list.
-
+        if not self._owns_clock:
+            raise RuntimeError("Devices with a shared clock are fast forwarded by their owner.")
+        first = self._clock.period + 1
+        last = self._clock.period + periods
+        period = first if self._changed_connections else self.next_period
+        while period is not None and period <= last:
+            self._clock.period = period - 1
+            self.run_local_detection(time + (period - first) * scan_interval)
+            period = self.next_period
+        self._clock.period = last
+
+    def _create_neighborhood(self) -> Neighborhood:
+        return Neighborhood(self._inactive_threshold, self._friend_threshold, self._clock)
+
+    def _update_connections(self) -> Set[int]:
+        """Update the streaks of neighbors whose connection changed.
+
+        An entity with a connection has its close streak restarted if it was away, and an entity
+        without connection has its away streak restarted if it was close. The period in which a
+        stranger can be promoted is scheduled.
+
+        :return: The connected nodes that are not tracked yet.
+        """
+        if self._restarted:
+            # Every connection is new after the friends list is archived
+            self._restarted = False
+            self._changed_connections.clear()
+            return set(self._current_connections)
+
+        new_strangers = set()
+        for uid in self._changed_connections:
+            connected = uid in self._current_connections
+            neighbor = self._friends.entities.get(uid)
+            is_friend = neighbor is not None
+            if not is_friend:
+                neighbor = self._strangers.entities.get(uid)
+            if neighbor is None:
+                if connected:
+                    new_strangers.add(uid)
+                continue
+            if connected == neighbor.is_close:
+                continue
+
+            if connected:
+                neighbor.increment_close()
+                if not is_friend:
+                    self._schedule(neighbor.streak_start + self._friend_threshold, uid,
+                                   neighbor.streak_start)
+            else:
+                neighbor.increment_away()
+        self._changed_connections.clear()
+        return new_strangers
+
+    def _update_strangers(self, period: int, time: float) -> None:
+        """Process the strangers thresholds reached until the current period.
+
+        Strangers away for long enough are removed, and strangers close for long enough are
+        transferred to the friends list. Promotions of streaks that were interrupted are ignored.
+
+        :param period: The current period.
+        :param time: The current simulation time.
+        """
+        for uid in self._strangers.update_inactive():
+            self._strangers.remove(uid)
+
+        while self._promotions and self._promotions[0][0] <= period:
+            _, uid, streak_start = heapq.heappop(self._promotions)
+            stranger = self._strangers.entities.get(uid)
+            if stranger is None or stranger.streak_start != streak_start or not stranger.is_close:
+                continue
+            self._strangers.remove(uid)
+            self._friends.add(uid, time)
+            self._friends[uid].start_streak(True)
+
+    def _add_strangers(self, uids: Set[int], period: int, time: float) -> None:
+        """Add new connected nodes in the strangers list.
+
+        :param uids: The candidate nodes.
+        :param period: The current period.
         :param time: The current simulation time.
         """
-        # Strangers without current connection
-        for uid in (self._strangers - self._current_connections):
-            self._strangers[uid].increment_away()
-            # If the entity is inactive, remove it from strangers list
-            if not self._strangers[uid].is_active:
-                self._strangers.remove(uid)
-
-        # Strangers with current connection
-        for uid in (self._strangers & self._current_connections):
-            self._strangers[uid].increment_close()
-            # If the entity is a friend, remove it from strangers list and add it to friends
-            if self._strangers[uid].is_friend:
-                self._strangers.remove(uid)
-                self._friends.add(uid, time)
-
-        # New strangers
-        for uid in (self._current_connections - (self._strangers | self._friends)):
+        for uid in uids:
+            if uid in self._strangers or uid in self._friends:
+                continue
             self._strangers.add(uid, time)
-            self._strangers[uid].increment_close()
+            stranger = self._strangers[uid]
+            stranger.increment_close()
+            # New strangers are only promoted in the next periods
+            self._schedule(max(stranger.streak_start + self._friend_threshold, period + 1),
+                           uid, stranger.streak_start)
+
+    def _schedule(self, period: int, uid: int, streak_start: int) -> None:
+        heapq.heappush(self._promotions, (period, uid, streak_start))
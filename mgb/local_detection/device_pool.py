@@ -0,0 +1,152 @@
+"""
+Define the DevicePool class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import numpy as np
+from mgb.local_detection import ArchivedGroup, Device, MemberSetPool, ScanClock
+from mgb.shared import Configuration
+
+
+class DevicePool(object):
+    """Keep a Device object for each simulated node and feed them with connection events.
+
+    It exposes the same interface of the VectorizedDetector, so the runner can use any of them.
+
+    The devices share a scan clock, and in each period only the devices with connection
+    changes or with a counter reaching a threshold are run.
+    """
+
+    def __init__(self, nrof_nodes: int, config: Configuration,
+                 uids: Optional[Iterable[int]] = None,
+                 on_archive: Optional[Callable[[int, ArchivedGroup], None]] = None) -> None:
+        """Create the devices.
+
+        :param nrof_nodes: Number of devices (identified from 0 to nrof_nodes - 1).
+        :param config: The current configuration.
+        :param uids: Simulate only these devices. The connection events of the other devices
+        are ignored.
+        :param on_archive: Function called with the device identifier and each archived
+        friends list, instead of keeping them in the devices.
+        """
+        self._config = config
+        self._on_archive = on_archive
+        self._clock = ScanClock()
+        # The members sets are only interned when the groups are kept in the devices
+        self._pool = MemberSetPool() if on_archive is None else None
+        uids = range(nrof_nodes) if uids is None else sorted(uids)
+        self._devices = {uid: Device(uid, config, self._clock, on_archive, self._pool)
+                         for uid in uids}
+        self._simulated: Optional[np.ndarray] = None
+        if len(self._devices) < nrof_nodes:
+            self._simulated = np.zeros(nrof_nodes, dtype=bool)
+            self._simulated[list(self._devices)] = True
+        self._touched: Set[int] = set()
+        self._wakeups: List[Tuple[int, int]] = []
+        self._scheduled: Dict[int, int] = {}
+
+    @property
+    def devices(self) -> List[Device]:
+        """Access the simulated devices."""
+        return list(self._devices.values())
+
+    @property
+    def on_archive(self) -> Optional[Callable[[int, ArchivedGroup], None]]:
+        """The function called with each archived friends list, if any."""
+        return self._on_archive
+
+    @property
+    def archived(self) -> Dict[int, List[ArchivedGroup]]:
+        """Access archived friends lists (groups) of each device."""
+        return {uid: device.archived for uid, device in self._devices.items()}
+
+    def add_devices(self, uids: Iterable[int]) -> None:
+        """Create the devices of nodes that are not simulated yet.
+
+        It allows the nodes of a live trace to be discovered as their connections arrive. The
+        new devices start without neighbors, in the current period.
+
+        :param uids: The nodes identifiers.
+        """
+        if self._simulated is not None:
+            raise RuntimeError("Devices can not be added to a pool of a subset of the devices.")
+        for uid in uids:
+            if uid not in self._devices:
+                self._devices[uid] = Device(uid, self._config, self._clock, self._on_archive,
+                                            self._pool)
+
+    def apply(self, node1: np.ndarray, node2: np.ndarray, up: np.ndarray) -> None:
+        """Apply a batch of connection events, in order.
+
+        :param node1: First node of each connection event.
+        :param node2: Second node of each connection event.
+        :param up: If each event opens (True) or closes (False) the connection.
+        """
+        # Each event is split in one event for each device, keeping the order
+        sources = np.column_stack((node1, node2)).ravel().astype(np.int64)
+        targets = np.column_stack((node2, node1)).ravel().astype(np.int64)
+        flags = np.repeat(np.asarray(up, dtype=bool), 2)
+        if self._simulated is not None:
+            keep = self._simulated[sources]
+            sources, targets, flags = sources[keep], targets[keep], flags[keep]
+
+        sources = sources.tolist()
+        self._touched.update(sources)
+        devices = self._devices
+        for uid, other, is_up in zip(sources, targets.tolist(), flags.tolist()):
+            if is_up:
+                devices[uid].add_connection(other)
+            else:
+                devices[uid].remove_connection(other)
+
+    def run_local_detection(self, time: float) -> None:
+        """Run the local detection algorithm of every device.
+
+        :param time: The current simulation time.
+        """
+        period = self._clock.advance()
+        due = self._touched
+        self._touched = set()
+        while self._wakeups and self._wakeups[0][0] <= period:
+            _, uid = heapq.heappop(self._wakeups)
+            if self._scheduled.get(uid) == period:
+                del self._scheduled[uid]
+                due.add(uid)
+        for uid in due:
+            self._run(uid, time)
+
+    def fast_forward(self, time: float, periods: int, scan_interval: float) -> None:
+        """Run the local detection algorithm of every device over periods without events.
+
+        :param time: The simulation time of the first period.
+        :param periods: The number of periods.
+        :param scan_interval: The scan interval in seconds.
+        """
+        first = self._clock.period + 1
+        last = self._clock.period + periods
+        if self._touched:
+            self.run_local_detection(time)
+        while self._wakeups and self._wakeups[0][0] <= last:
+            period = self._wakeups[0][0]
+            self._clock.period = period - 1
+            self.run_local_detection(time + (period - first) * scan_interval)
+        self._clock.period = max(self._clock.period, last)
+
+    def _run(self, uid: int, time: float) -> None:
+        """Run a device and schedule the next period in which it must run.
+
+        :param uid: The device identifier.
+        :param time: The current simulation time.
+        """
+        device = self._devices[uid]
+        device.run_local_detection(time)
+        next_period = device.next_period
+        if next_period is not None and self._scheduled.get(uid) != next_period:
+            self._scheduled[uid] = next_period
+            heapq.heappush(self._wakeups, (next_period, uid))
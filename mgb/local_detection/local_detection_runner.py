@@ -4,16 +4,23 @@ Define the LocalDetectionRunner class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jun 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
-from mgb.local_detection import Neighborhood, ConnectionGenerator, ConnectionType
-from mgb.shared import Configuration
-from typing import Dict, List
+from mgb.local_detection import ArchivedGroup, Checkpoint, MemberSetPool, TraceCache, TraceEvents, \
+    TraceReader
+from mgb.group_merging import GroupMerger, MergedGroup
+from mgb.shared import Configuration, MemberSet, NodeIndex
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
 import logging
-from mgb.local_detection import Device
+from mgb.local_detection import DevicePool, VectorizedDetector
 import os.path as path
 import json
+import os
+import shutil
+import tempfile
+import numpy as np
 
 
 class LocalDetectionRunner(object):
@@ -26,19 +33,40 @@ class LocalDetectionRunner(object):
         self._config = config
         self._logger = logging.getLogger("LocalDetection")
 
-    def run(self) -> Dict[int, List[Neighborhood]]:
+    def run(self, resume: bool = False) -> Dict[int, List[ArchivedGroup]]:
         """
         Executes the local detection step.
+        :param resume: Continue from the last checkpoint, if there is one.
         :return: A dictionary with each device found neighborhood.
         """
+        return self._format_output(self._detect(resume, online=False))
+
+    def run_online(self, resume: bool = False) -> Dict[int, List[MergedGroup]]:
+        """
+        Executes the local detection step merging each group as soon as it is archived, so the
+        archived groups are never accumulated. It is the same of running the group merging
+        step over the (filtered) output of the local detection step, but the output files of
+        this step are not written.
+        :param resume: Continue from the last checkpoint, if there is one.
+        :return: A dictionary with each device merged groups, not filtered yet.
+        """
+        if self._config.step1_enable_output:
+            self._logger.warning("The output of the local detection step is not written when "
+                                 "the groups are merged online.")
+        return self._detect(resume, online=True)
+
+    def _detect(self, resume: bool, online: bool
+                ) -> Union[Dict[int, List[ArchivedGroup]], Dict[int, List[MergedGroup]]]:
+        """
+        Simulates the devices over the trace.
+        :param resume: Continue from the last checkpoint, if there is one.
+        :param online: Merge the groups as soon as they are archived.
+        :return: The groups archived by each device, or the merged groups when online.
+        """
         self._logger.info("Starting the 'Local Detection' step.")
-        number_of_nodes = self._config.nrof_nodes
-        self._logger.info(f"Creating {self._config.nrof_nodes} nodes.")
         self._logger.info(f"Calibrating friend threshold to {self._config.friend_threshold}")
         self._logger.info(f"Calibrating inactive threshold to {self._config.inactive_threshold}")
-        devices = [Device(uid, self._config) for uid in range(number_of_nodes)]
 
-        period = 1
         scan_interval = self._config.scan_interval
         log = f"Starting contact simulation considering a scan interval of {scan_interval} seconds"
         self._logger.info(log)
@@ -48,26 +76,90 @@ class LocalDetectionRunner(object):
         if not path.exists(trace_file):
             raise RuntimeError(f"The trace file {trace_file} does not exists.")
 
-        with ConnectionGenerator(trace_file, scan_interval) as con_gen:
-            while not con_gen.has_finished:
-                self._logger.debug(f"Loading connections from period {period}.")
-                for connection in con_gen:
-                    if connection.con_type == ConnectionType.UP:
-                        devices[connection.node1].add_connection(connection.node2)
-                        devices[connection.node2].add_connection(connection.node1)
-                    elif connection.con_type == ConnectionType.DOWN:
-                        devices[connection.node1].remove_connection(connection.node2)
-                        devices[connection.node2].remove_connection(connection.node1)
-                    else:
-                        raise RuntimeError(f"Invalid connection type {connection}.")
-                self._logger.debug(f"Running local detection algorithm for period {period}")
-                for device in devices:
-                    device.run_local_detection(period * scan_interval)
-                period += 1
-
-        self._logger.debug(f"Processed {period} periods of {scan_interval} seconds.")
+        events = self._load_events(trace_file)
+        self._logger.info(f"Loaded {len(events)} connection events.")
+        index, encoded = self._index_events(events)
+        number_of_nodes = len(index)
+        self._logger.info(f"Creating {number_of_nodes} nodes.")
+        workers = min(self._config.step1_workers, number_of_nodes)
+        checkpoint = self._create_checkpoint(events, online, resume)
+        if workers > 1:
+            if resume or checkpoint.is_enabled:
+                self._logger.warning("Checkpoints are only supported by single process runs.")
+            result = self._run_parallel(events, index, workers, online)
+        else:
+            events = encoded
+            periods = events.periods(scan_interval)
+            restored = checkpoint.load() if resume else None
+            if restored is None:
+                if resume:
+                    self._logger.info(f"There is no checkpoint in {checkpoint.checkpoint_file}, "
+                                      f"starting from the beginning.")
+                engine = self._create_engine(number_of_nodes,
+                                             on_archive=self._create_merger() if online else None)
+                first_period = 1
+            else:
+                period, event, (engine,) = restored
+                self._logger.info(f"Resuming from period {period}, at event {event} of "
+                                  f"{len(events)}.")
+                first_period = period + 1
+            self._simulate([engine], events, periods, self._last_period(periods), first_period,
+                           checkpoint if checkpoint.is_enabled else None)
+            checkpoint.remove()
+            if online:
+                # The merger is restored with the engine, that calls it
+                result = engine.on_archive.merged(range(number_of_nodes))
+            else:
+                result = engine.archived
+
+        if online:
+            return self._decode_merged(result, index)
+        return self._decode(result, index)
+
+    def run_sweep(self, configs: List[Configuration]) -> List[Dict[int, List[ArchivedGroup]]]:
+        """
+        Executes the local detection step for many parameter sets over the same trace.
+        The trace is loaded once, and the parameter sets with the same scan interval are
+        simulated together in a single pass over the events, each one with its own engine.
+        :param configs: The configuration of each parameter set.
+        :return: A dictionary with each device found neighborhood, for each parameter set.
+        """
+        self._logger.info(f"Starting the 'Local Detection' step for {len(configs)} parameter sets.")
+        trace_file = self._config.trace_file
+        if not path.exists(trace_file):
+            raise RuntimeError(f"The trace file {trace_file} does not exists.")
+        events = self._load_events(trace_file)
+        self._logger.info(f"Loaded {len(events)} connection events.")
+        node_index, events = self._index_events(events)
+
+        by_scan_interval: Dict[int, List[int]] = {}
+        for index, config in enumerate(configs):
+            by_scan_interval.setdefault(config.scan_interval, []).append(index)
+
+        results: List[Dict[int, List[ArchivedGroup]]] = [{} for _ in configs]
+        for scan_interval, indexes in by_scan_interval.items():
+            self._logger.info(f"Simulating {len(indexes)} parameter sets with a scan interval of "
+                              f"{scan_interval} seconds.")
+            runners = [LocalDetectionRunner(configs[index]) for index in indexes]
+            engines = [runner._create_engine(len(node_index))
+                       for runner in runners]
+            periods = events.periods(scan_interval)
+            runners[0]._simulate(engines, events, periods, self._last_period(periods))
+            for index, runner, engine in zip(indexes, runners, engines):
+                os.makedirs(runner._config.output_dir, exist_ok=True)
+                results[index] = runner._format_output(
+                    self._decode(engine.archived, node_index))
+        return results
+
+    def _format_output(self, archived: Dict[int, List[ArchivedGroup]]
+                       ) -> Dict[int, List[ArchivedGroup]]:
+        """
+        Filter the archived neighborhoods and write the output files, if enabled.
+        :param archived: The neighborhoods archived by each device.
+        :return: A dictionary with each device found neighborhood.
+        """
         self._logger.info("Formatting output data.")
-        result = {device.uid: device.archived for device in devices}
+        result = dict(archived)
 
         enable_filter = self._config.step1_enable_filtering
         self._logger.debug(f"Using filter: {enable_filter}")
@@ -77,7 +169,7 @@ class LocalDetectionRunner(object):
             for uid, neighborhood_list in result.items():
                 result[uid] = [
                     neighborhood for neighborhood in neighborhood_list
-                    if len(neighborhood.entities) >= size_threshold
+                    if len(neighborhood.members) >= size_threshold
                 ]
 
         if not self._config.step1_enable_output:
@@ -87,15 +179,383 @@ class LocalDetectionRunner(object):
         self._logger.debug(f"Using output prefix {prefix}")
 
         self._logger.info(f"Writing output")
-        for device in devices:
-            filename = path.join(self._config.output_dir, f"{prefix}node{device.uid}.json")
+        for uid, neighborhood_list in archived.items():
+            filename = path.join(self._config.output_dir, f"{prefix}node{uid}.json")
             output_data = [{
                 "started": mn.started,
                 "ended": mn.ended,
-                "members": list(mn.entities)
-            } for mn in device.archived]
+                "members": list(mn.members)
+            } for mn in neighborhood_list]
             self._logger.debug(f"Writing output {filename}")
             with open(filename, 'w', encoding='utf-8') as output:
                 json.dump(output_data, output)
 
         return result
+
+    def detect_shard(self, cache_file: str, uids: Sequence[int], online: bool = False
+                     ) -> Union[Dict[int, List[ArchivedGroup]], Dict[int, List[MergedGroup]]]:
+        """
+        Executes the local detection of a subset of the devices, over the cached trace events.
+        Only the events that touch the given devices are simulated.
+        :param cache_file: The trace cache file path.
+        :param uids: The devices indexes (see _index_events).
+        :param online: Merge the groups as soon as they are archived.
+        :return: A dictionary with the found neighborhoods of the given devices, or their merged
+        groups when online, by index.
+        """
+        events = TraceCache(self._config.trace_file, cache_file).load()
+        if events is None:
+            raise RuntimeError(f"The trace cache {cache_file} is outdated.")
+        index, events = self._index_events(events)
+
+        # The periods are computed over all events, since out of order events are processed in
+        # the period the trace reading is
+        periods = events.periods(self._config.scan_interval)
+        simulated = np.zeros(len(index), dtype=bool)
+        simulated[np.asarray(uids, dtype=np.int64)] = True
+        selected = np.flatnonzero(simulated[np.asarray(events.node1)]
+                                  | simulated[np.asarray(events.node2)])
+
+        merger = self._create_merger() if online else None
+        engine = self._create_engine(len(index), uids, merger)
+        self._simulate([engine], events[selected], periods[selected], self._last_period(periods))
+        return engine.archived if merger is None else merger.merged(uids)
+
+    def detect_segment(self, cache_file: str, begin: int, end: int, first_period: int,
+                       last_period: int) -> Dict[int, List[ArchivedGroup]]:
+        """
+        Executes the local detection of all devices over a time segment of the cached trace.
+        The segment must start at a quiescent point, where the devices have no state.
+        :param cache_file: The trace cache file path.
+        :param begin: The index of the first event of the segment.
+        :param end: The index after the last event of the segment.
+        :param first_period: The period of the first event of the segment.
+        :param last_period: The last period of the segment.
+        :return: A dictionary with each device found neighborhood, by index.
+        """
+        events = TraceCache(self._config.trace_file, cache_file).load()
+        if events is None:
+            raise RuntimeError(f"The trace cache {cache_file} is outdated.")
+        index, events = self._index_events(events)
+
+        segment = events[begin:end]
+        # Out of order events are processed in the period the trace reading is
+        periods = np.maximum(segment.periods(self._config.scan_interval), first_period)
+        engine = self._create_engine(len(index))
+        self._simulate([engine], segment, periods, last_period, first_period)
+        return engine.archived
+
+    def _run_parallel(self, events: TraceEvents, index: NodeIndex, workers: int,
+                      online: bool = False
+                      ) -> Union[Dict[int, List[ArchivedGroup]], Dict[int, List[MergedGroup]]]:
+        """
+        Executes the local detection splitting the devices across a pool of processes.
+        The workers memory-map the events from the trace cache file.
+        :param events: The trace events.
+        :param index: The index of the nodes in the trace.
+        :param workers: The number of processes.
+        :param online: Merge the groups as soon as they are archived, in the workers.
+        :return: A dictionary with each device found neighborhood, or merged groups when online,
+        by index.
+        """
+        trace_file = self._config.trace_file
+        temporary_dir = None
+        cache = TraceCache(trace_file, self._config.trace_cache_file or None)
+        if not self._config.trace_cache or cache.load() is None:
+            temporary_dir = tempfile.mkdtemp(prefix='mgb-')
+            cache = TraceCache(trace_file, path.join(temporary_dir, 'trace.mgbcache'))
+            cache.build(events)
+
+        split = self._config.step1_parallel_split
+        if split not in ('devices', 'time'):
+            raise RuntimeError(f"Invalid parallel split mode {split}.")
+        if split == 'time' and online:
+            # The merged groups of a device can not be stitched, since they depend on all groups
+            self._logger.info("The devices are split when the groups are merged online.")
+            split = 'devices'
+        segments = self._split_time(events, workers) if split == 'time' else []
+        if split == 'time' and len(segments) < 2:
+            self._logger.info("There are no quiescent points to split the trace by time.")
+
+        archived: Dict[int, List[ArchivedGroup]] = {}
+        try:
+            if len(segments) > 1:
+                self._logger.info(f"Running the local detection of {len(segments)} time segments.")
+                with ProcessPoolExecutor(max_workers=len(segments)) as executor:
+                    futures = [executor.submit(_detect_segment, self._config, cache.cache_file,
+                                               *segment) for segment in segments]
+                    # The groups of each segment are stitched in order
+                    for future in futures:
+                        for uid, neighborhoods in future.result().items():
+                            archived.setdefault(uid, []).extend(neighborhoods)
+            else:
+                shards = self._split_devices(events, index, workers)
+                self._logger.info(f"Running the local detection in {len(shards)} processes.")
+                with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+                    futures = [executor.submit(_detect_shard, self._config, cache.cache_file,
+                                               uids, online) for uids in shards]
+                    for future in futures:
+                        archived.update(future.result())
+        finally:
+            if temporary_dir is not None:
+                shutil.rmtree(temporary_dir, ignore_errors=True)
+        if online:
+            return {uid: archived[uid] for uid in sorted(archived)}
+        # The members sets of different processes are interned again, since they are copies
+        pool = MemberSetPool()
+        return {uid: [group.interned(pool) for group in archived[uid]]
+                for uid in sorted(archived)}
+
+    def _split_time(self, events: TraceEvents, workers: int) -> List[Tuple[int, int, int, int]]:
+        """
+        Split the trace in time segments with about the same number of connection events.
+        The segments are cut at quiescent points: after the last event of a period there are no
+        open connections, and the next event comes after every neighbor became inactive, so the
+        devices have no friends or strangers left when the next segment starts.
+        :param events: The trace events.
+        :param workers: The maximum number of segments.
+        :return: The first and end event indexes, and the first and last periods of each segment.
+        """
+        periods = events.periods(self._config.scan_interval)
+        if not len(periods):
+            return []
+        idle = np.asarray(events.idle)
+        idle = idle[idle < len(periods) - 1]
+        gap = max(self._config.inactive_threshold, 1)
+        cuts = idle[periods[idle + 1] - periods[idle] >= gap] + 1
+        if not len(cuts):
+            return []
+
+        targets = len(periods) * np.arange(1, workers) / workers
+        nearest = np.clip(np.searchsorted(cuts, targets), 0, len(cuts) - 1)
+        previous = np.clip(nearest - 1, 0, len(cuts) - 1)
+        closer = np.abs(cuts[previous] - targets) < np.abs(cuts[nearest] - targets)
+        bounds = [0] + np.unique(np.where(closer, cuts[previous], cuts[nearest])).tolist()
+        bounds.append(len(periods))
+        return [(begin, end, int(periods[begin]),
+                 int(periods[end]) - 1 if end < len(periods) else int(periods[-1]))
+                for begin, end in zip(bounds[:-1], bounds[1:])]
+
+    def _split_devices(self, events: TraceEvents, index: NodeIndex,
+                       workers: int) -> List[List[int]]:
+        """
+        Split the devices in ranges with about the same number of connection events.
+        :param events: The trace events.
+        :param index: The index of the nodes in the trace.
+        :param workers: The number of ranges.
+        :return: The devices indexes of each range.
+        """
+        number_of_nodes = len(index)
+        load = np.ones(number_of_nodes, dtype=np.float64)
+        for column in (events.node1, events.node2):
+            load += np.bincount(index.index_of(np.asarray(column)), minlength=number_of_nodes)
+        cumulative = np.cumsum(load)
+        limits = np.searchsorted(cumulative, cumulative[-1] * np.arange(1, workers) / workers)
+        return [shard.tolist() for shard in np.split(np.arange(number_of_nodes), limits)
+                if len(shard)]
+
+    def _simulate(self, engines: Sequence[Union[DevicePool, VectorizedDetector]],
+                  events: TraceEvents, periods: np.ndarray, last_period: int,
+                  first_period: int = 1, checkpoint: Optional[Checkpoint] = None) -> None:
+        """
+        Feed the engines with the connection events, period by period.
+        Periods without connection events are fast forwarded.
+        :param engines: The engines that simulate the devices.
+        :param events: The connection events.
+        :param periods: The period of each event.
+        :param last_period: The last simulated period.
+        :param first_period: The first simulated period. The events of previous periods are
+        considered already processed by the engines.
+        :param checkpoint: Where the state of the engines is periodically stored.
+        """
+        scan_interval = self._config.scan_interval
+        previous = first_period - 1
+        starts, offsets = TraceEvents.split_periods(periods)
+        skipped = int(np.searchsorted(starts, first_period))
+        for index, period in enumerate(starts[skipped:].tolist(), start=skipped):
+            if period - previous > 1:
+                self._logger.debug(f"Fast forwarding periods {previous + 1} to {period - 1}.")
+                for engine in engines:
+                    engine.fast_forward((previous + 1) * scan_interval, period - previous - 1,
+                                        scan_interval)
+            self._logger.debug(f"Loading connections from period {period}.")
+            begin, end = offsets[index], offsets[index + 1]
+            node1, node2 = events.node1[begin:end], events.node2[begin:end]
+            up = events.up[begin:end]
+            self._logger.debug(f"Running local detection algorithm for period {period}")
+            for engine in engines:
+                engine.apply(node1, node2, up)
+                engine.run_local_detection(period * scan_interval)
+            previous = period
+            if checkpoint is not None and checkpoint.is_due(period):
+                checkpoint.save(period, int(offsets[index + 1]), list(engines))
+
+        if last_period > previous:
+            self._logger.debug(f"Fast forwarding periods {previous + 1} to {last_period}.")
+            for engine in engines:
+                engine.fast_forward((previous + 1) * scan_interval, last_period - previous,
+                                    scan_interval)
+        self._logger.debug(f"Processed {last_period} periods of {scan_interval} seconds.")
+
+    @staticmethod
+    def _last_period(periods: np.ndarray) -> int:
+        """
+        Find the last period processed. The first period is processed even for empty traces.
+        :param periods: The period of each event.
+        :return: The last period.
+        """
+        return int(periods[-1]) if len(periods) else 1
+
+    def _create_engine(self, number_of_nodes: int, uids: Optional[Sequence[int]] = None,
+                       on_archive: Optional[Callable[[int, ArchivedGroup], None]] = None
+                       ) -> Union[DevicePool, VectorizedDetector]:
+        """
+        Create the engine that simulates the devices, according to the configuration.
+        :param number_of_nodes: The number of devices.
+        :param uids: Simulate only these devices. By default all devices are simulated.
+        :param on_archive: Function called with each archived group, instead of keeping them.
+        :return: The engine.
+        """
+        engine = self._config.step1_engine
+        if engine == 'device':
+            self._logger.info("Using the device engine.")
+            return DevicePool(number_of_nodes, self._config, uids, on_archive)
+        elif engine == 'vectorized':
+            detector = VectorizedDetector(number_of_nodes, self._config, uids=uids,
+                                          on_archive=on_archive)
+            layout = 'dense' if detector.is_dense else 'sparse'
+            self._logger.info(f"Using the vectorized engine with {layout} layout.")
+            return detector
+        else:
+            raise RuntimeError(f"Invalid local detection engine {engine}.")
+
+    def _create_merger(self) -> GroupMerger:
+        """
+        Create the merger of the archived groups, that discards the groups filtered out by this
+        step.
+        :return: The merger.
+        """
+        return GroupMerger(self._config.step1_size_threshold
+                           if self._config.step1_enable_filtering else 0)
+
+    def _index_events(self, events: TraceEvents) -> Tuple[NodeIndex, TraceEvents]:
+        """
+        Map the node identifiers of the trace to dense indexes, used by the engines.
+        The nodes are the ones in the trace and the identifiers 0 to nrof_nodes - 1, even if
+        they have no connections.
+        :param events: The trace events.
+        :return: The nodes index and the events with the nodes indexes.
+        """
+        index = NodeIndex(np.union1d(events.nodes, np.arange(self._config.nrof_nodes)))
+        if index.is_identity:
+            return index, events
+        return index, TraceEvents(events.time, index.index_of(np.asarray(events.node1)),
+                                  index.index_of(np.asarray(events.node2)), events.up,
+                                  events.idle, np.arange(len(index)))
+
+    @staticmethod
+    def _decode(archived: Dict[int, List[ArchivedGroup]],
+                index: NodeIndex) -> Dict[int, List[ArchivedGroup]]:
+        """
+        Translate the devices and groups members indexes back to the node identifiers.
+        :param archived: The groups archived by each device, by index.
+        :param index: The nodes index.
+        :return: The groups archived by each device, by identifier.
+        """
+        if index.is_identity:
+            return archived
+        ids = index.ids.tolist()
+        pool = MemberSetPool()
+        translated: Dict[FrozenSet[int], FrozenSet[int]] = {}
+        result = {}
+        for uid, groups in archived.items():
+            decoded = []
+            for group in groups:
+                members = translated.get(group.members)
+                if members is None:
+                    members = pool.intern(ids[member] for member in group.members)
+                    translated[group.members] = members
+                decoded.append(ArchivedGroup(members, group.started, group.ended))
+            result[ids[uid]] = decoded
+        return result
+
+    @staticmethod
+    def _decode_merged(merged: Dict[int, List[MergedGroup]],
+                       index: NodeIndex) -> Dict[int, List[MergedGroup]]:
+        """
+        Translate the devices and merged groups members indexes back to the node identifiers.
+        :param merged: The merged groups of each device, by index.
+        :param index: The nodes index.
+        :return: The merged groups of each device, by identifier.
+        """
+        if index.is_identity:
+            return merged
+        ids = index.ids.tolist()
+        for groups in merged.values():
+            for group in groups:
+                group.members = MemberSet(ids[member] for member in group.members)
+        return {ids[uid]: groups for uid, groups in merged.items()}
+
+    def _create_checkpoint(self, events: TraceEvents, online: bool = False,
+                           resume: bool = False) -> Checkpoint:
+        """
+        Create the checkpoint handler of a run over the given events.
+        A snapshot is only resumed by a run with the same trace and parameters. The trace is
+        identified by its size, content hash and events, so it can be moved between runs. The
+        hash is taken from the trace cache when it is up to date.
+        :param events: The trace events.
+        :param online: The groups are merged as soon as they are archived.
+        :param resume: The run resumes from the last checkpoint.
+        :return: The checkpoint handler.
+        """
+        trace_file = self._config.trace_file
+        snapshots = self._config.step1_checkpoint_periods or self._config.step1_checkpoint_minutes
+        content_hash = None
+        if snapshots or resume:
+            # The hash is only needed when a snapshot is written or resumed
+            cache = TraceCache(trace_file, self._config.trace_cache_file or None)
+            content_hash = cache.content_hash()
+        identity = {
+            'trace_size': path.getsize(trace_file),
+            'trace_hash': content_hash,
+            'events': len(events),
+            'first_time': float(events.time[0]) if len(events) else None,
+            'last_time': float(events.time[-1]) if len(events) else None,
+            'nrof_nodes': self._config.nrof_nodes,
+            'friend_threshold': self._config.friend_threshold,
+            'inactive_threshold': self._config.inactive_threshold,
+            'scan_interval': self._config.scan_interval,
+            'engine': self._config.step1_engine,
+            'online': online,
+            'size_threshold': self._config.step1_size_threshold
+            if online and self._config.step1_enable_filtering else None,
+        }
+        checkpoint_file = (self._config.step1_checkpoint_file
+                           or path.join(self._config.output_dir, 'step1.checkpoint'))
+        return Checkpoint(checkpoint_file, identity, self._config.step1_checkpoint_periods,
+                          self._config.step1_checkpoint_minutes)
+
+    def _load_events(self, trace_file: str) -> TraceEvents:
+        """
+        Load the trace events, using the trace cache when it is enabled.
+        :param trace_file: The trace file path.
+        :return: The trace events.
+        """
+        if self._config.trace_cache:
+            cache = TraceCache(trace_file, self._config.trace_cache_file or None)
+            return cache.load_or_build()
+        self._logger.info(f"Loading trace file {trace_file}")
+        return TraceReader(trace_file).read()
+
+
+def _detect_shard(config: Configuration, cache_file: str, uids: Sequence[int], online: bool
+                  ) -> Union[Dict[int, List[ArchivedGroup]], Dict[int, List[MergedGroup]]]:
+    """Run the local detection of a subset of the devices in a worker process."""
+    return LocalDetectionRunner(config).detect_shard(cache_file, uids, online)
+
+
+def _detect_segment(config: Configuration, cache_file: str, begin: int, end: int,
+                    first_period: int, last_period: int) -> Dict[int, List[ArchivedGroup]]:
+    """Run the local detection of a time segment in a worker process."""
+    return LocalDetectionRunner(config).detect_segment(cache_file, begin, end, first_period,
+                                                       last_period)
@@ -4,44 +4,111 @@ Define the neighbor class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jan 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
 
+from typing import Callable, Optional
+from mgb.local_detection import ScanClock
+
+
 class Neighbor(object):
-    """Encapsulate a neighbor tracked by a mobile device."""
+    """Encapsulate a neighbor tracked by a mobile device.
+
+    The neighbor only stores the period in which its current close or away streak started.
+    The counters are derived from the scan clock, so they advance without any work while the
+    streak continues. An optional listener is notified whenever a streak is changed.
+    """
+
+    __slots__ = ('_id', '_clock', '_is_close', '_since', '_inactive_threshold',
+                 '_friend_threshold', '_listener')
 
     # Class attributes
     INACTIVE_THRESHOLD = 5
     FRIEND_THRESHOLD = 10
 
-    def __init__(self, uid: int, inactive_threshold: int, friend_threshold: int) -> None:
-        """Constructor."""
+    def __init__(self, uid: int, inactive_threshold: int, friend_threshold: int,
+                 clock: Optional[ScanClock] = None,
+                 listener: Optional[Callable[['Neighbor'], None]] = None) -> None:
+        """Constructor.
+
+        :param uid: Entity identifier.
+        :param inactive_threshold: Number of consecutive periods away to become inactive.
+        :param friend_threshold: Number of consecutive periods close to become a friend.
+        :param clock: The scan clock of the device. A private clock is used if not given.
+        :param listener: Function called with the neighbor after each change in its streak.
+        """
         self._id = uid
-        self._close_counter = 0
-        self._away_counter = 0
+        self._clock = clock if clock is not None else ScanClock()
+        self._is_close: Optional[bool] = None
+        self._since = self._clock.period
         self._inactive_threshold = inactive_threshold
         self._friend_threshold = friend_threshold
+        self._listener = listener
+
+    def increment_close(self, times: int = 1) -> None:
+        """Increment the close value and reset away value.
+
+        :param times: The number of consecutive increments.
+        """
+        if not self._is_close:
+            self._restart(True)
+        self._since -= times
+        self._notify()
+
+    def increment_away(self, times: int = 1) -> None:
+        """Increment the away value and reset close value.
+
+        :param times: The number of consecutive increments.
+        """
+        if self._is_close is not False:
+            self._restart(False)
+        self._since -= times
+        self._notify()
 
-    def increment_close(self) -> None:
-        """Increment the close value and reset away value."""
-        self._close_counter += 1
-        self._away_counter = 0
+    def start_streak(self, close: bool) -> None:
+        """Start a close or away streak in the current period.
 
-    def increment_away(self) -> None:
-        """Increment the away value and reset close value."""
-        self._away_counter += 1
-        self._close_counter = 0
+        The counter of the streak is zero in the current period and it is incremented as the
+        clock advances.
+
+        :param close: Start a close (True) or an away (False) streak.
+        """
+        self._restart(close)
+        self._notify()
+
+    def _restart(self, close: bool) -> None:
+        self._is_close = close
+        self._since = self._clock.period
+
+    def _notify(self) -> None:
+        if self._listener is not None:
+            self._listener(self)
+
+    @property
+    def is_close(self) -> bool:
+        """Define if the entity is in a close streak."""
+        return bool(self._is_close)
+
+    @property
+    def is_away(self) -> bool:
+        """Define if the entity is in an away streak."""
+        return self._is_close is False
+
+    @property
+    def streak_start(self) -> int:
+        """Define the period in which the counter of the current streak was zero."""
+        return self._since
 
     @property
     def close_counter(self) -> int:
         """Define the consecutive number of times the entity is close."""
-        return self._close_counter
+        return self._clock.period - self._since if self._is_close else 0
 
     @property
     def away_counter(self) -> int:
         """Define the consecutive number of times the entity is away."""
-        return self._away_counter
+        return self._clock.period - self._since if self.is_away else 0
 
     @property
     def uid(self) -> int:
@@ -4,22 +4,40 @@ Define the Neighborhood class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jan 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 
-from typing import Dict, Union, Set, AbstractSet
-from mgb.local_detection import Neighbor
+from typing import Dict, List, Optional, Union, Set, Tuple, AbstractSet
+import heapq
+from mgb.local_detection import Neighbor, ScanClock
+from mgb.shared import MemberSet
 
 
 class Neighborhood(object):
     """Define a neighborhood set.
 
     It stores references to devices in the neighborhood.
+
+    The inactive members are counted incrementally. The members are notified of changes in
+    their streaks, and the periods in which away streaks reach the inactive threshold are kept
+    in a priority queue.
     """
 
-    def __init__(self, inactive_threshold: int, friend_threshold: int) -> None:
-        """Initialize internal dictionary."""
+    __slots__ = ('_entities', '_inactive', '_crossings', '_clock', '_started', '_ended',
+                 '_inactive_threshold', '_friend_threshold')
+
+    def __init__(self, inactive_threshold: int, friend_threshold: int,
+                 clock: Optional[ScanClock] = None) -> None:
+        """Initialize internal dictionary.
+
+        :param inactive_threshold: Number of consecutive periods away to become inactive.
+        :param friend_threshold: Number of consecutive periods close to become a friend.
+        :param clock: The scan clock shared with the neighbors counters.
+        """
         self._entities: Dict[int, Neighbor] = {}
+        self._inactive: Set[int] = set()
+        self._crossings: List[Tuple[int, int, int]] = []
+        self._clock = clock if clock is not None else ScanClock()
         self._started: float = 0
         self._ended: float = 0
         self._inactive_threshold = inactive_threshold
@@ -56,11 +74,36 @@ class Neighborhood(object):
         A group is considered active when at least 50% of the members are active.
         """
         if self:
-            not_active = len([m for m in self.entities.values() if not m.is_active])
-            return (not_active / len(self)) < 0.5
+            self.update_inactive()
+            return (len(self._inactive) / len(self)) < 0.5
         else:
             return True
 
+    @property
+    def next_crossing(self) -> Optional[int]:
+        """Return the next period in which a member becomes inactive if nothing changes."""
+        while self._crossings:
+            _, uid, since = self._crossings[0]
+            member = self._entities.get(uid)
+            if member is not None and member.is_away and member.streak_start == since:
+                return self._crossings[0][0]
+            heapq.heappop(self._crossings)
+        return None
+
+    def update_inactive(self) -> List[int]:
+        """Count the members whose away streak reached the inactive threshold until now.
+
+        :return: The identifiers of the members that became inactive.
+        """
+        result = []
+        while self._crossings and self._crossings[0][0] <= self._clock.period:
+            _, uid, since = heapq.heappop(self._crossings)
+            member = self._entities.get(uid)
+            if member is not None and member.is_away and member.streak_start == since:
+                self._inactive.add(uid)
+                result.append(uid)
+        return result
+
     def add(self, uid: int, time: float) -> None:
         """Add a new entity in the neighborhood list.
 
@@ -70,8 +113,12 @@ class Neighborhood(object):
         if not self.entities:
             self._started = time
         if uid not in self.entities:
-            self.entities[uid] = Neighbor(uid, self._inactive_threshold, self._friend_threshold)
+            member = Neighbor(uid, self._inactive_threshold, self._friend_threshold,
+                              self._clock, self._streak_changed)
+            self.entities[uid] = member
             self._ended = time
+            if not member.is_active:
+                self._inactive.add(uid)
 
     def remove(self, uid: int) -> None:
         """Remove an entity from the neighborhood list.
@@ -80,6 +127,21 @@ class Neighborhood(object):
         """
         if uid in self.entities:
             del self.entities[uid]
+            self._inactive.discard(uid)
+
+    def _streak_changed(self, member: Neighbor) -> None:
+        """Update the inactive members after a change in the streak of a member.
+
+        :param member: The changed member.
+        """
+        self._inactive.discard(member.uid)
+        if not member.is_away:
+            return
+        if not member.is_active:
+            self._inactive.add(member.uid)
+        # A crossing already reached is still queued, so update_inactive reports the member
+        crossing = member.streak_start + self._inactive_threshold
+        heapq.heappush(self._crossings, (crossing, member.uid, member.streak_start))
 
     def group_correlation(self, other: 'MobileNeighborhood') -> float:
         """Calculate the group correlaction coefficient between two groups.
@@ -92,7 +154,7 @@ class Neighborhood(object):
         if not self or not other:
             return 0
         else:
-            return len(self & other) / len(self | other)
+            return MemberSet(self.entities).similarity(MemberSet(other.entities))
 
     def __getitem__(self, uid: int) -> Neighbor:
         """Enable access by key."""
@@ -0,0 +1,38 @@
+"""
+Define the ScanClock class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+
+class ScanClock(object):
+    """Count the scan periods processed by the local detection.
+
+    Neighbors keep the period in which their current close or away streak started, so their
+    counters are derived from the clock instead of being incremented every period. A clock
+    can be shared by many devices.
+    """
+
+    __slots__ = ('period',)
+
+    def __init__(self, period: int = 0) -> None:
+        """Build the clock.
+
+        :param period: The current period.
+        """
+        self.period = period
+
+    def advance(self, periods: int = 1) -> int:
+        """Move the clock forward.
+
+        :param periods: The number of periods to advance.
+        :return: The new current period.
+        """
+        self.period += periods
+        return self.period
+
+    def __repr__(self) -> str:
+        return "ScanClock(period: {})".format(self.period)
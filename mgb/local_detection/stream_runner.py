@@ -0,0 +1,272 @@
+"""
+Define the EventSource, JsonLinesSink and StreamRunner classes, used to run the local detection
+over a live trace.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+import json
+import logging
+import math
+import os
+import select
+import socket
+import sys
+import time as clock
+from mgb.local_detection import ArchivedGroup, Connection, ConnectionType, DevicePool
+from mgb.shared import Configuration
+
+
+class EventSource(object):
+    """Read connections, one per line, from a trace that may still be growing.
+
+    The source can be a file path, '-' for the standard input or 'unix:<path>' to connect to a
+    local socket. When following a file, the end of the file is not the end of the stream: the
+    source waits for new lines to be appended.
+
+    While a live source has no data, it yields None once every poll interval, so the reader can
+    follow the time passing without events.
+    """
+
+    def __init__(self, source: str, follow: bool = False, poll_interval: float = 0.5,
+                 idle_timeout: Optional[float] = None) -> None:
+        """Create the source.
+
+        :param source: The file path, '-' or 'unix:<socket path>'.
+        :param follow: Keep reading a file after reaching its end.
+        :param poll_interval: Seconds to wait before checking a followed file again, which is
+        also the interval of the idle ticks.
+        :param idle_timeout: Stop following a file after this number of seconds without new
+        lines. By default the file is followed forever.
+        """
+        self._source = source
+        self._follow = follow
+        self._poll_interval = poll_interval
+        self._idle_timeout = idle_timeout
+
+    def __iter__(self) -> Iterator[Optional[Connection]]:
+        """Yield the connections as their lines are completed, and None on idle ticks."""
+        if self._source == '-':
+            try:
+                descriptor = sys.stdin.fileno()
+            except (AttributeError, OSError, ValueError):
+                yield from self._parse(sys.stdin)
+                return
+            yield from self._parse(self._split_lines(lambda: self._read_stdin(descriptor)))
+        elif self._source.startswith('unix:'):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.connect(self._source[len('unix:'):])
+                connection.settimeout(self._poll_interval)
+                yield from self._parse(self._split_lines(lambda: self._receive(connection)))
+        else:
+            with open(self._source, 'r', encoding='utf8') as input:
+                yield from self._parse(self._follow_lines(input) if self._follow else input)
+
+    def _follow_lines(self, input: TextIO) -> Iterator[Optional[str]]:
+        """Read the lines of a file that is still being written.
+
+        A line is only returned when it is complete, since the writer can be in the middle of it.
+        None is returned after each poll interval without new lines.
+        """
+        pending = ''
+        idle_since = clock.monotonic()
+        while True:
+            line = input.readline()
+            if not line:
+                if (self._idle_timeout is not None
+                        and clock.monotonic() - idle_since >= self._idle_timeout):
+                    break
+                clock.sleep(self._poll_interval)
+                yield None
+                continue
+            idle_since = clock.monotonic()
+            pending += line
+            if pending.endswith('\n'):
+                yield pending
+                pending = ''
+        if pending:
+            yield pending
+
+    def _read_stdin(self, descriptor: int) -> Optional[bytes]:
+        """Read the data available in the standard input, waiting up to a poll interval.
+
+        :return: The data, empty at the end of the input, or None if there is no data yet.
+        """
+        if not select.select([descriptor], [], [], self._poll_interval)[0]:
+            return None
+        return os.read(descriptor, 1 << 16)
+
+    @staticmethod
+    def _receive(connection: socket.socket) -> Optional[bytes]:
+        """Receive the data available in a socket with a timeout.
+
+        :return: The data, empty when the connection is closed, or None on timeout.
+        """
+        try:
+            return connection.recv(1 << 16)
+        except socket.timeout:
+            return None
+
+    @staticmethod
+    def _split_lines(read: Callable[[], Optional[bytes]]) -> Iterator[Optional[str]]:
+        """Split the data of a stream in lines.
+
+        :param read: Return the next data of the stream, empty at its end, or None if there is
+        no data for a poll interval.
+        :return: The complete lines, and None for each poll interval without data.
+        """
+        pending = b''
+        while True:
+            data = read()
+            if data is None:
+                yield None
+                continue
+            if not data:
+                break
+            *lines, pending = (pending + data).split(b'\n')
+            for line in lines:
+                yield line.decode('utf8')
+        if pending:
+            yield pending.decode('utf8')
+
+    @staticmethod
+    def _parse(lines: Iterable[Optional[str]]) -> Iterator[Optional[Connection]]:
+        for line in lines:
+            if line is None:
+                yield None
+            elif line.strip():
+                yield Connection(line)
+
+
+class JsonLinesSink(object):
+    """Write each archived neighborhood as soon as it is detected, as one JSON object per line."""
+
+    def __init__(self, output: TextIO) -> None:
+        """Create the sink.
+
+        :param output: The output stream.
+        """
+        self._output = output
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """The number of written neighborhoods."""
+        return self._count
+
+    def __call__(self, uid: int, group: ArchivedGroup) -> None:
+        """Write an archived neighborhood.
+
+        :param uid: The device that archived the neighborhood.
+        :param group: The archived neighborhood.
+        """
+        self._output.write(json.dumps({
+            "node": uid,
+            "started": group.started,
+            "ended": group.ended,
+            "members": list(group.members),
+        }) + '\n')
+        self._output.flush()
+        self._count += 1
+
+
+class StreamRunner(object):
+    """Run the local detection while the connection events arrive.
+
+    A scan period is processed as soon as an event of a later period arrives, since the trace
+    is ordered by time, and the last period is processed when the stream ends. The periods also
+    advance while the source is idle: the trace time is taken as the time of the last event
+    plus the wall-clock time elapsed since it arrived, minus the delay allowed for late events.
+    The archived neighborhoods are sent to the sink instead of being kept by the devices. The
+    devices of nodes with identifiers beyond nrof_nodes are created when their first connection
+    arrives.
+    """
+
+    def __init__(self, config: Configuration, sink: JsonLinesSink,
+                 delay: Optional[float] = None) -> None:
+        """Creates a new runner.
+
+        :param config: The current configuration.
+        :param sink: The destination of the archived neighborhoods.
+        :param delay: Seconds an event can arrive after its time. By default one scan interval.
+        """
+        self._config = config
+        self._sink = sink
+        self._delay = config.scan_interval if delay is None else delay
+        self._logger = logging.getLogger("Streaming")
+
+    def run(self, source: EventSource) -> None:
+        """Process the connections of the source until it ends.
+
+        :param source: The connections source, that yields None on idle ticks.
+        """
+        pool = DevicePool(self._config.nrof_nodes, self._config, on_archive=self._sink)
+        current = 1
+        pending: List[Connection] = []
+        # The time of the latest event and the wall-clock time it arrived
+        latest: Optional[Tuple[float, float]] = None
+        try:
+            for connection in source:
+                if connection is None:
+                    if latest is not None:
+                        now = latest[0] + clock.monotonic() - latest[1] - self._delay
+                        current = self._advance(pool, current, pending, self._period_of(now))
+                    continue
+                if latest is None or connection.time >= latest[0]:
+                    latest = (connection.time, clock.monotonic())
+                # Events out of order are processed in the current period
+                current = self._advance(pool, current, pending, self._period_of(connection.time))
+                pending.append(connection)
+        except KeyboardInterrupt:
+            self._logger.info("Stream interrupted.")
+        self._run_period(pool, current, pending)
+        self._logger.info(f"Processed {current} periods and archived {self._sink.count} groups.")
+
+    def _advance(self, pool: DevicePool, current: int, pending: List[Connection],
+                 period: int) -> int:
+        """Process the periods before a period, if it is after the current one.
+
+        :param pool: The devices.
+        :param current: The current period.
+        :param pending: The connections of the current period, cleared when it is processed.
+        :param period: The period reached.
+        :return: The new current period.
+        """
+        if period <= current:
+            return current
+        scan_interval = self._config.scan_interval
+        self._run_period(pool, current, pending)
+        pending.clear()
+        if period - current > 1:
+            pool.fast_forward((current + 1) * scan_interval, period - current - 1, scan_interval)
+        return period
+
+    def _run_period(self, pool: DevicePool, period: int, connections: List[Connection]) -> None:
+        """Apply the connections of a period and run the local detection.
+
+        :param pool: The devices.
+        :param period: The period.
+        :param connections: The connections of the period, in order.
+        """
+        self._logger.debug(f"Running local detection algorithm for period {period}")
+        node1, node2 = [c.node1 for c in connections], [c.node2 for c in connections]
+        pool.add_devices(set(node1).union(node2))
+        pool.apply(node1, node2, [c.con_type == ConnectionType.UP for c in connections])
+        pool.run_local_detection(period * self._config.scan_interval)
+
+    def _period_of(self, time: float) -> int:
+        """Compute the period of an event, as TraceEvents.periods does.
+
+        :param time: The event time.
+        """
+        scan_interval = self._config.scan_interval
+        period = max(math.ceil(time / scan_interval), 1)
+        if time > period * scan_interval:
+            period += 1
+        elif period > 1 and time <= (period - 1) * scan_interval:
+            period -= 1
+        return period
@@ -0,0 +1,245 @@
+"""
+Define the TraceCache class, a binary columnar copy of a parsed trace file.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import os.path as path
+import struct
+import numpy as np
+from mgb.local_detection import TraceEvents, TraceReader
+
+
+class TraceCache(object):
+    """Store the events of a trace file in a memory-mappable binary file.
+
+    The cache file starts with a small header, followed by one array per column:
+        [magic] [version: uint32] [header size: uint32] [json header] [columns...]
+    The JSON header records the identity of the trace file (path, size, modification time and
+    content hash) and the position and length of each column. Columns are aligned to 64 bytes.
+    Besides the events columns, the cache stores the index of the idle points of the trace,
+    where there are no open connections, and the identifiers of the nodes in the trace.
+    """
+
+    MAGIC = b'MGBTRACE'
+    VERSION = 3
+    ALIGNMENT = 64
+    COLUMNS = (('time', '<f8'), ('node1', '<i8'), ('node2', '<i8'), ('up', '|b1'),
+               ('idle', '<i8'), ('nodes', '<i8'))
+
+    def __init__(self, trace_file: str, cache_file: Optional[str] = None) -> None:
+        """Create the cache handler.
+
+        :param trace_file: The trace file path.
+        :param cache_file: The cache file path. By default the cache is a sidecar file created
+        in the same directory of the trace file.
+        """
+        self._trace_file = trace_file
+        self._cache_file = cache_file or f"{trace_file}.mgbcache"
+        self._logger = logging.getLogger("TraceCache")
+
+    @property
+    def cache_file(self) -> str:
+        """The cache file path."""
+        return self._cache_file
+
+    def load(self, check_content: bool = False) -> Optional[TraceEvents]:
+        """Memory-map the cached events if the cache matches the trace file.
+
+        The cache is accepted when the trace path, size and modification time match the
+        recorded ones. If only the modification time changed, the content hash decides, and the
+        new modification time is recorded so the next loads do not hash the trace again.
+
+        :param check_content: Always compare the content hash.
+        :return: The cached events or None if there is no valid cache.
+        """
+        header = self._read_header()
+        if header is None:
+            return None
+
+        identity = self._identity()
+        recorded = header['trace']
+        if recorded['path'] != identity['path'] or recorded['size'] != identity['size']:
+            return None
+        if check_content or recorded['mtime_ns'] != identity['mtime_ns']:
+            if recorded['hash'] != self._content_hash():
+                return None
+            if recorded['mtime_ns'] != identity['mtime_ns']:
+                recorded['mtime_ns'] = identity['mtime_ns']
+                self._rewrite_header(header)
+
+        columns = {
+            column['name']: np.memmap(self._cache_file, dtype=column['dtype'], mode='r',
+                                      offset=column['offset'], shape=(column['length'],))
+            if column['length'] else np.empty(0, dtype=column['dtype'])
+            for column in header['columns']
+        }
+        return TraceEvents(columns['time'], columns['node1'], columns['node2'], columns['up'],
+                           columns['idle'], columns['nodes'])
+
+    def build(self, events: Optional[TraceEvents] = None) -> TraceEvents:
+        """Write the cache file.
+
+        :param events: The already parsed events. If not given the trace file is parsed, and
+        hashed in the same read.
+        :return: The events stored in the cache.
+        """
+        if events is None:
+            events, identity = self._parse()
+        else:
+            identity = self._identity()
+            identity['hash'] = self._content_hash()
+        self._write(events, identity)
+        return self.load()
+
+    def load_or_build(self) -> TraceEvents:
+        """Load the cached events, building the cache first if it is missing or outdated.
+
+        :return: The trace events.
+        """
+        events = self.load()
+        if events is not None:
+            self._logger.info(f"Using trace cache {self._cache_file}")
+            return events
+
+        self._logger.info(f"Parsing trace file {self._trace_file}")
+        events, identity = self._parse()
+        try:
+            self._write(events, identity)
+        except OSError as e:
+            self._logger.warning(f"Could not write the trace cache {self._cache_file}: {e}")
+            return events
+        return self.load()
+
+    def content_hash(self) -> str:
+        """Compute the content hash of the trace file.
+
+        The hash recorded in the cache is used when the trace path, size and modification time
+        match the recorded ones, otherwise the trace is hashed.
+        """
+        header = self._read_header()
+        if header is not None:
+            recorded = header['trace']
+            identity = self._identity()
+            if all(recorded[name] == identity[name] for name in ('path', 'size', 'mtime_ns')):
+                return recorded['hash']
+        return self._content_hash()
+
+    def _parse(self) -> Tuple[TraceEvents, Dict[str, Any]]:
+        """Parse the trace file, computing its content hash in the same read.
+
+        :return: The events and the identity of the trace file.
+        """
+        identity = self._identity()
+        digest = self._new_digest()
+        events = TraceReader(self._trace_file).read(digest)
+        identity['hash'] = digest.hexdigest()
+        return events, identity
+
+    def _write(self, events: TraceEvents, identity: Dict[str, Any]) -> None:
+        """Write the cache file.
+
+        :param events: The events to store.
+        :param identity: The identity of the trace file the events were parsed from.
+        """
+        header: Dict[str, Any] = {'trace': identity, 'events': len(events), 'columns': []}
+        # The header size depends on the columns offsets, so they are computed over a fixed
+        # width placeholder
+        header_size = len(self._encode_header(header)) + 96 * len(self.COLUMNS)
+        offset = self._align(len(self.MAGIC) + 8 + header_size)
+        for name, dtype in self.COLUMNS:
+            length = len(getattr(events, name))
+            header['columns'].append({'name': name, 'dtype': dtype, 'offset': offset,
+                                      'length': length})
+            offset = self._align(offset + length * np.dtype(dtype).itemsize)
+        encoded = self._encode_header(header).ljust(header_size)
+
+        temporary_file = f"{self._cache_file}.tmp{os.getpid()}"
+        try:
+            with open(temporary_file, 'wb') as output:
+                output.write(self.MAGIC + struct.pack('<II', self.VERSION, header_size) + encoded)
+                for column in header['columns']:
+                    output.write(b'\0' * (column['offset'] - output.tell()))
+                    values = getattr(events, column['name'])
+                    output.write(np.ascontiguousarray(values, dtype=column['dtype']).tobytes())
+            os.replace(temporary_file, self._cache_file)
+        finally:
+            if path.exists(temporary_file):
+                os.remove(temporary_file)
+        self._logger.info(f"Stored {len(events)} events in {self._cache_file}")
+
+    def _read_header(self) -> Optional[Dict[str, Any]]:
+        """Read the cache file header.
+
+        :return: The decoded header, with its size in the header_size entry, or None if the cache
+        file is missing or invalid.
+        """
+        try:
+            with open(self._cache_file, 'rb') as input:
+                prefix = input.read(len(self.MAGIC) + 8)
+                if len(prefix) < len(self.MAGIC) + 8 or not prefix.startswith(self.MAGIC):
+                    return None
+                version, header_size = struct.unpack('<II', prefix[len(self.MAGIC):])
+                if version != self.VERSION:
+                    return None
+                header = json.loads(input.read(header_size).decode('utf8'))
+                header['header_size'] = header_size
+                return header
+        except (OSError, ValueError):
+            return None
+
+    def _rewrite_header(self, header: Dict[str, Any]) -> None:
+        """Replace the header of the cache file in place, keeping its size.
+
+        The cache is still valid if the header can not be rewritten.
+
+        :param header: The header read by _read_header, with the changes.
+        """
+        header_size = header.pop('header_size')
+        encoded = self._encode_header(header)
+        if len(encoded) > header_size:
+            return
+        try:
+            with open(self._cache_file, 'r+b') as output:
+                output.seek(len(self.MAGIC) + 8)
+                output.write(encoded.ljust(header_size))
+        except OSError as e:
+            self._logger.debug(f"Could not update the trace cache {self._cache_file}: {e}")
+
+    def _identity(self) -> Dict[str, Any]:
+        """Compute the identity of the trace file, except the content hash."""
+        stat = os.stat(self._trace_file)
+        return {
+            'path': path.abspath(self._trace_file),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+
+    def _content_hash(self) -> str:
+        """Compute the content hash of the trace file."""
+        digest = self._new_digest()
+        with open(self._trace_file, 'rb') as input:
+            for chunk in iter(lambda: input.read(1 << 24), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _new_digest() -> Any:
+        """Create the hash object of the trace contents."""
+        return hashlib.blake2b(digest_size=20)
+
+    def _align(self, offset: int) -> int:
+        """Round an offset up to the columns alignment."""
+        return -(-offset // self.ALIGNMENT) * self.ALIGNMENT
+
+    @staticmethod
+    def _encode_header(header: Dict[str, Any]) -> bytes:
+        return json.dumps(header, sort_keys=True).encode('utf8')
@@ -0,0 +1,244 @@
+"""
+Define the TraceEvents and TraceReader classes, used to load a whole trace file into columnar
+arrays instead of parsing one Connection object per line.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Any, Optional, Tuple, Union
+import mmap
+import os
+import warnings
+import numpy as np
+
+
+class TraceEvents(object):
+    """Store the connection events of a trace as columnar arrays.
+
+    Events are kept in the same order they appear in the trace file.
+    """
+
+    def __init__(self, time: np.ndarray, node1: np.ndarray, node2: np.ndarray,
+                 up: np.ndarray, idle: Optional[np.ndarray] = None,
+                 nodes: Optional[np.ndarray] = None) -> None:
+        """Build the events container.
+
+        :param time: The time of each event.
+        :param node1: The first node of each event.
+        :param node2: The second node of each event.
+        :param up: If each event opens (True) or closes (False) a connection.
+        :param idle: The precomputed idle points (see the idle property).
+        :param nodes: The precomputed node identifiers (see the nodes property).
+        """
+        self._time = time
+        self._node1 = node1
+        self._node2 = node2
+        self._up = up
+        self._idle = idle
+        self._nodes = nodes
+
+    @property
+    def time(self) -> np.ndarray:
+        """The time of each event."""
+        return self._time
+
+    @property
+    def node1(self) -> np.ndarray:
+        """The first node of each event."""
+        return self._node1
+
+    @property
+    def node2(self) -> np.ndarray:
+        """The second node of each event."""
+        return self._node2
+
+    @property
+    def up(self) -> np.ndarray:
+        """If each event opens (True) or closes (False) a connection."""
+        return self._up
+
+    @property
+    def idle(self) -> np.ndarray:
+        """The indexes of the events after which there are no open connections.
+
+        It is computed on first access, by counting the opened and closed connections.
+        """
+        if self._idle is None:
+            opened = np.cumsum(np.where(self._up, 1, -1), dtype=np.int64)
+            self._idle = np.flatnonzero(opened == 0)
+        return self._idle
+
+    @property
+    def nodes(self) -> np.ndarray:
+        """The sorted identifiers of the nodes that appear in the events.
+
+        It is computed on first access.
+        """
+        if self._nodes is None:
+            self._nodes = np.union1d(self._node1, self._node2).astype(np.int64)
+        return self._nodes
+
+    def periods(self, scan_interval: float) -> np.ndarray:
+        """Compute the scan period in which each event is processed.
+
+        The period p covers the events with time in the interval ((p - 1) * scan_interval,
+        p * scan_interval], and the first period (p = 1) also takes events at time zero. Events
+        out of order are processed in the period the trace reading is when they are reached,
+        as the ConnectionGenerator does.
+
+        :param scan_interval: The scan interval in seconds.
+        :return: The period of each event.
+        """
+        time = self._time
+        periods = np.maximum(np.ceil(time / scan_interval).astype(np.int64), 1)
+        # Fix rounding errors of the division at the periods boundaries
+        periods[time > periods * scan_interval] += 1
+        periods[(periods > 1) & (time <= (periods - 1) * scan_interval)] -= 1
+        return np.maximum.accumulate(periods) if len(periods) else periods
+
+    def period_slices(self, scan_interval: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Split the events by scan period.
+
+        Only periods with at least one event are listed. The events of periods[i] are the ones
+        in the range offsets[i]:offsets[i + 1].
+
+        :param scan_interval: The scan interval in seconds.
+        :return: The periods with events and the offsets of their events.
+        """
+        return self.split_periods(self.periods(scan_interval))
+
+    @staticmethod
+    def split_periods(periods: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Split a non-decreasing column of event periods in slices of the same period.
+
+        :param periods: The period of each event.
+        :return: The periods with events and the offsets of their events.
+        """
+        starts = np.flatnonzero(np.diff(periods, prepend=0))
+        offsets = np.append(starts, len(periods)).astype(np.int64)
+        return periods[starts], offsets
+
+    def __getitem__(self, index: Union[slice, np.ndarray]) -> 'TraceEvents':
+        """Select a subset of the events, keeping their order.
+
+        :param index: A slice or an array of events indexes.
+        """
+        return TraceEvents(self._time[index], self._node1[index], self._node2[index],
+                           self._up[index])
+
+    def __len__(self) -> int:
+        return len(self._time)
+
+    def __repr__(self) -> str:
+        return f"TraceEvents(events={len(self)})"
+
+
+class TraceReader(object):
+    """Load a trace file in the ONE format into a TraceEvents object.
+
+    The file is memory-mapped and decoded in large blocks, each one converted directly into
+    NumPy arrays. Every line is expected to be in the following format:
+        [time] CONN [node1] [node2] [type]
+        Ex: 1.00 CONN 28 37 up
+    """
+
+    # Approximated number of bytes decoded at once
+    BLOCK_SIZE = 1 << 26
+
+    # Translation of the letters of the textual tokens
+    _TOKENS = bytes.maketrans(b'conwdup', b'    01 ')
+
+    # Integers from this magnitude on are not always exact as doubles
+    _EXACT_LIMIT = 2 ** 53
+
+    def __init__(self, input_file: str, block_size: int = BLOCK_SIZE) -> None:
+        """Create the reader.
+
+        :param input_file: The trace file path.
+        :param block_size: Approximated number of bytes decoded at once.
+        """
+        self._input_file_path = input_file
+        self._block_size = block_size
+
+    def read(self, digest: Optional[Any] = None) -> TraceEvents:
+        """Read the whole trace file.
+
+        :param digest: A hashlib object updated with the contents of the file, in the same read
+        that parses them.
+        :return: The events of the trace.
+        """
+        blocks = []
+        with open(self._input_file_path, 'rb') as input:
+            size = os.fstat(input.fileno()).st_size
+            if size:
+                with mmap.mmap(input.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    start = 0
+                    while start < size:
+                        end = data.find(b'\n', min(start + self._block_size, size) - 1)
+                        end = size if end < 0 else end + 1
+                        block = data[start:end]
+                        if digest is not None:
+                            digest.update(block)
+                        blocks.append(self._decode(block, start))
+                        start = end
+
+        if not blocks:
+            blocks.append((np.empty((0, 4), dtype=np.float64), np.empty((0, 2), dtype=np.int64)))
+        values = np.concatenate([values for values, _ in blocks])
+        nodes = np.concatenate([nodes for _, nodes in blocks])
+        return TraceEvents(values[:, 0].copy(), nodes[:, 0].copy(), nodes[:, 1].copy(),
+                           values[:, 3] == 1)
+
+    def _decode(self, block: bytes, offset: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode a block of complete lines.
+
+        The textual tokens are replaced by numbers, so the whole block can be parsed by NumPy
+        at once. Each line results in four values: time, node1, node2 and up flag. The node
+        identifiers that a double can not represent exactly are parsed again as integers.
+
+        :param block: The lines to decode.
+        :param offset: The position of the block in the file, used in error messages.
+        :return: The decoded values, one row per line, and the node identifiers of each line.
+        """
+        block = block.lower()
+        nrof_lines = block.count(b'conn')
+        if not nrof_lines:
+            if block.strip():
+                raise self._invalid_data(offset)
+            return np.empty((0, 4), dtype=np.float64), np.empty((0, 2), dtype=np.int64)
+        if block.count(b'up') + block.count(b'down') != nrof_lines:
+            raise self._invalid_data(offset)
+
+        # "conn" becomes blank, "up" becomes "1" and "down" becomes "0"
+        block = block.translate(self._TOKENS)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            values = np.fromstring(block, dtype=np.float64, sep=' ')
+
+        if len(values) != 4 * nrof_lines:
+            raise self._invalid_data(offset)
+        columns = values.reshape(-1, 4)
+        nodes = columns[:, 1:3]
+        if not (np.isin(columns[:, 3], (0, 1)).all() and (nodes == np.floor(nodes)).all()):
+            raise self._invalid_data(offset)
+        if (np.abs(nodes) < self._EXACT_LIMIT).all():
+            return columns, nodes.astype(np.int64)
+
+        # Each line has exactly four tokens, so the node identifiers are the second and third
+        tokens = block.split()
+        try:
+            nodes = np.array([int(token) for token in tokens[1::4]] +
+                             [int(token) for token in tokens[2::4]], dtype=np.int64)
+        except (ValueError, OverflowError):
+            raise self._invalid_data(offset) from None
+        return columns, nodes.reshape(2, -1).T
+
+    def _invalid_data(self, offset: int) -> ValueError:
+        """Build the error raised when a block can not be decoded.
+
+        :param offset: The position of the block in the file.
+        """
+        return ValueError(f"Invalid trace data in {self._input_file_path} after byte {offset}.")
@@ -0,0 +1,297 @@
+"""
+Define the VectorizedDetector class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+import numpy as np
+from mgb.local_detection import ArchivedGroup, MemberSetPool
+from mgb.shared import Configuration
+
+# Membership codes of a (device, neighbor) pair
+UNKNOWN = 0
+STRANGER = 1
+FRIEND = 2
+
+
+class VectorizedDetector(object):
+    """Run the local detection algorithm of all devices at once.
+
+    It reproduces the behavior of a list of Device objects, but the close/away counters,
+    the friend/stranger membership and the current connections of every device are stored in
+    NumPy arrays, so each scan period is processed by a handful of batched array operations.
+
+    Two storage layouts are supported. The dense layout keeps N x N matrices and is used for
+    small simulations. The sparse layout keeps only the tracked (device, neighbor) pairs,
+    sorted by the pair key `device * N + neighbor` (a CSR-like row ordering), and is used when
+    the number of nodes is too big for dense matrices.
+    """
+
+    # Number of nodes up to which the dense layout is used by default
+    DENSE_LIMIT = 1024
+
+    def __init__(self, nrof_nodes: int, config: Configuration,
+                 dense: Optional[bool] = None, uids: Optional[Iterable[int]] = None,
+                 on_archive: Optional[Callable[[int, ArchivedGroup], None]] = None) -> None:
+        """Initialize the devices state.
+
+        :param nrof_nodes: Number of devices (identified from 0 to nrof_nodes - 1).
+        :param config: The current configuration.
+        :param dense: Force the dense (True) or sparse (False) layout. When it is not given
+        the layout is chosen based on the number of nodes.
+        :param uids: Simulate only these devices. The connection events of the other devices
+        are ignored.
+        :param on_archive: Function called with the device identifier and each archived
+        friends list, instead of keeping them in the detector.
+        """
+        self._nrof_nodes = nrof_nodes
+        self._friend_threshold = config.friend_threshold
+        self._inactive_threshold = config.inactive_threshold
+        self._dense = nrof_nodes <= self.DENSE_LIMIT if dense is None else dense
+        self._started = np.zeros(nrof_nodes, dtype=np.float64)
+        uids = range(nrof_nodes) if uids is None else sorted(uids)
+        self._archived: Dict[int, List[ArchivedGroup]] = {uid: [] for uid in uids}
+        self._on_archive = on_archive
+        # The members sets are only interned when the groups are kept in the detector
+        self._pool = MemberSetPool() if on_archive is None else None
+        self._simulated: Optional[np.ndarray] = None
+        if len(self._archived) < nrof_nodes:
+            self._simulated = np.zeros(nrof_nodes, dtype=bool)
+            self._simulated[list(self._archived)] = True
+
+        if self._dense:
+            shape = (nrof_nodes, nrof_nodes)
+            self._connected = np.zeros(shape, dtype=bool)
+            self._state = np.zeros(shape, dtype=np.int8)
+            self._close = np.zeros(shape, dtype=np.int32)
+            self._away = np.zeros(shape, dtype=np.int32)
+        else:
+            self._connections = np.empty(0, dtype=np.int64)
+            self._keys = np.empty(0, dtype=np.int64)
+            self._state = np.empty(0, dtype=np.int8)
+            self._close = np.empty(0, dtype=np.int32)
+            self._away = np.empty(0, dtype=np.int32)
+
+    @property
+    def is_dense(self) -> bool:
+        """Check if the dense layout is in use."""
+        return self._dense
+
+    @property
+    def on_archive(self) -> Optional[Callable[[int, ArchivedGroup], None]]:
+        """The function called with each archived friends list, if any."""
+        return self._on_archive
+
+    @property
+    def archived(self) -> Dict[int, List[ArchivedGroup]]:
+        """Access archived friends lists (groups) of each device."""
+        return self._archived
+
+    def apply(self, node1: np.ndarray, node2: np.ndarray, up: np.ndarray) -> None:
+        """Apply a batch of connection events, in order.
+
+        When the same pair appears more than once only its last event is considered, which is
+        equivalent to applying the events one by one.
+
+        :param node1: First node of each connection event.
+        :param node2: Second node of each connection event.
+        :param up: If each event opens (True) or closes (False) the connection.
+        """
+        if not len(node1):
+            return
+        node1 = np.asarray(node1, dtype=np.int64)
+        node2 = np.asarray(node2, dtype=np.int64)
+        up = np.asarray(up, dtype=bool)
+
+        # Both directions of a connection are stored, then we keep the last event of each key
+        keys = np.concatenate((node1 * self._nrof_nodes + node2,
+                               node2 * self._nrof_nodes + node1))
+        flags = np.concatenate((up, up))
+        keys, last = np.unique(keys[::-1], return_index=True)
+        flags = flags[::-1][last]
+        if self._simulated is not None:
+            keep = self._simulated[keys // self._nrof_nodes]
+            keys, flags = keys[keep], flags[keep]
+
+        if self._dense:
+            self._connected.flat[keys] = flags
+        else:
+            connections = np.union1d(self._connections, keys[flags])
+            self._connections = np.setdiff1d(connections, keys[~flags], assume_unique=True)
+
+    def run_local_detection(self, time: float) -> None:
+        """Run the local detection algorithm of every device based on current state.
+
+        :param time: The current simulation time.
+        """
+        connected = self._connected_pairs()
+        state = self._state
+        friends = state == FRIEND
+        strangers = state == STRANGER
+        close = (state != UNKNOWN) & connected
+        away = (state != UNKNOWN) & ~connected
+
+        # Entities with a connection have the close counter incremented, the others are away
+        self._close = np.where(close, self._close + 1, 0).astype(np.int32)
+        self._away = np.where(away, self._away + 1, 0).astype(np.int32)
+
+        dropped = strangers & away & (self._away >= self._inactive_threshold)
+        promoted = strangers & close & (self._close >= self._friend_threshold)
+
+        # A promoted stranger enters the friends list as a fresh entity
+        had_friends = self._per_device(friends) > 0
+        has_promoted = self._per_device(promoted) > 0
+        self._started[has_promoted & ~had_friends] = time
+
+        state[promoted] = FRIEND
+        state[dropped] = UNKNOWN
+        changed = promoted | dropped
+        self._close[changed] = 0
+        self._away[changed] = 0
+
+        self._add_strangers()
+        self._archive_inactive(time)
+
+    def fast_forward(self, time: float, periods: int, scan_interval: float) -> None:
+        """Run the local detection algorithm of every device over periods without events.
+
+        While the connections do not change the counters evolve deterministically, so the
+        periods until the next change in any friends or strangers list (or the next archive
+        check that can fail) are applied at once.
+
+        :param time: The simulation time of the first period.
+        :param periods: The number of periods.
+        :param scan_interval: The scan interval in seconds.
+        """
+        while periods > 0:
+            quiet = min(self._quiet_periods(), periods)
+            if quiet:
+                connected = self._connected_pairs()
+                close = (self._state != UNKNOWN) & connected
+                away = (self._state != UNKNOWN) & ~connected
+                self._close = np.where(close, self._close + quiet, 0).astype(np.int32)
+                self._away = np.where(away, self._away + quiet, 0).astype(np.int32)
+                time += quiet * scan_interval
+                periods -= quiet
+            if periods:
+                self.run_local_detection(time)
+                time += scan_interval
+                periods -= 1
+
+    def _quiet_periods(self) -> int:
+        """Count the next periods in which the detection only updates counters of all devices.
+
+        It assumes the current connections do not change in the meantime.
+
+        :return: The number of periods (a big number if nothing would happen).
+        """
+        connected = self._connected_pairs()
+        if self._dense:
+            if (connected & (self._state == UNKNOWN)).any():
+                return 0
+        elif len(np.setdiff1d(self._connections, self._keys, assume_unique=True)):
+            return 0
+
+        quiet = np.iinfo(np.int32).max
+        strangers = self._state == STRANGER
+        away = ~connected & (self._away < self._inactive_threshold) & (self._state != UNKNOWN)
+        # Strangers become friends or are removed, friends become inactive
+        if (strangers & connected).any():
+            quiet = min(quiet, self._friend_threshold - self._close[strangers & connected].max())
+        if away.any():
+            quiet = min(quiet, self._inactive_threshold - self._away[away].max())
+        return int(max(quiet - 1, 0))
+
+    def _connected_pairs(self) -> np.ndarray:
+        """Check which entries of the pairs table have a current connection."""
+        if self._dense:
+            return self._connected
+        return np.isin(self._keys, self._connections, assume_unique=True)
+
+    def _per_device(self, mask: np.ndarray) -> np.ndarray:
+        """Count the entries of each device flagged in a mask over the pairs table.
+
+        :param mask: A boolean mask aligned with the pairs table.
+        :return: The number of flagged entries of each device.
+        """
+        if self._dense:
+            return mask.sum(axis=1)
+        return np.bincount(self._keys[mask] // self._nrof_nodes, minlength=self._nrof_nodes)
+
+    def _add_strangers(self) -> None:
+        """Add current connections that are not tracked yet in the strangers list."""
+        if self._dense:
+            new = self._connected & (self._state == UNKNOWN)
+            self._state[new] = STRANGER
+            self._close[new] = 1
+            return
+
+        # Dropped strangers leave the pairs table, so they can be added again later
+        tracked = self._state != UNKNOWN
+        if not tracked.all():
+            self._compact(tracked)
+
+        new = np.setdiff1d(self._connections, self._keys, assume_unique=True)
+        if not len(new):
+            return
+        keys = np.concatenate((self._keys, new))
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._state = np.concatenate(
+            (self._state, np.full(len(new), STRANGER, dtype=np.int8)))[order]
+        self._close = np.concatenate((self._close, np.ones(len(new), dtype=np.int32)))[order]
+        self._away = np.concatenate((self._away, np.zeros(len(new), dtype=np.int32)))[order]
+
+    def _archive_inactive(self, time: float) -> None:
+        """Archive the friends list of devices whose group is not active anymore.
+
+        A group is considered active when at least 50% of the members are active.
+
+        :param time: The current simulation time.
+        """
+        friends = self._state == FRIEND
+        nrof_friends = self._per_device(friends)
+        nrof_inactive = self._per_device(friends & (self._away >= self._inactive_threshold))
+        inactive = np.flatnonzero((nrof_friends > 0) & (2 * nrof_inactive >= nrof_friends))
+        if not len(inactive):
+            return
+
+        n = self._nrof_nodes
+        for uid in inactive.tolist():
+            # When add itself as a member the ended time is adjusted to current time
+            if nrof_friends[uid] + 1 <= 2:
+                continue
+            if self._dense:
+                members = np.flatnonzero(friends[uid])
+            else:
+                begin, end = np.searchsorted(self._keys, (uid * n, (uid + 1) * n))
+                members = self._keys[begin:end][friends[begin:end]] - uid * n
+            members = members.tolist() + [uid]
+            if self._on_archive is not None:
+                group = ArchivedGroup(frozenset(members), float(self._started[uid]), time)
+                self._on_archive(uid, group)
+            else:
+                group = ArchivedGroup(self._pool.intern(members), float(self._started[uid]), time)
+                self._archived[uid].append(group)
+
+        # Both friends and strangers lists are restarted
+        if self._dense:
+            self._state[inactive] = UNKNOWN
+            self._close[inactive] = 0
+            self._away[inactive] = 0
+        else:
+            self._compact(~np.isin(self._keys // n, inactive))
+
+    def _compact(self, keep: np.ndarray) -> None:
+        """Remove entries from the sparse pairs table.
+
+        :param keep: A boolean mask of the entries to keep.
+        """
+        self._keys = self._keys[keep]
+        self._state = self._state[keep]
+        self._close = self._close[keep]
+        self._away = self._away[keep]
@@ -4,27 +4,38 @@ Program entry point.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jan 2018
-Modified: Feb 2018
+Modified: Oct 2026
 """
 
+from typing import Dict, List, Union
 import click
 
 from mgb.graph_creation import GraphCreationRunner
-from mgb.local_detection import LocalDetectionRunner
-from mgb.group_merging import GroupMergingRunner
+from mgb.local_detection import ArchivedGroup, EventSource, JsonLinesSink, LocalDetectionRunner, \
+    StreamRunner, TraceCache
+from mgb.group_merging import GroupMergingRunner, MergedGroup
 from mgb.neighborhood_inspection import NeighborhoodInspectionRunner
+from mgb.route_tables import RouteServer, RouteService, RouteTableRunner
 from mgb.shared import Configuration
 import logging
 import os.path as path
 import os
 
 
-@click.command(name="MGB")
-@click.argument('configuration_file', required=True)
-@click.option('--verbose/--no-verbose', help="Enable more debug messages.", default=False)
-def main(configuration_file: str,
-         verbose: bool) -> None:
+class DefaultCommandGroup(click.Group):
+    """A group of commands that executes the 'run' command when no command is given.
+
+    It keeps the original command line working: mgb [--verbose] configuration_file.
+    """
 
+    def parse_args(self, ctx: click.Context, args: list) -> list:
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = ['run'] + args
+        return super().parse_args(ctx, args)
+
+
+def setup_logging(verbose: bool) -> None:
+    """Configure the logging format and level."""
     logformat = "%(asctime)s: %(levelname)s [%(name)s]:  %(message)s"
     if verbose:
         logging.basicConfig(level="DEBUG", format=logformat)
@@ -32,49 +43,232 @@ def main(configuration_file: str,
         logging.basicConfig(level="INFO", format=logformat)
 
 
+def load_configuration(configuration_file: str) -> Configuration:
+    """Load the configuration file, exiting the program on errors."""
     logging.debug('Loading configuration file')
     try:
-        config = Configuration(configuration_file)
+        return Configuration(configuration_file)
     except Exception as e:
         logging.error(f'Error on loading configuration file "{configuration_file}"')
         logging.error(e)
         exit(1)
 
+
+def run_merging_steps(config: Configuration,
+                      result: Union[Dict[int, List[ArchivedGroup]], Dict[int, List[MergedGroup]]],
+                      merged: bool = False) -> None:
+    """Run the steps after the local detection, exiting the program on errors.
+
+    When the groups were already merged by the local detection, only the output of the group
+    merging step is produced.
+    """
     try:
-        os.makedirs(config.output_dir, exist_ok=True)
+        group_merging_runner = GroupMergingRunner(config)
+        if merged:
+            result = group_merging_runner.format_output(result)
+        else:
+            result = group_merging_runner.run(result)
     except Exception as e:
+        logging.error('Error when running the group merging step.')
         logging.exception(e)
-        exit(1)
+        exit(2)
 
     try:
-        local_detection_runner = LocalDetectionRunner(config)
-        result = local_detection_runner.run()
+        neighborhood_instrospection_runner = NeighborhoodInspectionRunner(config)
+        result = neighborhood_instrospection_runner.run(result)
     except Exception as e:
-        logging.error('Error when running the local detection step.')
+        logging.error('Error when running neighborhood introspection step.')
         logging.exception(e)
         exit(2)
 
     try:
-        group_merging_runner = GroupMergingRunner(config)
-        result = group_merging_runner.run(result)
+        graph_creation_runner = GraphCreationRunner(config)
+        graph_creation_runner.run(result)
     except Exception as e:
-        logging.error('Error when running the group merging step.')
+        logging.error('Error when generationg group graph.')
         logging.exception(e)
         exit(2)
 
-    for _ in range(2):
+    if config.step5_enable:
         try:
-            neighborhood_instrospection_runner = NeighborhoodInspectionRunner(config)
-            result = neighborhood_instrospection_runner.run(result)
+            route_table_runner = RouteTableRunner(config)
+            route_table_runner.run(result.keys())
         except Exception as e:
-            logging.error('Error when running neighborhood introspection step.')
+            logging.error('Error when computing the route tables.')
             logging.exception(e)
             exit(2)
 
+
+@click.group(name="MGB", cls=DefaultCommandGroup)
+def main() -> None:
+    """Mobile Group Detection."""
+
+
+@main.command(name="run")
+@click.argument('configuration_file', required=True)
+@click.option('--verbose/--no-verbose', help="Enable more debug messages.", default=False)
+@click.option('--workers', type=click.IntRange(min=1), default=None,
+              help="Number of processes used in the local detection step.")
+@click.option('--resume/--no-resume', default=False,
+              help="Continue the local detection step from the last checkpoint.")
+def run(configuration_file: str,
+        verbose: bool,
+        workers: int,
+        resume: bool) -> None:
+    """Run all steps of the detection algorithm."""
+    setup_logging(verbose)
+    config = load_configuration(configuration_file)
+    if workers is not None:
+        config.step1_workers = workers
+
     try:
-        graph_creation_runner = GraphCreationRunner(config)
-        graph_creation_runner.run(result)
+        os.makedirs(config.output_dir, exist_ok=True)
     except Exception as e:
-        logging.error('Error when generationg group graph.')
+        logging.exception(e)
+        exit(1)
+
+    try:
+        local_detection_runner = LocalDetectionRunner(config)
+        if config.step2_online:
+            result = local_detection_runner.run_online(resume)
+        else:
+            result = local_detection_runner.run(resume)
+    except Exception as e:
+        logging.error('Error when running the local detection step.')
         logging.exception(e)
         exit(2)
+
+    run_merging_steps(config, result, config.step2_online)
+
+
+@main.command(name="sweep")
+@click.argument('configuration_file', required=True)
+@click.option('--verbose/--no-verbose', help="Enable more debug messages.", default=False)
+def sweep(configuration_file: str,
+          verbose: bool) -> None:
+    """Run all steps for each parameter set of the sweep section."""
+    setup_logging(verbose)
+    config = load_configuration(configuration_file)
+    configs = config.sweep()
+    logging.info(f"Sweeping {len(configs)} parameter sets.")
+
+    try:
+        for sweep_config in configs:
+            os.makedirs(sweep_config.output_dir, exist_ok=True)
+    except Exception as e:
+        logging.exception(e)
+        exit(1)
+
+    try:
+        local_detection_runner = LocalDetectionRunner(config)
+        results = local_detection_runner.run_sweep(configs)
+    except Exception as e:
+        logging.error('Error when running the local detection step.')
+        logging.exception(e)
+        exit(2)
+
+    for sweep_config, result in zip(configs, results):
+        logging.info(f"Running the merging steps for {sweep_config.output_dir}")
+        run_merging_steps(sweep_config, result)
+
+
+@main.command(name="stream")
+@click.argument('configuration_file', required=True)
+@click.option('--source', default=None,
+              help="Trace file, '-' for the standard input or 'unix:<path>' for a local socket. "
+                   "By default the trace file of the configuration is used.")
+@click.option('--follow', is_flag=True, default=False,
+              help="Keep reading the trace file while it is being appended.")
+@click.option('--idle-timeout', type=float, default=None,
+              help="Stop following the trace file after this number of seconds without data.")
+@click.option('--delay', type=float, default=None,
+              help="Seconds an event can arrive after its time, before its period is processed "
+                   "without it (default one scan interval).")
+@click.option('--output', default='-',
+              help="File where the archived groups are written as JSON lines (default stdout).")
+@click.option('--verbose/--no-verbose', help="Enable more debug messages.", default=False)
+def stream(configuration_file: str,
+           source: str,
+           follow: bool,
+           idle_timeout: float,
+           delay: float,
+           output: str,
+           verbose: bool) -> None:
+    """Run the local detection over a live trace, writing groups as they are archived."""
+    setup_logging(verbose)
+    config = load_configuration(configuration_file)
+    event_source = EventSource(source or config.trace_file, follow, idle_timeout=idle_timeout)
+    try:
+        with click.open_file(output, 'w', encoding='utf8') as stream_output:
+            StreamRunner(config, JsonLinesSink(stream_output), delay).run(event_source)
+    except Exception as e:
+        logging.error('Error when running the streaming local detection.')
+        logging.exception(e)
+        exit(2)
+
+
+@main.command(name="cache")
+@click.argument('configuration_file', required=True)
+@click.option('--verify', is_flag=True, default=False,
+              help="Only check if the cache matches the trace file content.")
+@click.option('--verbose/--no-verbose', help="Enable more debug messages.", default=False)
+def cache(configuration_file: str,
+          verify: bool,
+          verbose: bool) -> None:
+    """Build or verify the binary cache of the trace file."""
+    setup_logging(verbose)
+    config = load_configuration(configuration_file)
+    if not path.exists(config.trace_file):
+        logging.error(f"The trace file {config.trace_file} does not exists.")
+        exit(1)
+
+    trace_cache = TraceCache(config.trace_file, config.trace_cache_file or None)
+    if verify:
+        events = trace_cache.load(check_content=True)
+        if events is None:
+            logging.error(f"The trace cache {trace_cache.cache_file} is missing or outdated.")
+            exit(1)
+        logging.info(f"The trace cache {trace_cache.cache_file} is valid "
+                     f"({len(events)} events).")
+        return
+
+    try:
+        trace_cache.build()
+    except Exception as e:
+        logging.error('Error when building the trace cache.')
+        logging.exception(e)
+        exit(2)
+
+
+@main.command(name="serve")
+@click.argument('configuration_file', required=True)
+@click.option('--socket', 'socket_path', default=None,
+              help="Unix socket path to listen on. By default the configuration is used.")
+@click.option('--port', type=click.IntRange(min=0, max=65535), default=None,
+              help="Localhost HTTP port to listen on, when there is no Unix socket.")
+@click.option('--verbose/--no-verbose', help="Enable more debug messages.", default=False)
+def serve(configuration_file: str,
+          socket_path: str,
+          port: int,
+          verbose: bool) -> None:
+    """Answer group route queries of a run over a local socket."""
+    setup_logging(verbose)
+    config = load_configuration(configuration_file)
+    if port is not None and socket_path is None:
+        socket_path = ''
+    try:
+        service = RouteService(config, config.serve_cache_size << 20, config.serve_memo_size)
+        server = RouteServer(service, config.serve_socket if socket_path is None else socket_path,
+                             config.serve_port if port is None else port)
+    except Exception as e:
+        logging.error('Error when starting the route server.')
+        logging.exception(e)
+        exit(1)
+
+    logging.info(f"Serving route queries on {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Stopping the route server.")
+    finally:
+        server.close()
@@ -6,8 +6,9 @@ data to build a graph in the next step.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: May 2018
-Modified: May 2018
+Modified: Oct 2026
 """
 
 from mgb.neighborhood_inspection.multi_merged_group import MultiMergedGroup
+from mgb.neighborhood_inspection.group_catalog import GroupCatalog
 from mgb.neighborhood_inspection.neighborhood_inspection_runner import NeighborhoodInspectionRunner
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+Define the GroupCatalog class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Dict, Tuple, Union
+from mgb.group_merging import MergedGroup
+from mgb.neighborhood_inspection import MultiMergedGroup
+
+
+class GroupCatalog(object):
+    """
+    Keep a single copy of each distinct group found in the neighborhood inspection step.
+
+    The groups with the same members and periods are the same catalog entry, so the groups of
+    each device are references to catalog entries, and a group pulled in by many devices is
+    stored once. Since the entries are unique, a repeated group is recognized by its identity.
+    The entries are shared, so they must not be changed.
+    """
+
+    __slots__ = ('_entries',)
+
+    def __init__(self):
+        """
+        Creates an empty catalog.
+        """
+        self._entries: Dict[Tuple[int, Tuple[Tuple[float, float], ...]], MultiMergedGroup] = {}
+
+    def add(self, group: Union[MergedGroup, MultiMergedGroup]) -> MultiMergedGroup:
+        """
+        Find the entry of a group, adding the group when it is new.
+        :param group: The group. Other groups than multi merged groups are copied.
+        :return: The catalog entry.
+        """
+        if not isinstance(group, MultiMergedGroup):
+            group = MultiMergedGroup(group)
+        key = (group.members.bits, tuple((period.begin, period.end) for period in group.periods))
+        return self._entries.setdefault(key, group)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -4,10 +4,11 @@ Define the MultiMergedGroup class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: May 2018
-Modified: May 2018
+Modified: Oct 2026
 """
 
 from mgb.group_merging import MergedGroup
+from mgb.shared import IntervalSet, MemberSet
 
 
 class MultiMergedGroup(object):
@@ -17,13 +18,16 @@ class MultiMergedGroup(object):
     It handles multiple levels of merging.
     """
 
+    __slots__ = ('members', 'periods')
+
     def __init__(self, first_group: MergedGroup):
         """
         Creates a new multi merged group.
-        :param first_group: The group used to initialize members and encounters.
+        :param first_group: The group used to initialize members and encounters. It is not
+        changed by the merges.
         """
-        self.members = set(first_group.members)
-        self.periods = list(first_group.periods)
+        self.members = MemberSet(first_group.members)
+        self.periods = IntervalSet(first_group.periods)
 
     def _get_group_similarity(self, other: MergedGroup) -> float:
         """
@@ -31,11 +35,7 @@ class MultiMergedGroup(object):
         :param other: The other group.
         :return: The group similarity coefficient (varies from 0 to 1.0).
         """
-        # safe guard for division by zero
-        if not (self.members or other.members):
-            return 0
-        # intersection / union
-        return len(self.members & other.members) / len(self.members | other.members)
+        return self.members.similarity(other.members)
 
     def try_merge(self, other: MergedGroup) -> bool:
         """
@@ -45,14 +45,7 @@ class MultiMergedGroup(object):
         """
         if self._get_group_similarity(other) >= 0.5:
             self.members.update(other.members)
-            # periods must be merged one by one to ensure time cohesion
-            for new_period in other.periods:
-                has_merged = False
-                for period in self.periods:
-                    if period.try_merge(new_period):
-                        has_merged = True
-                        break
-                if not has_merged:
-                    self.periods.append(new_period)
+            # the periods with intersection are combined, to ensure time cohesion
+            self.periods.update(other.periods)
             return True
         return False
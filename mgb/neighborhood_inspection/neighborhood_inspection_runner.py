@@ -4,15 +4,14 @@ Define the NeighborhoodIntrospectionRunner
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: May 2018
-Modified: May 2018
+Modified: Oct 2026
 """
 
 from mgb.shared import Configuration
-from typing import Dict, List
-from mgb.group_merging import MergedGroup
+from typing import Dict, List, Optional, Set, Tuple
+from mgb.group_merging import MergedGroup, MergedGroupIndex
 import logging
-from copy import deepcopy
-from mgb.neighborhood_inspection import MultiMergedGroup
+from mgb.neighborhood_inspection import GroupCatalog, MultiMergedGroup
 import os.path as path
 import json
 
@@ -24,50 +23,42 @@ class NeighborhoodInspectionRunner(object):
         self._logger = logging.getLogger('NeighborhoodInspection')
 
     def run(self, input: Dict[int, List[MergedGroup]]) -> Dict[int, List[MultiMergedGroup]]:
-        self._logger.info('Starting neighborhood inspection step')
-
-        # Since we are merging information across mutable objects we need to create a shadow copy
-        # to ensure consistency. Oh god \o/
-        shadow_input = deepcopy(input)
-
-        multi_merged_groups_by_device = {}
-        for uid, merged_groups in shadow_input.items():
-            if not merged_groups:
-                multi_merged_groups_by_device[uid] = []
-                continue
+        """
+        Execute the neighborhood inspection step, in rounds. Each round merges the groups of the
+        direct neighbors of each device into the device groups, starting from the groups of the
+        previous round.
 
-            multi_merged_groups = [MultiMergedGroup(mg) for mg in merged_groups]
-            self._logger.debug(f"Starting processing node {uid}")
-            neighbors = set()
-            # Fetch all direct neighbors of the current device
-            for merged_group in merged_groups:
-                neighbors.update(merged_group.members)
-            neighbors.remove(uid)
+        A device is only processed again when its groups or the groups of one of its neighbors
+        changed in the previous round, since otherwise it would find the same groups. For the
+        same reason the rounds stop when no device changes.
 
-            # for each neighbor we need to try to merge its merged groups into the current device
-            for neighbor in neighbors:
-                for merged_group in input[neighbor]:
-                    # prepare yourselves, here we go
-                    has_merged = False
-                    for multi_merged_group in multi_merged_groups:
-                        if multi_merged_group.try_merge(merged_group):
-                            has_merged = True
-                            break
-                    if not has_merged:
-                        multi_merged_groups.append(MultiMergedGroup(deepcopy(merged_group)))
-            multi_merged_groups_by_device[uid] = multi_merged_groups
-            self._logger.debug(f"Found a total of {len(multi_merged_groups)} for device {uid}")
+        The groups of all devices are entries of a catalog, that keeps a single copy of the groups
+        with the same members and periods.
+        :param input: The merged groups of each device.
+        :return: The multi merged groups of each device.
+        """
+        self._logger.info('Starting neighborhood inspection step')
+        rounds = self.config.step3_rounds
 
-        if self.config.step3_enable_filtering:
-            size_threshold = self.config.step3_size_threshold
-            encounters_threshold = self.config.step3_encounters_threshold
-            for uid, multi_merged_groups in multi_merged_groups_by_device.items():
-                self._logger.debug(f"Filtering groups of device {uid}")
-                multi_merged_groups_by_device[uid] = [
-                    mmg for mmg in multi_merged_groups
-                    if len(mmg.members) >= size_threshold
-                       and len(mmg.periods) >= encounters_threshold
-                ]
+        catalog = GroupCatalog()
+        multi_merged_groups_by_device = {
+            uid: [catalog.add(group) for group in merged_groups]
+            for uid, merged_groups in input.items()
+        }
+        self._logger.info(f"Found {len(catalog)} distinct groups in "
+                          f"{sum(len(groups) for groups in input.values())} merged groups")
+        changed = None
+        round_number = 0
+        while rounds <= 0 or round_number < rounds:
+            round_number += 1
+            multi_merged_groups_by_device, processed, changed, changed_groups = self._run_round(
+                multi_merged_groups_by_device, changed, catalog)
+            total = sum(len(groups) for groups in multi_merged_groups_by_device.values())
+            self._logger.info(f"Round {round_number}: processed {processed} devices, "
+                              f"{len(changed)} devices and {changed_groups} groups changed, "
+                              f"{total} groups found ({len(catalog)} distinct)")
+            if not changed:
+                break
 
         if not self.config.step3_enable_output:
             return multi_merged_groups_by_device
@@ -88,3 +79,73 @@ class NeighborhoodInspectionRunner(object):
 
         return multi_merged_groups_by_device
 
+    def _run_round(self, input: Dict[int, List[MultiMergedGroup]], changed: Optional[Set[int]],
+                   catalog: GroupCatalog
+                   ) -> Tuple[Dict[int, List[MultiMergedGroup]], int, Set[int], int]:
+        """
+        Execute a round of the step.
+        :param input: The groups of each device found in the previous round, as catalog entries.
+        :param changed: The devices whose groups changed in the previous round, or None to
+        process all devices.
+        :param catalog: The catalog of the groups.
+        :return: The groups of each device, the number of devices processed, the devices whose
+        groups changed and the number of new groups.
+        """
+        # The input groups are shared by all devices, and are never changed: each multi merged
+        # group has its own members and periods, and the periods are immutable
+        multi_merged_groups_by_device = {}
+        processed = 0
+        changed_now = set()
+        changed_groups = 0
+        for uid, merged_groups in input.items():
+            if not merged_groups:
+                multi_merged_groups_by_device[uid] = []
+                continue
+
+            neighbors = set()
+            # Fetch all direct neighbors of the current device. The device itself may be missing,
+            # when the input comes from this step and its own groups were filtered out
+            for merged_group in merged_groups:
+                neighbors.update(merged_group.members)
+            neighbors.discard(uid)
+            if changed is not None and uid not in changed and changed.isdisjoint(neighbors):
+                multi_merged_groups_by_device[uid] = merged_groups
+                continue
+
+            processed += 1
+            self._logger.debug(f"Starting processing node {uid}")
+            # Each neighbor group is merged in the first similar group, found by the members
+            # index. A catalog entry is repeated in many neighbors, and it is only merged again
+            # when it could change the device groups
+            index = MergedGroupIndex(MultiMergedGroup)
+            for merged_group in merged_groups:
+                index.append(MultiMergedGroup(merged_group))
+            # for each neighbor we need to try to merge its merged groups into the current device
+            for neighbor in sorted(neighbors):
+                for merged_group in input[neighbor]:
+                    index.merge(merged_group, key=merged_group)
+            multi_merged_groups = index.groups
+            self._logger.debug(f"Found a total of {len(multi_merged_groups)} for device {uid}")
+
+            if self.config.step3_enable_filtering:
+                size_threshold = self.config.step3_size_threshold
+                encounters_threshold = self.config.step3_encounters_threshold
+                self._logger.debug(f"Filtering groups of device {uid}")
+                multi_merged_groups = [
+                    mmg for mmg in multi_merged_groups
+                    if len(mmg.members) >= size_threshold
+                       and len(mmg.periods) >= encounters_threshold
+                ]
+            multi_merged_groups = [catalog.add(group) for group in multi_merged_groups]
+            multi_merged_groups_by_device[uid] = multi_merged_groups
+
+            # The entries are unique, so the groups changed when the entries are not the same
+            if len(multi_merged_groups) != len(merged_groups) or any(
+                    group is not previous
+                    for group, previous in zip(multi_merged_groups, merged_groups)):
+                changed_now.add(uid)
+                previous_entries = set(map(id, merged_groups))
+                changed_groups += sum(id(group) not in previous_entries
+                                      for group in multi_merged_groups)
+
+        return multi_merged_groups_by_device, processed, changed_now, changed_groups
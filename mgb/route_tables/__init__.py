@@ -0,0 +1,16 @@
+"""
+This module contains the logic associated with the fifth step of algorithm, that is optional.
+In this step we compute the shortest paths between the groups of each group graph, so the path
+to send messages through is found without searching the graph again.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from mgb.route_tables.route_tables import DeviceRoutes, RouteTables, RouteTablesWriter, \
+    shortest_paths, trace_path
+from mgb.route_tables.route_table_runner import RouteTableRunner, open_store, read_graph
+from mgb.route_tables.route_service import RouteService
+from mgb.route_tables.route_server import RouteServer, handle_request
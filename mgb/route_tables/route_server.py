@@ -0,0 +1,156 @@
+"""
+Define the RouteServer class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import json
+import logging
+import os
+import os.path as path
+import socketserver
+import stat
+from mgb.route_tables.route_service import RouteService
+
+
+def handle_request(service: RouteService, body: bytes) -> Any:
+    """
+    Answer a request with a query or a list of queries, encoded in JSON.
+    :param service: The service that answers the queries.
+    :param body: The request.
+    :return: The answer of the query or the list of answers.
+    """
+    try:
+        request = json.loads(body)
+    except ValueError:
+        return {'error': "The request is not valid JSON."}
+    if isinstance(request, list):
+        return service.query_batch(request)
+    if isinstance(request, dict):
+        return service.query_batch([request])[0]
+    return {'error': "The request must be a query or a list of queries."}
+
+
+class _LinesHandler(socketserver.StreamRequestHandler):
+    """Answer the requests of a connection, one JSON document per line in both directions."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            answer = handle_request(self.server.service, line)
+            self.wfile.write(json.dumps(answer).encode('utf8') + b'\n')
+            self.wfile.flush()
+
+
+class _HttpHandler(BaseHTTPRequestHandler):
+    """Answer the requests sent to /route, as a JSON body of a POST or the parameters of a GET."""
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != '/route':
+            self._send(404, {'error': f"Unknown path {url.path}."})
+            return
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        self._send(200, self.server.service.query_batch([query])[0])
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        if url.path != '/route':
+            self._send(404, {'error': f"Unknown path {url.path}."})
+            return
+        self._send(200, handle_request(self.server.service, body))
+
+    def _send(self, status: int, answer: Any) -> None:
+        content = json.dumps(answer).encode('utf8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.getLogger('RouteServer').debug(format % args)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _HttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class RouteServer(object):
+    """
+    Serve the route queries of a RouteService over a local socket, which is either:
+     - a Unix socket, where each request and answer is a JSON document in one line;
+     - an HTTP port of localhost, where the requests are sent to /route, as a JSON body of a
+       POST or as the device, source and target parameters of a GET.
+    A request is a query object, with the device, source and target entries, or a list of
+    queries answered in batch. Each connection is served by a thread.
+    """
+
+    def __init__(self, service: RouteService, socket_path: Optional[str] = None,
+                 port: int = 0) -> None:
+        """
+        Creates the server, listening on the socket.
+        :param service: The service that answers the queries.
+        :param socket_path: The Unix socket path. A previous socket file is replaced. By default
+        the HTTP port is used.
+        :param port: The HTTP port. Use 0 to choose any free port.
+        :raises RuntimeError: If the socket path exists and is not a socket.
+        """
+        self._socket_path = socket_path
+        self._socket_identity = None
+        if socket_path:
+            if path.lexists(socket_path):
+                if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                    raise RuntimeError(f"{socket_path} exists and is not a socket.")
+                os.remove(socket_path)
+            self._server = _UnixServer(socket_path, _LinesHandler)
+            self._socket_identity = self._identity(socket_path)
+        else:
+            self._server = _HttpServer(('127.0.0.1', port), _HttpHandler)
+        self._server.service = service
+
+    @property
+    def address(self) -> str:
+        """The socket address, as a Unix socket path or an HTTP URL."""
+        if self._socket_path:
+            return f"unix:{self._socket_path}"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/route"
+
+    def serve_forever(self) -> None:
+        """Answer the requests until shutdown is called."""
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving, from another thread."""
+        self._server.shutdown()
+
+    def close(self) -> None:
+        """Close the socket, removing the Unix socket file if it is still the one created."""
+        self._server.server_close()
+        if self._socket_identity is not None and \
+                self._identity(self._socket_path) == self._socket_identity:
+            os.remove(self._socket_path)
+        self._socket_identity = None
+
+    @staticmethod
+    def _identity(socket_path: str) -> Optional[Tuple[int, int]]:
+        """The device and inode of a socket file, or None if the path is not a socket."""
+        try:
+            status = os.lstat(socket_path)
+        except OSError:
+            return None
+        return (status.st_dev, status.st_ino) if stat.S_ISSOCK(status.st_mode) else None
@@ -0,0 +1,283 @@
+"""
+Define the RouteService class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+import os.path as path
+import threading
+import numpy as np
+from mgb.route_tables import DeviceRoutes, RouteTables, open_store, read_graph, \
+    shortest_paths, trace_path
+from mgb.shared import Configuration
+
+
+class _GraphRoutes(object):
+    """The graph of a device kept in memory, with the shortest paths from the sources queried."""
+
+    __slots__ = ('indptr', 'indices', 'weights', 'tables', 'rows', 'nbytes')
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 tables: Optional[DeviceRoutes]) -> None:
+        """
+        Keep a graph, given in compressed sparse row format.
+        :param indptr: The position of the first neighbor of each group, and the number of
+        neighbors at the end.
+        :param indices: The neighbors of each group.
+        :param weights: The weight of the edge to each neighbor.
+        :param tables: The routes stored by the route tables step, if there are.
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.tables = tables
+        self.rows: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self.nbytes = indptr.nbytes + indices.nbytes + weights.nbytes
+
+    @property
+    def number_of_groups(self) -> int:
+        """The number of groups (graph nodes)."""
+        return len(self.indptr) - 1
+
+    def row(self, source: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """The distances and predecessors of the shortest paths from a source group, if known."""
+        if self.tables is not None and self.tables.has_source(source):
+            return self.tables.row(source)
+        return self.rows.get(source)
+
+    def search(self, sources: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the shortest paths from many source groups (see shortest_paths).
+        :param sources: The source groups.
+        :return: The distances and predecessors from each source.
+        """
+        return shortest_paths(self.indptr, self.indices, self.weights,
+                              np.array(sources, dtype=np.int64))
+
+    def add_rows(self, sources: Sequence[int], distances: np.ndarray,
+                 predecessors: np.ndarray) -> int:
+        """
+        Keep the shortest paths from many source groups. The rows are only added, never
+        changed, so they can be read while other rows are added.
+        :param sources: The source groups.
+        :param distances: The distances from each source.
+        :param predecessors: The predecessors from each source.
+        :return: The number of bytes used.
+        """
+        for position, source in enumerate(sources):
+            self.rows[source] = (distances[position], predecessors[position])
+        added = distances.nbytes + predecessors.nbytes
+        self.nbytes += added
+        return added
+
+
+class RouteService(object):
+    """
+    Answer queries for the shortest path between two groups of a device graph created by the
+    group graph step, loading each graph once.
+
+    The graphs are kept in memory in a least recently used cache, together with the shortest
+    paths from the groups queried, and the least recently used graphs are discarded when the
+    cache grows over its size. The paths stored by the route tables step are used when they
+    were computed. The answers are memoized too. A batch of queries is answered with one run of
+    Dijkstra's algorithm for all the new sources of each device.
+
+    The service can be used by many threads. The caches are only locked to look up and insert
+    entries, while the graphs are loaded and searched under a lock of their device, so the
+    queries of other devices are not blocked.
+    """
+
+    def __init__(self, config: Configuration, cache_size: int = 256 << 20,
+                 memo_size: int = 100000) -> None:
+        """
+        Creates the service over the output files of a run.
+        :param config: The configuration of the run.
+        :param cache_size: The maximum number of bytes of the graphs and paths kept in memory.
+        The most recently used graph is always kept.
+        :param memo_size: The maximum number of answers memoized.
+        """
+        self._config = config
+        self._cache_size = cache_size
+        self._memo_size = memo_size
+        self._logger = logging.getLogger('RouteService')
+        if config.step4_output_format not in ('pickle', 'csr'):
+            raise RuntimeError(f"Invalid group graph output format "
+                               f"{config.step4_output_format}.")
+        self._store = open_store(config)
+        route_file = path.join(config.output_dir, f"{config.step5_output_prefix}routes.mgbroute")
+        self._tables = RouteTables(route_file) if path.exists(route_file) else None
+        if self._tables is not None:
+            self._logger.info(f"Using the route tables {route_file}")
+        self._graphs: 'OrderedDict[int, _GraphRoutes]' = OrderedDict()
+        self._cached = 0
+        self._memo: 'OrderedDict[Tuple[int, int, int], Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._device_locks: Dict[int, threading.Lock] = {}
+
+    @property
+    def cached_graphs(self) -> int:
+        """The number of graphs kept in memory."""
+        return len(self._graphs)
+
+    @property
+    def cached_bytes(self) -> int:
+        """The number of bytes of the graphs and paths kept in memory."""
+        return self._cached
+
+    def query(self, device: int, source: int, target: int) -> Dict[str, Any]:
+        """
+        Find the shortest path between two groups of a device graph.
+        :param device: The device identifier.
+        :param source: The source group.
+        :param target: The target group.
+        :return: The answer (see query_batch).
+        """
+        return self.query_batch([{'device': device, 'source': source, 'target': target}])[0]
+
+    def query_batch(self, queries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Find the shortest paths of many queries.
+        :param queries: The queries, with the device, source and target entries.
+        :return: The answer of each query, with the query entries, the groups of the path (empty
+        if there is no path) and its distance (None if there is no path), or only an error
+        entry if the query is invalid. The answers must not be changed.
+        """
+        queries = list(queries)
+        answers: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        pending: Dict[int, List[Tuple[int, Tuple[int, int, int]]]] = {}
+        with self._lock:
+            for position, query in enumerate(queries):
+                try:
+                    key = (int(query['device']), int(query['source']), int(query['target']))
+                except (KeyError, TypeError, ValueError):
+                    answers[position] = {'error': "A query needs the integer device, source and "
+                                                  "target entries."}
+                    continue
+                answer = self._memo.get(key)
+                if answer is not None:
+                    self._memo.move_to_end(key)
+                    answers[position] = answer
+                else:
+                    pending.setdefault(key[0], []).append((position, key))
+
+        for device, device_queries in pending.items():
+            try:
+                graph = self._graph(device)
+            except KeyError:
+                error = {'error': f"Unknown device {device}."}
+            except Exception as e:
+                # A damaged graph file can raise many errors when it is unpickled or mapped
+                self._logger.warning(f"Could not read the graph of device {device}: {e!r}")
+                error = {'error': f"Could not read the graph of device {device}."}
+            else:
+                error = None
+            if error is not None:
+                for position, _ in device_queries:
+                    answers[position] = error
+                continue
+            self._add_sources(device, graph, (key[1] for _, key in device_queries))
+            for position, key in device_queries:
+                answers[position] = self._answer(graph, key)
+        with self._lock:
+            self._evict()
+        return answers
+
+    def _has_graph(self, device: int) -> bool:
+        """Check if the group graph step created a graph for a device."""
+        if self._store is not None:
+            return device in self._store
+        return path.isfile(path.join(self._config.output_dir,
+                                     f"{self._config.step4_output_prefix}node{device}.pickle"))
+
+    def _device_lock(self, device: int) -> threading.Lock:
+        """The lock held while the graph of a device is loaded or searched.
+
+        Locks are only created for the devices that have a graph, so the queries of unknown
+        devices do not add locks.
+        """
+        with self._lock:
+            return self._device_locks.setdefault(device, threading.Lock())
+
+    def _cached_graph(self, device: int) -> Optional[_GraphRoutes]:
+        """Look up the graph of a device in memory, marking it as the most recently used."""
+        with self._lock:
+            graph = self._graphs.get(device)
+            if graph is not None:
+                self._graphs.move_to_end(device)
+            return graph
+
+    def _graph(self, device: int) -> _GraphRoutes:
+        """
+        Access the graph of a device, loading it if it is not in memory.
+        :param device: The device identifier.
+        :return: The graph.
+        :raises KeyError: If the device has no graph.
+        :raises Exception: If the device graph files can not be read.
+        """
+        graph = self._cached_graph(device)
+        if graph is not None:
+            return graph
+        if not self._has_graph(device):
+            raise KeyError(device)
+        with self._device_lock(device):
+            # Another thread may have loaded the graph in the meantime
+            graph = self._cached_graph(device)
+            if graph is not None:
+                return graph
+            self._logger.debug(f"Loading the graph of device {device}.")
+            indptr, indices, weights, _ = read_graph(self._config, device, self._store)
+            tables = self._tables[device] if self._tables is not None and device in self._tables \
+                else None
+            graph = _GraphRoutes(indptr, indices, weights, tables)
+            with self._lock:
+                self._graphs[device] = graph
+                self._cached += graph.nbytes
+        return graph
+
+    def _add_sources(self, device: int, graph: _GraphRoutes, sources: Iterable[int]) -> None:
+        """Compute the shortest paths from the valid source groups whose paths are not known."""
+        sources = {source for source in sources if 0 <= source < graph.number_of_groups}
+        with self._device_lock(device):
+            missing = sorted(source for source in sources if graph.row(source) is None)
+            if not missing:
+                return
+            self._logger.debug(f"Computing the routes of {len(missing)} groups of device "
+                               f"{device}.")
+            distances, predecessors = graph.search(missing)
+            with self._lock:
+                added = graph.add_rows(missing, distances, predecessors)
+                # The graph may have been discarded during the search
+                if self._graphs.get(device) is graph:
+                    self._cached += added
+
+    def _answer(self, graph: _GraphRoutes, key: Tuple[int, int, int]) -> Dict[str, Any]:
+        """Answer a query, memoizing the answers of valid queries."""
+        device, source, target = key
+        if not (0 <= source < graph.number_of_groups and 0 <= target < graph.number_of_groups):
+            return {'error': f"Unknown group of device {device}."}
+        distances, predecessors = graph.row(source)
+        distance = float(distances[target])
+        answer = {'device': device, 'source': source, 'target': target,
+                  'path': trace_path(predecessors, source, target),
+                  'distance': distance if distance != float('inf') else None}
+        with self._lock:
+            self._memo[key] = answer
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return answer
+
+    def _evict(self) -> None:
+        """Discard the least recently used graphs while the cache is over its size.
+
+        The lock must be held.
+        """
+        while self._cached > self._cache_size and len(self._graphs) > 1:
+            device, graph = self._graphs.popitem(last=False)
+            self._cached -= graph.nbytes
+            self._logger.debug(f"Discarded the graph of device {device}.")
@@ -0,0 +1,142 @@
+"""
+Define the RouteTableRunner class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, List, Optional, Sequence, Tuple
+import json
+import logging
+import os.path as path
+import pickle
+import numpy as np
+from mgb.graph_creation import GraphStore, to_csr
+from mgb.route_tables import RouteTablesWriter, shortest_paths
+from mgb.shared import Configuration
+
+
+class RouteTableRunner(object):
+    """
+    Compute the shortest paths between the groups of each device graph created by the group
+    graph step, reading the graphs from its output files, and store them in a route tables file
+    (see RouteTables). The devices are processed in parallel when many workers are configured.
+    """
+
+    def __init__(self, config: Configuration):
+        """
+        Creates a new runner.
+        :param config: The current configuration.
+        """
+        self.config = config
+        self._logger = logging.getLogger('RouteTables')
+
+    def run(self, uids: Iterable[int]) -> None:
+        """
+        Executes the route tables step.
+        :param uids: The devices whose graphs were created by the group graph step.
+        """
+        self._logger.info('Starting computing route tables.')
+        if self.config.step5_sources not in ('all', 'own'):
+            raise RuntimeError(f"Invalid route tables sources {self.config.step5_sources}.")
+        if self.config.step4_output_format not in ('pickle', 'csr'):
+            raise RuntimeError(f"Invalid group graph output format "
+                               f"{self.config.step4_output_format}.")
+
+        uids = list(uids)
+        workers = min(self.config.step5_workers, len(uids))
+        writer = RouteTablesWriter(path.join(
+            self.config.output_dir, f"{self.config.step5_output_prefix}routes.mgbroute"))
+        if workers > 1:
+            self._logger.info(f"Computing the route tables with {workers} processes.")
+            # Each worker opens the store of the group graphs once
+            with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_store,
+                                     initargs=(self.config,)) as executor:
+                chunk_size = max(1, len(uids) // (4 * workers))
+                tables = executor.map(_route_worker_device, repeat(self.config), uids,
+                                      chunksize=chunk_size)
+                for uid, (sources, distances, predecessors) in zip(uids, tables):
+                    writer.add(uid, sources, distances, predecessors)
+        else:
+            store = open_store(self.config)
+            for uid in uids:
+                self._logger.debug(f"Processing device {uid}.")
+                writer.add(uid, *_route_device(self.config, uid, store))
+        writer.close()
+
+
+def open_store(config: Configuration) -> Optional[GraphStore]:
+    """Open the store file of the group graphs, if the group graph step created one."""
+    if config.step4_output_format != 'csr':
+        return None
+    return GraphStore(path.join(config.output_dir,
+                                f"{config.step4_output_prefix}graphs.mgbgraph"))
+
+
+def read_graph(config: Configuration, uid: int, store: Optional[GraphStore] = None
+               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Sequence[int]]]:
+    """
+    Read the group graph of a device from the output files of the group graph step.
+    :param config: The current configuration.
+    :param uid: The device identifier.
+    :param store: The store file of the group graphs, if the step created one. By default it is
+    opened again.
+    :return: The graph in compressed sparse row format (the indptr, indices and weights arrays),
+    and the members of each group.
+    """
+    if config.step4_output_format == 'csr':
+        graph = (store or open_store(config)).graph(uid)
+        members = [graph.members(group) for group in range(graph.number_of_groups)]
+        return graph.indptr, graph.indices, graph.weights, members
+
+    prefix = path.join(config.output_dir, f"{config.step4_output_prefix}node{uid}")
+    with open(f"{prefix}.pickle", 'rb') as graph_input:
+        graph = pickle.load(graph_input)
+    with open(f"{prefix}.json", 'r', encoding='utf-8') as groups_input:
+        members = [group['members'] for group in json.load(groups_input)]
+    edges = np.array([(a, b, weight) for a, b, weight in graph.edges(data='weight')],
+                     dtype=np.float64).reshape(-1, 3)
+    indptr, indices, weights = to_csr(len(members), edges[:, 0].astype(np.int64),
+                                      edges[:, 1].astype(np.int64), edges[:, 2])
+    return indptr, indices, weights, members
+
+
+# The store of the group graphs opened by a worker process
+_worker_store: Optional[GraphStore] = None
+
+
+def _open_worker_store(config: Configuration) -> None:
+    """Open the store of the group graphs when a worker process starts."""
+    global _worker_store
+    _worker_store = open_store(config)
+
+
+def _route_worker_device(config: Configuration, uid: int
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute the route tables of a device in a worker process (see _route_device)."""
+    return _route_device(config, uid, _worker_store)
+
+
+def _route_device(config: Configuration, uid: int, store: Optional[GraphStore] = None
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the route tables of a device (in a worker process when many workers are used).
+    :param config: The current configuration.
+    :param uid: The device identifier.
+    :param store: The store file of the group graphs. By default it is opened again.
+    :return: The source groups, the distance from each source to each group and the group
+    before each group in the shortest path from each source.
+    """
+    indptr, indices, weights, members = read_graph(config, uid, store)
+    if config.step5_sources == 'own':
+        # Only the routes from the groups of the device itself
+        sources = np.array([group for group, group_members in enumerate(members)
+                            if uid in group_members], dtype=np.int64)
+    else:
+        sources = np.arange(len(members))
+    distances, predecessors = shortest_paths(indptr, indices, weights, sources)
+    return sources, distances, predecessors
@@ -0,0 +1,280 @@
+"""
+Define the RouteTables class, a memory-mappable file with the shortest paths between the groups
+of every device graph, the RouteTablesWriter class that creates it, and the shortest_paths
+function that computes them.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Iterator, List, Tuple
+import heapq
+import logging
+import math
+import numpy as np
+from mgb.shared import ColumnFile
+
+
+def shortest_paths(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                   sources: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run Dijkstra's algorithm over a graph in compressed sparse row format from each source, with
+    a binary heap of the groups reached, in time O(E log V) per source.
+    :param indptr: The position of the first neighbor of each group, and the number of
+    neighbors at the end.
+    :param indices: The neighbors of each group.
+    :param weights: The weight of the edge to each neighbor, that can not be negative.
+    :param sources: The source groups.
+    :return: The distance from each source to each group, infinite for the groups not reached,
+    and the group before each group in the shortest path from each source, -1 for the source
+    and the groups not reached.
+    """
+    number_of_groups = len(indptr) - 1
+    distances = np.full((len(sources), number_of_groups), np.inf)
+    predecessors = np.full((len(sources), number_of_groups), -1, dtype=np.int32)
+    # The search runs over Python lists, which are much faster to index than arrays
+    bounds = indptr.tolist()
+    neighbors = indices.tolist()
+    lengths = weights.tolist()
+    edges = [list(zip(neighbors[begin:end], lengths[begin:end]))
+             for begin, end in zip(bounds, bounds[1:])]
+    for row, source in enumerate(sources.tolist()):
+        distance = [math.inf] * number_of_groups
+        predecessor = [-1] * number_of_groups
+        distance[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            reached, group = heapq.heappop(heap)
+            if reached > distance[group]:
+                # The group was settled by a shorter path
+                continue
+            for neighbor, weight in edges[group]:
+                candidate = reached + weight
+                if candidate < distance[neighbor]:
+                    distance[neighbor] = candidate
+                    predecessor[neighbor] = group
+                    heapq.heappush(heap, (candidate, neighbor))
+        distances[row] = distance
+        predecessors[row] = predecessor
+    return distances, predecessors
+
+
+def trace_path(predecessors: np.ndarray, source: int, target: int) -> List[int]:
+    """
+    Find a shortest path by following the predecessors back from the target, in time
+    proportional to the path length.
+    :param predecessors: The group before each group in the shortest paths from the source.
+    :param source: The source group.
+    :param target: The target group.
+    :return: The groups of the path, from the source to the target, or an empty list if there is
+    no path.
+    """
+    result = [target]
+    while target != source:
+        target = int(predecessors[target])
+        if target < 0:
+            return []
+        result.append(target)
+    result.reverse()
+    return result
+
+
+class DeviceRoutes(object):
+    """The shortest paths between the groups of a device graph.
+
+    The table rows are the source groups, and the columns are all groups. The arrays are
+    read-only views of the route tables file.
+    """
+
+    __slots__ = ('uid', 'source_rows', 'distances', 'predecessors')
+
+    def __init__(self, uid: int, source_rows: np.ndarray, distances: np.ndarray,
+                 predecessors: np.ndarray) -> None:
+        """Create the routes over the stored tables.
+
+        :param uid: The device identifier.
+        :param source_rows: The table row of each group, -1 for the groups that are not sources.
+        :param distances: The distance from each source to each group.
+        :param predecessors: The group before each group in the shortest path from each source.
+        """
+        self.uid = uid
+        self.source_rows = source_rows
+        self.distances = distances
+        self.predecessors = predecessors
+
+    @property
+    def sources(self) -> np.ndarray:
+        """The source groups, in increasing order."""
+        return np.flatnonzero(self.source_rows >= 0)
+
+    def distance(self, source: int, target: int) -> float:
+        """The length of the shortest path between two groups, infinite if there is no path.
+
+        :raises KeyError: If the routes from the source group were not computed.
+        """
+        return float(self.distances[self._row(source), target])
+
+    def path(self, source: int, target: int) -> List[int]:
+        """Find the shortest path between two groups (see trace_path).
+
+        :param source: The source group.
+        :param target: The target group.
+        :return: The groups of the path, from the source to the target, or an empty list if
+        there is no path.
+        :raises KeyError: If the routes from the source group were not computed.
+        """
+        return trace_path(self.predecessors[self._row(source)], source, target)
+
+    def has_source(self, source: int) -> bool:
+        """Check if the routes from a group were computed."""
+        return self.source_rows[source] >= 0
+
+    def row(self, source: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The distances and predecessors of the shortest paths from a source group.
+
+        :raises KeyError: If the routes from the source group were not computed.
+        """
+        row = self._row(source)
+        return self.distances[row], self.predecessors[row]
+
+    def _row(self, source: int) -> int:
+        """Find the table row of a source group."""
+        row = int(self.source_rows[source])
+        if row < 0:
+            raise KeyError(f"The routes from group {source} were not computed.")
+        return row
+
+    def __repr__(self) -> str:
+        return f"DeviceRoutes(uid={self.uid}, sources={len(self.distances)}, " \
+               f"groups={len(self.source_rows)})"
+
+
+class RouteTables(object):
+    """Read the shortest paths of all device graphs from a memory-mapped route tables file.
+
+    The file is a column file (see ColumnFile), with the tables of all devices concatenated.
+    The offset table (the devices, group_offsets and table_offsets columns) gives the slice of
+    each device: the source rows of the device at position p are group_offsets[p] to
+    group_offsets[p + 1] in the source_rows column, and its tables are table_offsets[p] to
+    table_offsets[p + 1] in the distances and predecessors columns, one row after the other.
+    The distances are stored in double precision, as shortest_paths computes them, so they are
+    the same of the routes computed when the tables are missing.
+    """
+
+    MAGIC = b'MGBROUTE'
+    VERSION = 2
+    COLUMNS = (('devices', '<i8'), ('group_offsets', '<i8'), ('table_offsets', '<i8'),
+               ('source_rows', '<i4'), ('distances', '<f8'), ('predecessors', '<i4'))
+
+    def __init__(self, route_file: str) -> None:
+        """Map the route tables file.
+
+        :param route_file: The route tables file path.
+        :raises ValueError: If the file is not a valid route tables file.
+        """
+        self._route_file = route_file
+        _, self._columns = ColumnFile(route_file, self.MAGIC, self.VERSION).read()
+        self._positions = {uid: position
+                           for position, uid in enumerate(self._columns['devices'].tolist())}
+
+    @property
+    def route_file(self) -> str:
+        """The route tables file path."""
+        return self._route_file
+
+    @property
+    def devices(self) -> np.ndarray:
+        """The identifiers of the devices, in the order they were stored."""
+        return self._columns['devices']
+
+    def routes(self, uid: int) -> DeviceRoutes:
+        """Access the routes of a device.
+
+        :param uid: The device identifier.
+        :return: The routes, over views of the route tables file.
+        :raises KeyError: If the device is not in the file.
+        """
+        position = self._positions[uid]
+        columns = self._columns
+        first_group, last_group = columns['group_offsets'][position:position + 2].tolist()
+        first_entry, last_entry = columns['table_offsets'][position:position + 2].tolist()
+        number_of_groups = last_group - first_group
+        rows = (last_entry - first_entry) // number_of_groups if number_of_groups else 0
+        return DeviceRoutes(
+            uid,
+            columns['source_rows'][first_group:last_group],
+            columns['distances'][first_entry:last_entry].reshape(rows, number_of_groups),
+            columns['predecessors'][first_entry:last_entry].reshape(rows, number_of_groups)
+        )
+
+    def path(self, uid: int, source: int, target: int) -> List[int]:
+        """Find the shortest path between two groups of a device graph (see DeviceRoutes.path)."""
+        return self.routes(uid).path(source, target)
+
+    def __getitem__(self, uid: int) -> DeviceRoutes:
+        return self.routes(uid)
+
+    def __contains__(self, uid: int) -> bool:
+        return uid in self._positions
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+class RouteTablesWriter(object):
+    """Write the route tables of the devices in a file (see RouteTables).
+
+    The tables of each device are written out as they are added, so they are not kept in memory.
+    """
+
+    __slots__ = ('_route_file', '_writer', '_devices', '_groups', '_entries', '_logger')
+
+    def __init__(self, route_file: str) -> None:
+        """Create a writer without tables.
+
+        :param route_file: The route tables file path.
+        """
+        self._route_file = route_file
+        self._writer = ColumnFile(route_file, RouteTables.MAGIC, RouteTables.VERSION).writer(
+            RouteTables.COLUMNS)
+        self._writer.append('group_offsets', np.zeros(1, dtype=np.int64))
+        self._writer.append('table_offsets', np.zeros(1, dtype=np.int64))
+        self._devices = 0
+        self._groups = 0
+        self._entries = 0
+        self._logger = logging.getLogger("RouteTables")
+
+    def add(self, uid: int, sources: np.ndarray, distances: np.ndarray,
+            predecessors: np.ndarray) -> None:
+        """Add the route tables of a device.
+
+        :param uid: The device identifier.
+        :param sources: The source group of each table row.
+        :param distances: The distance from each source to each group.
+        :param predecessors: The group before each group in the shortest path from each source.
+        """
+        number_of_groups = distances.shape[1]
+        source_rows = np.full(number_of_groups, -1, dtype=np.int32)
+        source_rows[sources] = np.arange(len(sources))
+        writer = self._writer
+        writer.append('devices', np.array([uid], dtype=np.int64))
+        writer.append('source_rows', source_rows)
+        writer.append('distances', distances.ravel())
+        writer.append('predecessors', predecessors.ravel())
+        self._devices += 1
+        self._groups += number_of_groups
+        self._entries += distances.size
+        writer.append('group_offsets', np.array([self._groups], dtype=np.int64))
+        writer.append('table_offsets', np.array([self._entries], dtype=np.int64))
+
+    def close(self) -> None:
+        """Complete the route tables file with the tables added."""
+        header = {'devices': self._devices, 'groups': self._groups, 'entries': self._entries}
+        self._writer.close(header)
+        self._logger.info(f"Stored the route tables of {self._devices} devices in "
+                          f"{self._route_file}")
@@ -4,7 +4,11 @@ This module contains classes used by multiple steps of the detection algorithm.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: May 2018
-Modified: Jun 2018
+Modified: Oct 2026
 """
 from mgb.shared.configuration import Configuration
-from mgb.shared.period import Period
\ No newline at end of file
+from mgb.shared.period import Period
+from mgb.shared.interval_set import IntervalSet
+from mgb.shared.node_index import NodeIndex
+from mgb.shared.member_set import MemberSet
+from mgb.shared.column_file import ColumnFile, ColumnWriter
\ No newline at end of file
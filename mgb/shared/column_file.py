@@ -0,0 +1,192 @@
+"""
+Define the ColumnFile class, a binary file of numeric columns that are memory-mapped when read,
+and the ColumnWriter class that writes it chunk by chunk.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Sequence, Tuple
+import json
+import os
+import os.path as path
+import shutil
+import struct
+import tempfile
+import numpy as np
+
+
+class ColumnFile(object):
+    """Read and write a file made of a header and numeric columns.
+
+    The file starts with a small header, followed by one array per column:
+        [magic] [version: uint32] [header size: uint32] [json header] [columns...]
+    The JSON header has the values given by the writer and the position and length of each
+    column, in its 'columns' entry. Columns are aligned to 64 bytes, and are memory-mapped when
+    the file is read, so reading a file does not copy or parse the columns.
+    """
+
+    __slots__ = ('_file', '_magic', '_version')
+
+    ALIGNMENT = 64
+
+    def __init__(self, file: str, magic: bytes, version: int) -> None:
+        """Create the file handler.
+
+        :param file: The file path.
+        :param magic: The bytes that identify the kind of file.
+        :param version: The version of the kind of file.
+        """
+        self._file = file
+        self._magic = magic
+        self._version = version
+
+    @property
+    def file(self) -> str:
+        """The file path."""
+        return self._file
+
+    def read(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """Map the file columns.
+
+        :return: The header and the read-only columns, by name.
+        :raises ValueError: If the file is not of the expected kind and version.
+        """
+        with open(self._file, 'rb') as input:
+            prefix = input.read(len(self._magic) + 8)
+            if len(prefix) < len(self._magic) + 8 or not prefix.startswith(self._magic):
+                raise ValueError(f"{self._file} is not a {self._magic.decode()} file.")
+            version, header_size = struct.unpack('<II', prefix[len(self._magic):])
+            if version != self._version:
+                raise ValueError(f"Unsupported {self._magic.decode()} file version {version}.")
+            header = json.loads(input.read(header_size).decode('utf8'))
+        columns = {
+            column['name']: np.memmap(self._file, dtype=column['dtype'], mode='r',
+                                      offset=column['offset'], shape=(column['length'],))
+            if column['length'] else np.empty(0, dtype=column['dtype'])
+            for column in header['columns']
+        }
+        return header, columns
+
+    def write(self, header: Dict[str, Any],
+              columns: Sequence[Tuple[str, str, Iterable[np.ndarray]]]) -> None:
+        """Write the file, replacing it only when it is complete.
+
+        :param header: The header values.
+        :param columns: The name, data type and chunks of each column. The chunks are written
+        one after the other.
+        """
+        chunks: List[List[np.ndarray]] = [list(column_chunks) for _, _, column_chunks in columns]
+
+        def write_column(output: BinaryIO, position: int) -> None:
+            dtype = columns[position][1]
+            for chunk in chunks[position]:
+                output.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+
+        self._write(header, [(name, dtype) for name, dtype, _ in columns],
+                    [sum(len(chunk) for chunk in column_chunks) for column_chunks in chunks],
+                    write_column)
+
+    def writer(self, columns: Sequence[Tuple[str, str]]) -> 'ColumnWriter':
+        """Create a writer that receives the columns chunk by chunk (see ColumnWriter).
+
+        :param columns: The name and data type of each column.
+        """
+        return ColumnWriter(self, columns)
+
+    def _write(self, header: Dict[str, Any], columns: Sequence[Tuple[str, str]],
+               lengths: Sequence[int], write_column: Callable[[BinaryIO, int], None]) -> None:
+        """Write the file, replacing it only when it is complete.
+
+        :param header: The header values.
+        :param columns: The name and data type of each column.
+        :param lengths: The length of each column.
+        :param write_column: Write the data of the column at a position in the output.
+        """
+        header = dict(header, columns=[])
+        # The header size depends on the columns offsets, so they are computed over a fixed
+        # width placeholder
+        header_size = len(self._encode_header(header)) + 96 * len(columns)
+        offset = self._align(len(self._magic) + 8 + header_size)
+        for (name, dtype), length in zip(columns, lengths):
+            header['columns'].append({'name': name, 'dtype': dtype, 'offset': offset,
+                                      'length': length})
+            offset = self._align(offset + length * np.dtype(dtype).itemsize)
+        encoded = self._encode_header(header).ljust(header_size)
+
+        temporary_file = f"{self._file}.tmp{os.getpid()}"
+        try:
+            with open(temporary_file, 'wb') as output:
+                output.write(self._magic + struct.pack('<II', self._version, header_size)
+                             + encoded)
+                for position, column in enumerate(header['columns']):
+                    output.write(b'\0' * (column['offset'] - output.tell()))
+                    write_column(output, position)
+            os.replace(temporary_file, self._file)
+        finally:
+            if path.exists(temporary_file):
+                os.remove(temporary_file)
+
+    def _align(self, offset: int) -> int:
+        """Round an offset up to the columns alignment."""
+        return -(-offset // self.ALIGNMENT) * self.ALIGNMENT
+
+    @staticmethod
+    def _encode_header(header: Dict[str, Any]) -> bytes:
+        return json.dumps(header, sort_keys=True).encode('utf8')
+
+
+class ColumnWriter(object):
+    """Write a column file whose columns are received chunk by chunk.
+
+    Each column is spooled in an anonymous temporary file in the directory of the column file,
+    so the chunks are not kept in memory, and the file is assembled when the writer is closed.
+    """
+
+    __slots__ = ('_column_file', '_columns', '_spools', '_lengths')
+
+    def __init__(self, column_file: ColumnFile, columns: Sequence[Tuple[str, str]]) -> None:
+        """Create a writer without data.
+
+        :param column_file: The file to write.
+        :param columns: The name and data type of each column.
+        """
+        self._column_file = column_file
+        self._columns = list(columns)
+        directory = path.dirname(path.abspath(column_file.file))
+        self._spools = {name: tempfile.TemporaryFile(dir=directory) for name, _ in columns}
+        self._lengths = {name: 0 for name, _ in columns}
+
+    def append(self, name: str, chunk: np.ndarray) -> None:
+        """Append a chunk of values at the end of a column.
+
+        :param name: The column name.
+        :param chunk: The values.
+        """
+        dtype = next(dtype for column, dtype in self._columns if column == name)
+        self._spools[name].write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+        self._lengths[name] += len(chunk)
+
+    def close(self, header: Dict[str, Any]) -> None:
+        """Write the file with the columns received, replacing it only when it is complete.
+
+        :param header: The header values.
+        """
+        def write_column(output: BinaryIO, position: int) -> None:
+            spool = self._spools[self._columns[position][0]]
+            spool.seek(0)
+            shutil.copyfileobj(spool, output, 1 << 20)
+
+        try:
+            self._column_file._write(header, self._columns,
+                                     [self._lengths[name] for name, _ in self._columns],
+                                     write_column)
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """Discard the columns received, without writing the file."""
+        for spool in self._spools.values():
+            spool.close()
@@ -4,10 +4,14 @@ Define the configuration class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: May 2018
-Modified: May 2018
+Modified: Oct 2026
 """
 
 from configparser import ConfigParser
+from typing import List
+import copy
+import itertools
+import os.path as path
 
 
 class Configuration(object):
@@ -28,7 +32,9 @@ class Configuration(object):
         self.inactive_threshold = parser.getint('basic', 'inactive_threshold')
         self.scan_interval = parser.getint('basic', 'scan_interval')
         self.output_dir = parser.get('basic', 'output_dir')
-        self.nrof_nodes = parser.getint('basic', 'nrof_nodes')
+        self.nrof_nodes = parser.getint('basic', 'nrof_nodes', fallback=0)
+        self.trace_cache = parser.getboolean('basic', 'trace_cache', fallback=True)
+        self.trace_cache_file = parser.get('basic', 'trace_cache_file', fallback='')
         self.scan_interval = parser.getint('basic', 'scan_interval')
         self.output_dir = parser.get('basic', 'output_dir')
 
@@ -37,12 +43,19 @@ class Configuration(object):
         self.step1_output_prefix = parser.get('step1', 'output_prefix')
         self.step1_enable_filtering = parser.get('step1', 'enable_filtering')
         self.step1_size_threshold = parser.getint('step1', 'size_threshold')
+        self.step1_engine = parser.get('step1', 'engine', fallback='device')
+        self.step1_workers = parser.getint('step1', 'workers', fallback=1)
+        self.step1_parallel_split = parser.get('step1', 'parallel_split', fallback='devices')
+        self.step1_checkpoint_periods = parser.getint('step1', 'checkpoint_periods', fallback=0)
+        self.step1_checkpoint_minutes = parser.getfloat('step1', 'checkpoint_minutes', fallback=0)
+        self.step1_checkpoint_file = parser.get('step1', 'checkpoint_file', fallback='')
 
         # step 2 section
         self.step2_enable_output = parser.getboolean('step2', 'enable_output')
         self.step2_output_prefix = parser.get('step2', 'output_prefix')
         self.step2_enable_filtering = parser.getboolean('step2', 'enable_filtering')
         self.step2_encounters_threshold = parser.getint('step2', 'encounters_threshold')
+        self.step2_online = parser.getboolean('step2', 'online', fallback=False)
 
         # step 3 section
         self.step3_enable_output = parser.getboolean('step3', 'enable_output')
@@ -50,8 +63,62 @@ class Configuration(object):
         self.step3_enable_filtering = parser.getboolean('step3', 'enable_filtering')
         self.step3_size_threshold = parser.getint('step3', 'size_threshold')
         self.step3_encounters_threshold = parser.getint('step3', 'encounters_threshold')
+        self.step3_rounds = parser.getint('step3', 'rounds', fallback=2)
 
         # step 4 section
         self.step4_output_prefix = parser.get('step4', 'output_prefix')
         self.step4_simulation_time = parser.getint('step4', 'simulation_time')
-        self.step4_message_ttl = parser.getint('step4', 'message_ttl')
\ No newline at end of file
+        self.step4_message_ttl = parser.getint('step4', 'message_ttl')
+        self.step4_output_format = parser.get('step4', 'output_format', fallback='pickle')
+
+        # step 5 section
+        self.step5_enable = parser.getboolean('step5', 'enable', fallback=False)
+        self.step5_output_prefix = parser.get('step5', 'output_prefix', fallback='step5-')
+        self.step5_sources = parser.get('step5', 'sources', fallback='all')
+        self.step5_workers = parser.getint('step5', 'workers', fallback=1)
+
+        # serve section
+        self.serve_socket = parser.get('serve', 'socket', fallback='')
+        self.serve_port = parser.getint('serve', 'port', fallback=8470)
+        self.serve_cache_size = parser.getint('serve', 'cache_size', fallback=256)
+        self.serve_memo_size = parser.getint('serve', 'memo_size', fallback=100000)
+
+        # sweep section
+        self.sweep_friend_thresholds = self._get_list(parser, 'friend_threshold',
+                                                      self.friend_threshold)
+        self.sweep_inactive_thresholds = self._get_list(parser, 'inactive_threshold',
+                                                        self.inactive_threshold)
+        self.sweep_scan_intervals = self._get_list(parser, 'scan_interval', self.scan_interval)
+
+    def sweep(self) -> List['Configuration']:
+        """
+        Create one configuration for each parameter set of the sweep grid.
+        Each configuration writes its results in a subdirectory of the output directory.
+        :return: The configurations, grouped by scan interval.
+        """
+        result = []
+        for scan_interval, friend_threshold, inactive_threshold in itertools.product(
+                self.sweep_scan_intervals, self.sweep_friend_thresholds,
+                self.sweep_inactive_thresholds):
+            config = copy.copy(self)
+            config.scan_interval = scan_interval
+            config.friend_threshold = friend_threshold
+            config.inactive_threshold = inactive_threshold
+            name = f"friend{friend_threshold}-inactive{inactive_threshold}-scan{scan_interval}"
+            config.output_dir = path.join(self.output_dir, name)
+            result.append(config)
+        return result
+
+    @staticmethod
+    def _get_list(parser: ConfigParser, option: str, default: int) -> List[int]:
+        """
+        Read a comma separated list of integers from the sweep section.
+        :param parser: The configuration parser.
+        :param option: The option name.
+        :param default: The value used when the option is missing.
+        :return: The list of values.
+        """
+        value = parser.get('sweep', option, fallback='')
+        if not value.strip():
+            return [default]
+        return [int(item) for item in value.split(',') if item.strip()]
\ No newline at end of file
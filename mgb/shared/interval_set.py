@@ -0,0 +1,74 @@
+"""
+Define the IntervalSet class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Tuple, Union
+from mgb.shared.period import Period
+
+
+class IntervalSet(object):
+    """A set of periods without intersection, sorted by begin time.
+
+    A new period is combined with every period it intersects (see Period.has_intersection), so
+    the set never keeps overlapping periods. Periods that only touch each other are kept apart.
+    The begin and end times are stored in two sorted lists, and the periods affected by an
+    insertion are found by binary search.
+    """
+
+    __slots__ = ('_begins', '_ends')
+
+    def __init__(self, periods: Union['IntervalSet', Iterable[Period]] = ()) -> None:
+        """Build the set.
+
+        :param periods: The initial periods, in any order and possibly overlapping.
+        """
+        self._begins: List[float] = []
+        self._ends: List[float] = []
+        self.update(periods)
+
+    def add(self, period: Period) -> None:
+        """Add a period, combining it with the periods it intersects.
+
+        :param period: The period.
+        """
+        self._insert(period.begin, period.end)
+
+    def update(self, periods: Union['IntervalSet', Iterable[Period]]) -> None:
+        """Add many periods.
+
+        :param periods: The periods, in any order and possibly overlapping.
+        """
+        if isinstance(periods, IntervalSet):
+            bounds: Iterable[Tuple[float, float]] = list(zip(periods._begins, periods._ends))
+        else:
+            bounds = [(period.begin, period.end) for period in periods]
+        for begin, end in bounds:
+            self._insert(begin, end)
+
+    def _insert(self, begin: float, end: float) -> None:
+        """Insert the period [begin, end], combining it with the periods it intersects."""
+        begins, ends = self._begins, self._ends
+        # Since the periods do not intersect, both lists are sorted: the periods intersected
+        # are the ones that end after the begin and begin before the end
+        first = bisect_right(ends, begin)
+        last = bisect_left(begins, end, first)
+        if first < last:
+            begin = min(begin, begins[first])
+            end = max(end, ends[last - 1])
+        begins[first:last] = (begin,)
+        ends[first:last] = (end,)
+
+    def __len__(self) -> int:
+        return len(self._begins)
+
+    def __iter__(self) -> Iterator[Period]:
+        return (Period(begin, end) for begin, end in zip(self._begins, self._ends))
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(zip(self._begins, self._ends))!r})"
@@ -0,0 +1,146 @@
+"""
+Define the MemberSet class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Dict, Iterable, Iterator, List, Union
+
+
+def popcount(value: int) -> int:
+    """Count the bits set in a non-negative integer."""
+    return bin(value).count('1')
+
+
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count  # noqa: F811
+
+
+class MemberSet(object):
+    """A set of node identifiers stored as a bitmap in a Python integer.
+
+    Each node identifier seen by the process is given a bit, in order of appearance, so the
+    bitmaps are dense even when the identifiers are sparse or huge. The intersection and union
+    sizes used by the group similarity are computed by counting bits, without building
+    temporary sets. The members are iterated in increasing identifier order.
+    """
+
+    __slots__ = ('_bits',)
+
+    # Bit of each node identifier, and identifier of each bit, shared by all member sets
+    _bit_of: Dict[int, int] = {}
+    _id_of: List[int] = []
+
+    def __init__(self, members: Union['MemberSet', Iterable[int]] = ()) -> None:
+        """Build the set.
+
+        :param members: The members identifiers or another member set to copy.
+        """
+        if isinstance(members, MemberSet):
+            self._bits = members._bits
+        else:
+            self._bits = self._encode(members)
+
+    @classmethod
+    def _encode(cls, members: Iterable[int]) -> int:
+        """Build the bitmap of node identifiers, giving bits to the new ones."""
+        bit_of = cls._bit_of
+        bits = 0
+        for member in members:
+            bit = bit_of.get(member)
+            if bit is None:
+                bit = bit_of[member] = len(cls._id_of)
+                cls._id_of.append(member)
+            bits |= 1 << bit
+        return bits
+
+    @property
+    def bits(self) -> int:
+        """The bitmap of the members, meaningful only inside this process."""
+        return self._bits
+
+    def similarity(self, other: 'MemberSet') -> float:
+        """Compute the group similarity coefficient: the intersection size over the union size.
+
+        :param other: The other member set.
+        :return: The similarity coefficient (varies from 0 to 1.0), 0 when both sets are empty.
+        """
+        union = self._bits | other._bits
+        if not union:
+            return 0.0
+        return popcount(self._bits & other._bits) / popcount(union)
+
+    def update(self, other: Union['MemberSet', Iterable[int]]) -> None:
+        """Add the members of another set.
+
+        :param other: The other member set or the members identifiers.
+        """
+        self._bits |= other._bits if isinstance(other, MemberSet) else self._encode(other)
+
+    def add(self, member: int) -> None:
+        """Add a member.
+
+        :param member: The member identifier.
+        """
+        self._bits |= self._encode((member,))
+
+    def __len__(self) -> int:
+        return popcount(self._bits)
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __iter__(self) -> Iterator[int]:
+        id_of = self._id_of
+        # The bits are found in the binary text, from the lowest one
+        text = bin(self._bits)[:1:-1]
+        ids = []
+        position = text.find('1')
+        while position >= 0:
+            ids.append(id_of[position])
+            position = text.find('1', position + 1)
+        return iter(sorted(ids))
+
+    def __contains__(self, member: object) -> bool:
+        bit = self._bit_of.get(member)
+        return bit is not None and (self._bits >> bit) & 1 == 1
+
+    def __and__(self, other: 'MemberSet') -> 'MemberSet':
+        return self._from_bits(self._bits & other._bits)
+
+    def __or__(self, other: 'MemberSet') -> 'MemberSet':
+        return self._from_bits(self._bits | other._bits)
+
+    def __sub__(self, other: 'MemberSet') -> 'MemberSet':
+        return self._from_bits(self._bits & ~other._bits)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MemberSet):
+            return self._bits == other._bits
+        if isinstance(other, (set, frozenset)):
+            return len(self) == len(other) and all(member in self for member in other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __copy__(self) -> 'MemberSet':
+        return self._from_bits(self._bits)
+
+    def __deepcopy__(self, memo: dict) -> 'MemberSet':
+        return self._from_bits(self._bits)
+
+    def __reduce__(self):
+        # The bits are only meaningful in this process, so the identifiers are stored
+        return MemberSet, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"MemberSet({list(self)!r})"
+
+    @classmethod
+    def _from_bits(cls, bits: int) -> 'MemberSet':
+        member_set = cls.__new__(cls)
+        member_set._bits = bits
+        return member_set
@@ -0,0 +1,73 @@
+"""
+Define the NodeIndex class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from typing import Iterable, Union
+import numpy as np
+
+
+class NodeIndex(object):
+    """Map node identifiers, that may be sparse or huge, to dense indexes from 0 to n - 1.
+
+    The indexes follow the order of the identifiers, so sorting by index is the same of sorting
+    by identifier, and when the identifiers are already dense each index is the identifier itself.
+    """
+
+    __slots__ = ('_ids', '_is_identity')
+
+    def __init__(self, ids: Union[np.ndarray, Iterable[int]]) -> None:
+        """Build the index.
+
+        :param ids: The node identifiers, in any order and possibly repeated.
+        """
+        ids = ids if isinstance(ids, np.ndarray) else list(ids)
+        self._ids = np.unique(np.asarray(ids, dtype=np.int64))
+        self._is_identity = bool(not len(self._ids) or (
+            self._ids[0] == 0 and self._ids[-1] == len(self._ids) - 1))
+
+    @property
+    def ids(self) -> np.ndarray:
+        """The node identifiers, sorted."""
+        return self._ids
+
+    @property
+    def is_identity(self) -> bool:
+        """Check if each index is the node identifier itself."""
+        return self._is_identity
+
+    def index_of(self, ids: Union[np.ndarray, Iterable[int]]) -> np.ndarray:
+        """Find the indexes of node identifiers.
+
+        :param ids: The node identifiers.
+        :return: The index of each identifier.
+        """
+        ids = np.asarray(ids if isinstance(ids, np.ndarray) else list(ids), dtype=np.int64)
+        if self._is_identity:
+            if len(ids) and (ids.min() < 0 or ids.max() >= len(self._ids)):
+                raise KeyError("There are unknown node identifiers.")
+            return ids
+        indexes = np.searchsorted(self._ids, ids)
+        if len(ids) and (indexes.max() >= len(self._ids) or
+                         np.any(self._ids[np.minimum(indexes, len(self._ids) - 1)] != ids)):
+            raise KeyError("There are unknown node identifiers.")
+        return indexes
+
+    def id_of(self, indexes: Union[np.ndarray, Iterable[int]]) -> np.ndarray:
+        """Find the node identifiers of indexes.
+
+        :param indexes: The indexes.
+        :return: The identifier of each index.
+        """
+        indexes = indexes if isinstance(indexes, np.ndarray) else list(indexes)
+        return self._ids[np.asarray(indexes, dtype=np.int64)]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __repr__(self) -> str:
+        return f"NodeIndex(nodes={len(self)}, identity={self._is_identity})"
@@ -4,16 +4,19 @@ Define the period class.
 Authors:
     Michael D. Silva <micdoug.silva@gmail.com>
 Created: Jan 2018
-Modified: Jan 2018
+Modified: Oct 2026
 """
 
 
 class Period(object):
     """Represent a period in time with a begin and an end.
 
-    Time values are expressed as float values, reflecting the simulator approach.
+    Time values are expressed as float values, reflecting the simulator approach. Periods are
+    immutable, so they can be shared by many groups: combining two periods creates a new one.
     """
 
+    __slots__ = ('_begin', '_end')
+
     def __init__(self, begin: float, end: float) -> None:
         """Build a period object.
 
@@ -53,17 +56,5 @@ class Period(object):
         """
         return not (other.end <= self.begin or other.begin >= self.end)
 
-    def try_merge(self, other: 'Period') -> bool:
-        """
-        Merge two periods if they have intersection.
-        :param other: Other period.
-        :return: If the periods were merged.
-        """
-        if self.has_intersection(other):
-            self._begin = min(self._begin, other.begin)
-            self._end = max(self._end, other.end)
-            return True
-        return False
-
     def __repr__(self) -> str:
         return "Period(begin: {}, end: {})".format(self.begin, self.end)
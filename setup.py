@@ -123,7 +123,8 @@ setup(
     # https://packaging.python.org/en/latest/requirements.html
     install_requires=[
         'click',
-        'networkx'
+        'networkx',
+        'numpy'
     ],  
 
     # List additional groups of dependencies here (e.g. development
@@ -0,0 +1,51 @@
+"""
+Helpers shared by the unit tests.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from random import Random
+from mgb.group_merging import GroupEncounter, MergedGroup
+from mgb.neighborhood_inspection import MultiMergedGroup
+from mgb.shared import MemberSet
+
+
+def write_trace(trace_file: str, seed: int) -> None:
+    """Write a trace with bursts of contacts, separated by periods without connections."""
+    rng = Random(seed)
+    time = 0.0
+    with open(trace_file, 'w') as output:
+        for _ in range(6):
+            connected = set()
+            for _ in range(rng.randint(20, 60)):
+                time += rng.uniform(1, 90)
+                pair = tuple(sorted(rng.sample(range(10), 2)))
+                state = 'down' if pair in connected else 'up'
+                connected.symmetric_difference_update({pair})
+                output.write(f"{time:.2f} CONN {pair[0]} {pair[1]} {state}\n")
+            for pair in sorted(connected):
+                time += rng.uniform(1, 30)
+                output.write(f"{time:.2f} CONN {pair[0]} {pair[1]} down\n")
+            time += rng.choice((60, 600, 1800))
+
+
+def multi_merged_group(members, *periods):
+    """Build a multi merged group with the given encounters."""
+    group = MergedGroup(GroupEncounter(MemberSet(members), *periods[0]))
+    for period in periods[1:]:
+        group.try_merge(GroupEncounter(MemberSet(members), *period))
+    return MultiMergedGroup(group)
+
+
+def random_groups(rng, count):
+    """Build random multi merged groups."""
+    groups = []
+    for _ in range(count):
+        members = set(rng.sample(range(40), rng.randint(2, 8)))
+        periods = [(begin, begin + 10) for begin in rng.sample(range(0, 1000, 20),
+                                                                rng.randint(1, 4))]
+        groups.append(multi_merged_group(members, *periods))
+    return groups
@@ -0,0 +1,101 @@
+"""
+Unit tests of GraphCreationRunner class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+import pickle
+from itertools import combinations
+from math import exp, log
+from os import path
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import MagicMock
+import numpy as np
+from mgb.graph_creation import GraphCreationRunner, GraphStore
+from helpers import multi_merged_group, random_groups
+
+
+def run_step(output_dir, input, output_format):
+    """Run the step with the given output format."""
+    config = MagicMock(output_dir=output_dir, step4_output_prefix=f"{output_format}-",
+                       step4_simulation_time=1000, step4_message_ttl=50,
+                       step4_output_format=output_format)
+    GraphCreationRunner(config).run(input)
+
+
+class GraphCreationRunnerTests(TestCase):
+    """GraphCreationRunner unit tests."""
+
+    def test_graph(self):
+        """The groups sharing members are connected with the weight computed for each pair."""
+        groups = random_groups(Random(3), 60)
+        groups.append(multi_merged_group({90, 91}, (0, 10)))
+
+        with TemporaryDirectory() as output_dir:
+            run_step(output_dir, {0: groups, 1: groups[:1], 2: []}, 'pickle')
+            graphs = []
+            for uid in range(3):
+                with open(path.join(output_dir, f"pickle-node{uid}.pickle"), 'rb') as graph_file:
+                    graphs.append(pickle.load(graph_file))
+
+        weights = [1 - exp(-(50 * (len(group.periods) / 1000))) for group in groups]
+        expected = {}
+        for a, b in combinations(range(len(groups)), 2):
+            similarity = groups[a].members.similarity(groups[b].members)
+            if similarity:
+                expected[a, b] = -log(weights[a] * weights[b] * similarity)
+        self.assertGreater(len(expected), 0)
+        self.assertListEqual(list(graphs[0].nodes), list(range(len(groups))))
+        self.assertEqual(graphs[0].degree(len(groups) - 1), 0)
+        edges = {(min(a, b), max(a, b)): weight
+                 for a, b, weight in graphs[0].edges(data='weight')}
+        self.assertSetEqual(set(edges), set(expected))
+        for pair, weight in expected.items():
+            self.assertAlmostEqual(edges[pair], weight)
+
+        self.assertListEqual(list(graphs[1].nodes), [0])
+        self.assertEqual(graphs[2].number_of_nodes(), 0)
+
+    def test_store(self):
+        """The store keeps the pickled graphs and the groups, over views of the store file."""
+        rng = Random(4)
+        input = {uid: random_groups(rng, rng.randint(0, 30)) for uid in (7, 3, 12, 5)}
+        input[5] = input[5][:1]
+
+        with TemporaryDirectory() as output_dir:
+            run_step(output_dir, input, 'pickle')
+            run_step(output_dir, input, 'csr')
+            store = GraphStore(path.join(output_dir, 'csr-graphs.mgbgraph'))
+            self.assertListEqual(store.devices.tolist(), [7, 3, 12, 5])
+            self.assertNotIn(4, store)
+            for uid, groups in input.items():
+                with open(path.join(output_dir, f"pickle-node{uid}.pickle"), 'rb') as graph_file:
+                    expected = pickle.load(graph_file)
+                graph = store[uid]
+                self.assertEqual(graph.number_of_groups, len(groups))
+                self.assertEqual(graph.number_of_edges, expected.number_of_edges())
+                self.assertIsInstance(graph.indptr, np.memmap)
+                self.assertFalse(graph.indptr.flags.writeable)
+
+                networkx_graph = graph.to_networkx()
+                self.assertListEqual(list(networkx_graph.nodes), list(expected.nodes))
+                self.assertDictEqual({frozenset(edge[:2]): edge[2]
+                                      for edge in networkx_graph.edges(data='weight')},
+                                     {frozenset(edge[:2]): edge[2]
+                                      for edge in expected.edges(data='weight')})
+                for identifier, group in enumerate(groups):
+                    self.assertListEqual(graph.neighbors(identifier).tolist(),
+                                         sorted(expected.neighbors(identifier)))
+                    self.assertListEqual(graph.members(identifier).tolist(), list(group.members))
+                    self.assertListEqual(graph.periods(identifier).tolist(),
+                                         [[p.begin, p.end] for p in group.periods])
+            del store, graph
+
+            invalid_file = path.join(output_dir, 'pickle-node7.pickle')
+            with self.assertRaises(ValueError):
+                GraphStore(invalid_file)
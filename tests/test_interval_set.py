@@ -0,0 +1,61 @@
+"""
+Unit tests of IntervalSet class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from random import Random
+from unittest import TestCase
+from mgb.shared import IntervalSet, Period
+
+
+def coalesce(periods):
+    """Combine the periods with intersection until no pair intersects."""
+    result = []
+    for period in periods:
+        while True:
+            overlapping = [other for other in result if other.has_intersection(period)]
+            if not overlapping:
+                break
+            for other in overlapping:
+                result.remove(other)
+                period = period + other
+        result.append(period)
+    return sorted((period.begin, period.end) for period in result)
+
+
+def bounds(interval_set):
+    """Convert an interval set into comparable values."""
+    return [(period.begin, period.end) for period in interval_set]
+
+
+class IntervalSetTests(TestCase):
+    """IntervalSet unit tests."""
+
+    def test_add(self):
+        """Periods with intersection are combined, and touching periods are kept apart."""
+        periods = IntervalSet([Period(50, 60), Period(0, 10)])
+        self.assertListEqual(bounds(periods), [(0, 10), (50, 60)])
+        periods.add(Period(10, 20))
+        self.assertListEqual(bounds(periods), [(0, 10), (10, 20), (50, 60)])
+        periods.add(Period(5, 55))
+        self.assertListEqual(bounds(periods), [(0, 60)])
+        periods.add(Period(60, 60))
+        periods.add(Period(30, 30))
+        self.assertListEqual(bounds(periods), [(0, 60), (60, 60)])
+        self.assertEqual(len(periods), 2)
+
+    def test_random_periods(self):
+        """The set is the same of combining the periods with intersection, in any order."""
+        rng = Random(11)
+        for _ in range(200):
+            periods = []
+            for _ in range(rng.randint(0, 30)):
+                begin = rng.randint(0, 100)
+                periods.append(Period(begin, begin + rng.choice((0, 1, 2, 5, 20))))
+            interval_set = IntervalSet(periods[:len(periods) // 2])
+            interval_set.update(IntervalSet(periods[len(periods) // 2:]))
+            self.assertListEqual(bounds(interval_set), coalesce(periods))
@@ -0,0 +1,256 @@
+"""
+Unit tests of LocalDetectionRunner class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from mgb.group_merging import GroupMergingRunner
+from mgb.local_detection import Checkpoint, LocalDetectionRunner, TraceReader
+from mgb.shared import Configuration
+from helpers import write_trace
+
+CONFIGURATION = """
+[basic]
+trace_file = {directory}/trace.txt
+friend_threshold = 3
+inactive_threshold = 2
+nrof_nodes = 10
+scan_interval = 60
+output_dir = {directory}
+
+[step1]
+enable_output = false
+output_prefix = step1-
+enable_filtering = false
+size_threshold = 3
+workers = {workers}
+parallel_split = {split}
+{sweep}
+
+[step2]
+enable_output = false
+output_prefix = step2-
+enable_filtering = true
+encounters_threshold = 2
+
+[step3]
+enable_output = false
+output_prefix = step3-
+enable_filtering = true
+encounters_threshold = 2
+size_threshold = 3
+
+[step4]
+output_prefix = step4-
+simulation_time = 1296000
+message_ttl = 1296000
+"""
+
+
+# Sparse identifiers for the nodes of the trace, in increasing order
+SPARSE = [7, 19, 1000, 2 ** 33, 2 ** 33 + 5, 2 ** 40, 2 ** 48 - 1, 2 ** 52, 2 ** 60, 2 ** 62]
+
+
+def summary(archived):
+    """Convert archived neighborhoods into comparable values."""
+    return {
+        uid: [(sorted(n.members), n.started, n.ended) for n in neighborhoods]
+        for uid, neighborhoods in archived.items()
+    }
+
+
+def merged_summary(merged):
+    """Convert merged groups into comparable values."""
+    return {
+        uid: [(sorted(group.members), [(p.begin, p.end) for p in group.periods])
+              for group in groups]
+        for uid, groups in merged.items()
+    }
+
+
+class LocalDetectionRunnerTests(TestCase):
+    """LocalDetectionRunner unit tests."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        write_trace(os.path.join(self.directory, 'trace.txt'), 3)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def run_detection(self, workers: int, split: str):
+        config_file = os.path.join(self.directory, f'config{workers}{split}.ini')
+        with open(config_file, 'w') as output:
+            output.write(CONFIGURATION.format(directory=self.directory, workers=workers,
+                                              split=split, sweep=''))
+        return summary(LocalDetectionRunner(Configuration(config_file)).run())
+
+    def test_parallel_split(self) -> None:
+        """The parallel runs detect the same groups of the single process run."""
+        expected = self.run_detection(1, 'devices')
+        self.assertTrue(any(expected.values()))
+        self.assertDictEqual(self.run_detection(3, 'devices'), expected)
+        self.assertDictEqual(self.run_detection(3, 'time'), expected)
+
+    def test_time_segments(self) -> None:
+        """The trace is only cut at quiescent points."""
+        config_file = os.path.join(self.directory, 'config.ini')
+        with open(config_file, 'w') as output:
+            output.write(CONFIGURATION.format(directory=self.directory, workers=4, split='time',
+                                              sweep=''))
+        runner = LocalDetectionRunner(Configuration(config_file))
+        events = TraceReader(os.path.join(self.directory, 'trace.txt')).read()
+        periods = events.periods(60)
+
+        segments = runner._split_time(events, 4)
+        self.assertGreater(len(segments), 1)
+        self.assertEqual(segments[0][0], 0)
+        self.assertEqual(segments[-1][1], len(events))
+        for (_, end, _, last), (begin, _, first, _) in zip(segments[:-1], segments[1:]):
+            self.assertEqual(end, begin)
+            self.assertIn(end - 1, events.idle.tolist())
+            self.assertEqual(last + 1, first)
+            self.assertGreaterEqual(periods[begin] - periods[end - 1], 2)
+
+    def test_sweep(self) -> None:
+        """Each parameter set of a sweep detects the same groups of a separate run."""
+        sweep = ("[sweep]\nfriend_threshold = 2, 4\ninactive_threshold = 1, 3\n"
+                 "scan_interval = 60, 90\n")
+        config_file = os.path.join(self.directory, 'sweep.ini')
+        with open(config_file, 'w') as output:
+            output.write(CONFIGURATION.format(directory=self.directory, workers=1,
+                                              split='devices', sweep=sweep))
+        config = Configuration(config_file)
+        configs = config.sweep()
+        self.assertEqual(len(configs), 8)
+        self.assertEqual(configs[-1].output_dir,
+                         os.path.join(self.directory, 'friend4-inactive3-scan90'))
+
+        results = LocalDetectionRunner(config).run_sweep(configs)
+        for sweep_config, result in zip(configs, results):
+            self.assertTrue(os.path.isdir(sweep_config.output_dir))
+            expected = LocalDetectionRunner(sweep_config).run()
+            self.assertDictEqual(summary(result), summary(expected))
+
+    def test_sparse_identifiers(self) -> None:
+        """Sparse node identifiers are translated back in the detected groups."""
+        expected = self.run_detection(1, 'devices')
+        trace_file = os.path.join(self.directory, 'trace.txt')
+        with open(trace_file) as input:
+            lines = [line.split() for line in input]
+        with open(trace_file, 'w') as output:
+            for time, _, node1, node2, state in lines:
+                output.write(f"{time} CONN {SPARSE[int(node1)]} {SPARSE[int(node2)]} {state}\n")
+        sparse = {SPARSE[uid]: [(sorted(SPARSE[member] for member in members), started, ended)
+                                for members, started, ended in groups]
+                  for uid, groups in expected.items()}
+
+        for workers, split in ((1, 'devices'), (3, 'devices'), (3, 'time')):
+            config_file = os.path.join(self.directory, f'sparse{workers}{split}.ini')
+            with open(config_file, 'w') as output:
+                output.write(CONFIGURATION.format(directory=self.directory, workers=workers,
+                                                  split=split, sweep='').replace(
+                    'nrof_nodes = 10', 'nrof_nodes = 0'))
+            self.assertDictEqual(summary(LocalDetectionRunner(Configuration(config_file)).run()),
+                                 sparse)
+
+    def test_resume(self) -> None:
+        """A run resumed from a checkpoint detects the same groups of an uninterrupted run."""
+        expected = self.run_detection(1, 'devices')
+        checkpoint_file = os.path.join(self.directory, 'step1.checkpoint')
+        save = Checkpoint.save
+        for engine in ('device', 'vectorized'):
+            options = f"checkpoint_periods = 5\nengine = {engine}\n"
+            config_file = os.path.join(self.directory, f'checkpoint-{engine}.ini')
+            with open(config_file, 'w') as output:
+                output.write(CONFIGURATION.format(directory=self.directory, workers=1,
+                                                  split='devices', sweep=options))
+            config = Configuration(config_file)
+
+            saved = []
+
+            def interrupt(checkpoint, period, *args):
+                save(checkpoint, period, *args)
+                saved.append(period)
+                if len(saved) == 4:
+                    raise KeyboardInterrupt()
+
+            with patch.object(Checkpoint, 'save', interrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    LocalDetectionRunner(config).run()
+            self.assertTrue(os.path.exists(checkpoint_file))
+
+            config.friend_threshold += 1
+            with self.assertRaises(RuntimeError):
+                LocalDetectionRunner(config).run(resume=True)
+            config.friend_threshold -= 1
+
+            # A trace with other content, but the same size, events and times, is not resumed
+            trace_file = os.path.join(self.directory, 'trace.txt')
+            with open(trace_file) as input:
+                content = input.read()
+            lines = content.splitlines(keepends=True)
+            middle = len(lines) // 2
+            time, _, first, second, state = lines[middle].split()
+            other = next(str(node) for node in range(10) if str(node) not in (first, second))
+            lines[middle] = f"{time} CONN {first} {other} {state}\n"
+            with open(trace_file, 'w') as output:
+                output.write(''.join(lines))
+            with self.assertRaises(RuntimeError):
+                LocalDetectionRunner(config).run(resume=True)
+            with open(trace_file, 'w') as output:
+                output.write(content)
+
+            self.assertDictEqual(summary(LocalDetectionRunner(config).run(resume=True)), expected)
+            self.assertFalse(os.path.exists(checkpoint_file))
+
+    def test_online_merging(self) -> None:
+        """Merging the groups as they are archived gives the merged groups of the two steps."""
+        for engine in ('device', 'vectorized'):
+            for workers, split in ((1, 'devices'), (3, 'devices'), (3, 'time')):
+                options = f"engine = {engine}\n"
+                config_file = os.path.join(self.directory, f'online-{engine}{workers}{split}.ini')
+                with open(config_file, 'w') as output:
+                    output.write(CONFIGURATION.format(directory=self.directory, workers=workers,
+                                                      split=split, sweep=options).replace(
+                        'enable_filtering = false', 'enable_filtering = true').replace(
+                        'size_threshold = 3\nworkers', 'size_threshold = 4\nworkers'))
+                config = Configuration(config_file)
+                merging = GroupMergingRunner(config)
+                expected = merged_summary(merging.run(LocalDetectionRunner(config).run()))
+                self.assertTrue(any(expected.values()))
+                merged = merging.format_output(LocalDetectionRunner(config).run_online())
+                self.assertDictEqual(merged_summary(merged), expected)
+
+    def test_online_resume(self) -> None:
+        """The merged groups are stored in the checkpoints of online runs."""
+        config_file = os.path.join(self.directory, 'online.ini')
+        with open(config_file, 'w') as output:
+            output.write(CONFIGURATION.format(directory=self.directory, workers=1,
+                                              split='devices', sweep='checkpoint_periods = 5\n'))
+        config = Configuration(config_file)
+        expected = merged_summary(LocalDetectionRunner(config).run_online())
+        save = Checkpoint.save
+        saved = []
+
+        def interrupt(checkpoint, period, *args):
+            save(checkpoint, period, *args)
+            saved.append(period)
+            if len(saved) == 4:
+                raise KeyboardInterrupt()
+
+        with patch.object(Checkpoint, 'save', interrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                LocalDetectionRunner(config).run_online()
+        with self.assertRaises(RuntimeError):
+            LocalDetectionRunner(config).run(resume=True)
+        self.assertDictEqual(
+            merged_summary(LocalDetectionRunner(config).run_online(resume=True)), expected)
@@ -0,0 +1,49 @@
+"""
+Unit tests of MemberSet class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+import copy
+import pickle
+from random import Random
+from unittest import TestCase
+from mgb.shared import MemberSet
+
+
+class MemberSetTests(TestCase):
+    """MemberSet unit tests."""
+
+    def test_similarity(self) -> None:
+        """The similarity is the same of the Python sets intersection over union."""
+        rng = Random(5)
+        for _ in range(200):
+            first = set(rng.sample(range(60), rng.randint(0, 10)))
+            second = set(rng.sample(range(60), rng.randint(0, 10)))
+            expected = len(first & second) / len(first | second) if first | second else 0.0
+            self.assertEqual(MemberSet(first).similarity(MemberSet(second)), expected)
+
+    def test_set_operations(self) -> None:
+        """The member set behaves as a set of identifiers, even huge ones."""
+        members = MemberSet([2 ** 60, 3, 9])
+        other = MemberSet([9, 5])
+        self.assertEqual(len(members), 3)
+        self.assertListEqual(list(members), [3, 9, 2 ** 60])
+        self.assertIn(2 ** 60, members)
+        self.assertNotIn(5, members)
+        self.assertNotIn(123456, members)
+        self.assertListEqual(list(members & other), [9])
+        self.assertListEqual(list(members | other), [3, 5, 9, 2 ** 60])
+        self.assertListEqual(list(members - other), [3, 2 ** 60])
+        self.assertEqual(members, {3, 9, 2 ** 60})
+        self.assertFalse(MemberSet())
+
+        copied = copy.deepcopy(members)
+        copied.update(other)
+        copied.add(7)
+        self.assertListEqual(list(copied), [3, 5, 7, 9, 2 ** 60])
+        self.assertEqual(len(members), 3)
+        self.assertEqual(pickle.loads(pickle.dumps(copied)), copied)
@@ -0,0 +1,82 @@
+"""
+Unit tests of MergedGroupIndex class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from random import Random
+from unittest import TestCase
+from mgb.group_merging import GroupEncounter, MergedGroup, MergedGroupIndex
+from mgb.neighborhood_inspection import MultiMergedGroup
+from mgb.shared import MemberSet
+
+
+def first_fit(encounters):
+    """Merge the encounters trying every group in order."""
+    merged_groups = []
+    for encounter in encounters:
+        if not any(merged_group.try_merge(encounter) for merged_group in merged_groups):
+            merged_groups.append(MergedGroup(encounter))
+    return merged_groups
+
+
+def random_encounters(seed: int, count: int):
+    """Generate encounters of a device (node 0) with groups of overlapping members."""
+    rng = Random(seed)
+    bases = [set(rng.sample(range(1, 40), rng.randint(2, 12))) for _ in range(8)]
+    encounters = []
+    for index in range(count):
+        members = set(rng.choice(bases))
+        members.difference_update(rng.sample(sorted(members), rng.randint(0, len(members) // 2)))
+        members.update(rng.sample(range(1, 40), rng.randint(0, 4)))
+        members.add(0)
+        encounters.append(GroupEncounter(MemberSet(members), index * 10, index * 10 + 5))
+    return encounters
+
+
+class MergedGroupIndexTests(TestCase):
+    """MergedGroupIndex unit tests."""
+
+    def test_same_groups_of_first_fit(self) -> None:
+        """The index merges each encounter in the same group of the first-fit search."""
+        for seed in range(20):
+            expected = first_fit(random_encounters(seed, 300))
+            index = MergedGroupIndex()
+            for encounter in random_encounters(seed, 300):
+                index.merge(encounter)
+            self.assertEqual(len(index), len(expected))
+            for group, reference in zip(index.groups, expected):
+                self.assertEqual(group.members, reference.members)
+                self.assertListEqual([(p.begin, p.end) for p in group.periods],
+                                     [(p.begin, p.end) for p in reference.periods])
+
+    def test_size_limits(self) -> None:
+        """Groups with similarity of exactly 0.5 are merged, and lower ones are not."""
+        index = MergedGroupIndex()
+        first = index.merge(GroupEncounter(MemberSet({0, 1}), 0, 1))
+        self.assertIs(index.merge(GroupEncounter(MemberSet({0, 1, 2, 3}), 1, 2)), first)
+        other = index.merge(GroupEncounter(MemberSet({0, 5, 6, 7, 8, 9, 10, 11, 12}), 2, 3))
+        self.assertIsNot(other, first)
+        self.assertEqual(len(index), 2)
+
+    def test_repeated_encounters(self) -> None:
+        """Skipping repeated encounters gives the same groups of the first-fit search."""
+        for seed in range(10):
+            rng = Random(seed)
+            groups = [MergedGroup(encounter) for encounter in random_encounters(seed, 40)]
+            sequence = [rng.choice(groups) for _ in range(300)]
+            expected = []
+            for group in sequence:
+                if not any(multi_merged_group.try_merge(group) for multi_merged_group in expected):
+                    expected.append(MultiMergedGroup(group))
+            index = MergedGroupIndex(MultiMergedGroup)
+            for group in sequence:
+                index.merge(group, key=group)
+            self.assertEqual(len(index), len(expected))
+            for group, reference in zip(index.groups, expected):
+                self.assertEqual(group.members, reference.members)
+                self.assertListEqual([(p.begin, p.end) for p in group.periods],
+                                     [(p.begin, p.end) for p in reference.periods])
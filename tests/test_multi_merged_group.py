@@ -0,0 +1,115 @@
+"""
+Unit tests of MultiMergedGroup class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from unittest import TestCase
+from random import Random
+from unittest.mock import MagicMock, patch
+from mgb.group_merging import GroupEncounter, MergedGroup
+from mgb.neighborhood_inspection import GroupCatalog, MultiMergedGroup, \
+    NeighborhoodInspectionRunner
+from mgb.shared import MemberSet
+
+
+def merged_group(members, *periods):
+    """Build a merged group with the given encounters."""
+    group = MergedGroup(GroupEncounter(MemberSet(members), *periods[0]))
+    for period in periods[1:]:
+        group.try_merge(GroupEncounter(MemberSet(members), *period))
+    return group
+
+
+def snapshot(groups):
+    """Convert merged groups into comparable values."""
+    return [(sorted(group.members), [(p.begin, p.end) for p in group.periods])
+            for group in groups]
+
+
+def snapshot_all(groups_by_device):
+    """Convert the groups of each device into comparable values."""
+    return {uid: snapshot(groups) for uid, groups in groups_by_device.items()}
+
+
+class MultiMergedGroupTests(TestCase):
+    """MultiMergedGroup class unit tests."""
+
+    def test_merge(self):
+        """The periods of a similar group are combined, and the merged groups are not changed."""
+        first = merged_group({0, 1, 2}, (0, 10), (50, 60))
+        second = merged_group({0, 1, 2, 3}, (5, 20), (100, 110))
+        third = merged_group({0, 1, 2, 3}, (15, 55))
+        other = merged_group({7, 8, 9}, (0, 10))
+        before = snapshot([first, second, third, other])
+
+        multi_merged_group = MultiMergedGroup(first)
+        self.assertTrue(multi_merged_group.try_merge(second))
+        self.assertTrue(multi_merged_group.try_merge(third))
+        self.assertFalse(multi_merged_group.try_merge(other))
+        self.assertEqual(sorted(multi_merged_group.members), [0, 1, 2, 3])
+        self.assertListEqual([(p.begin, p.end) for p in multi_merged_group.periods],
+                             [(0, 60), (100, 110)])
+        self.assertListEqual(snapshot([first, second, third, other]), before)
+
+    def test_catalog(self):
+        """Groups with the same members and periods are the same catalog entry."""
+        catalog = GroupCatalog()
+        first = catalog.add(merged_group({0, 1, 2}, (0, 10), (50, 60)))
+        self.assertIsInstance(first, MultiMergedGroup)
+        self.assertIs(catalog.add(merged_group({2, 1, 0}, (0, 10), (50, 60))), first)
+        self.assertIs(catalog.add(MultiMergedGroup(merged_group({0, 1, 2}, (50, 60), (0, 10)))),
+                      first)
+        self.assertIsNot(catalog.add(merged_group({0, 1, 2}, (0, 10))), first)
+        self.assertIsNot(catalog.add(merged_group({0, 1, 3}, (0, 10), (50, 60))), first)
+        self.assertEqual(len(catalog), 3)
+
+    def test_shared_input(self):
+        """The step input is shared by all devices, and is not changed."""
+        config = MagicMock(step3_enable_filtering=False, step3_enable_output=False,
+                           step3_rounds=1)
+        input = {
+            0: [merged_group({0, 1, 2}, (0, 10), (40, 50))],
+            1: [merged_group({0, 1, 2}, (5, 30)), merged_group({1, 3, 4}, (100, 120))],
+            2: [merged_group({0, 1, 2}, (25, 45))],
+            3: [], 4: [],
+        }
+        before = {uid: snapshot(groups) for uid, groups in input.items()}
+        result = NeighborhoodInspectionRunner(config).run(input)
+        self.assertDictEqual({uid: snapshot(groups) for uid, groups in input.items()}, before)
+        for uid in (0, 2):
+            self.assertListEqual(snapshot(result[uid]),
+                                 [([0, 1, 2], [(0, 50)]), ([1, 3, 4], [(100, 120)])])
+
+    def test_rounds(self):
+        """The rounds skip the devices with unchanged neighborhoods, and stop when nothing changes."""
+        rng = Random(5)
+        input = {uid: [] for uid in range(30)}
+        for _ in range(40):
+            members = set(rng.sample(range(30), rng.randint(3, 6)))
+            begin = rng.randint(0, 1000)
+            group = merged_group(members, (begin, begin + 30), (begin + 500, begin + 540))
+            input[min(members)].append(group)
+        config = MagicMock(step3_enable_filtering=True, step3_enable_output=False,
+                           step3_size_threshold=3, step3_encounters_threshold=2, step3_rounds=0)
+        runner = NeighborhoodInspectionRunner(config)
+        run_round = NeighborhoodInspectionRunner._run_round
+        rounds = []
+
+        def count_round(self, input, changed, catalog):
+            rounds.append(changed)
+            return run_round(self, input, changed, catalog)
+
+        with patch.object(NeighborhoodInspectionRunner, '_run_round', count_round):
+            result = snapshot_all(runner.run(input))
+        self.assertGreater(len(rounds), 2)
+        self.assertLess(len(rounds), 10)
+
+        # Processing every device in every round gives the same groups
+        config.step3_rounds = len(rounds) + 2
+        with patch.object(NeighborhoodInspectionRunner, '_run_round',
+                          lambda self, input, changed, catalog: run_round(self, input, None, catalog)):
+            self.assertDictEqual(snapshot_all(runner.run(input)), result)
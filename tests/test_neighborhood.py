@@ -0,0 +1,88 @@
+"""
+Unit tests of Neighborhood class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from random import Random
+from types import SimpleNamespace
+from unittest import TestCase
+from mgb.local_detection import Device, Neighborhood, ScanClock
+
+
+class NeighborhoodTests(TestCase):
+    """Neighborhood unit tests."""
+
+    def test_inactive_members(self) -> None:
+        """Members become inactive when the away streak reaches the threshold."""
+        clock = ScanClock()
+        neighborhood = Neighborhood(3, 5, clock)
+        for uid in range(4):
+            neighborhood.add(uid, 0)
+        self.assertTrue(neighborhood.is_active)
+
+        neighborhood[0].increment_away()
+        neighborhood[1].start_streak(False)
+        self.assertEqual(neighborhood.next_crossing, 2)
+        clock.advance(2)
+        self.assertListEqual(neighborhood.update_inactive(), [0])
+        self.assertTrue(neighborhood.is_active)
+        clock.advance()
+        self.assertFalse(neighborhood.is_active)
+        self.assertIsNone(neighborhood.next_crossing)
+
+        neighborhood[1].increment_close()
+        self.assertTrue(neighborhood.is_active)
+        neighborhood.remove(2)
+        neighborhood.remove(3)
+        self.assertFalse(neighborhood.is_active)
+
+    def test_inactive_at_once(self) -> None:
+        """Members that become inactive in the period they leave are reported too."""
+        clock = ScanClock()
+        neighborhood = Neighborhood(1, 5, clock)
+        neighborhood.add(0, 0)
+        neighborhood.add(1, 0)
+        clock.advance()
+        neighborhood[0].increment_away()
+        self.assertFalse(neighborhood[0].is_active)
+        self.assertListEqual(neighborhood.update_inactive(), [0])
+        self.assertListEqual(neighborhood.update_inactive(), [])
+
+        # A stranger that leaves is removed at once, so it is a stranger again when it returns
+        device = Device(0, SimpleNamespace(friend_threshold=1, inactive_threshold=1))
+        device.add_connection(1)
+        device.add_connection(2)
+        device.run_local_detection(60)
+        device.remove_connection(1)
+        device.run_local_detection(120)
+        self.assertListEqual(sorted(device.strangers.entities), [])
+        device.add_connection(1)
+        device.run_local_detection(180)
+        self.assertListEqual(sorted(device.strangers.entities), [1])
+        self.assertListEqual(sorted(device.friends.entities), [2])
+
+    def test_same_as_members(self) -> None:
+        """The incremental check agrees with the state of each member."""
+        rng = Random(5)
+        clock = ScanClock()
+        neighborhood = Neighborhood(4, 5, clock)
+        for _ in range(500):
+            uid = rng.randrange(12)
+            action = rng.random()
+            if action < 0.2:
+                neighborhood.add(uid, clock.period)
+            elif action < 0.3:
+                neighborhood.remove(uid)
+            elif uid in neighborhood and action < 0.6:
+                neighborhood[uid].increment_close()
+            elif uid in neighborhood:
+                neighborhood[uid].increment_away()
+            clock.advance(rng.randrange(3))
+
+            inactive = [m for m in neighborhood.entities.values() if not m.is_active]
+            expected = not neighborhood or len(inactive) / len(neighborhood) < 0.5
+            self.assertEqual(neighborhood.is_active, expected)
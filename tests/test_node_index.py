@@ -0,0 +1,38 @@
+"""
+Unit tests of NodeIndex class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from unittest import TestCase
+import numpy as np
+from mgb.shared import NodeIndex
+
+
+class NodeIndexTests(TestCase):
+    """NodeIndex unit tests."""
+
+    def test_sparse_identifiers(self) -> None:
+        """Sparse identifiers are mapped to dense indexes in the identifiers order."""
+        index = NodeIndex([2 ** 40, 7, 19, 7, -3])
+        self.assertEqual(len(index), 4)
+        self.assertFalse(index.is_identity)
+        self.assertListEqual(index.ids.tolist(), [-3, 7, 19, 2 ** 40])
+        self.assertListEqual(index.index_of(np.array([19, 2 ** 40, -3])).tolist(), [2, 3, 0])
+        self.assertListEqual(index.id_of([3, 1]).tolist(), [2 ** 40, 7])
+        with self.assertRaises(KeyError):
+            index.index_of([8])
+        with self.assertRaises(KeyError):
+            index.index_of([2 ** 41])
+
+    def test_dense_identifiers(self) -> None:
+        """Dense identifiers are their own indexes."""
+        index = NodeIndex(np.arange(5))
+        self.assertTrue(index.is_identity)
+        self.assertListEqual(index.index_of([4, 0, 2]).tolist(), [4, 0, 2])
+        with self.assertRaises(KeyError):
+            index.index_of([5])
+        self.assertTrue(NodeIndex([]).is_identity)
@@ -0,0 +1,225 @@
+"""
+Unit tests of RouteService and RouteServer classes.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+import json
+import os
+import pickle
+import socket
+import threading
+from os import path
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+from urllib.request import Request, urlopen
+import networkx as nx
+from mgb.graph_creation import GraphCreationRunner
+from mgb.route_tables import RouteServer, RouteService, RouteTableRunner
+from mgb.route_tables import route_service
+from mgb.shared import Configuration
+from helpers import random_groups
+
+
+class RouteServiceTests(TestCase):
+    """RouteService and RouteServer unit tests."""
+
+    def setUp(self) -> None:
+        rng = Random(9)
+        self.input = {uid: random_groups(rng, rng.randint(10, 25)) for uid in (2, 6, 8)}
+        self.temporary_dir = TemporaryDirectory()
+        self.directory = self.temporary_dir.name
+        self.config = Configuration(path.join(path.dirname(__file__), '..',
+                                              'default_config.ini'))
+        self.config.output_dir = self.directory
+        self.config.step4_simulation_time = 1000
+        self.config.step4_message_ttl = 50
+        GraphCreationRunner(self.config).run(self.input)
+        self.lengths = {}
+        for uid in self.input:
+            with open(path.join(self.directory, f"step4-node{uid}.pickle"), 'rb') as graph_file:
+                graph = pickle.load(graph_file)
+            self.lengths[uid] = dict(nx.all_pairs_dijkstra_path_length(graph))
+
+    def tearDown(self) -> None:
+        self.temporary_dir.cleanup()
+
+    def check_answer(self, answer, device, source, target) -> None:
+        """Check if an answer has a shortest path."""
+        length = self.lengths[device][source].get(target)
+        if length is None:
+            self.assertListEqual(answer['path'], [])
+            self.assertIsNone(answer['distance'])
+            return
+        self.assertEqual(answer['path'][0], source)
+        self.assertEqual(answer['path'][-1], target)
+        self.assertAlmostEqual(answer['distance'], length, places=5)
+
+    def test_queries(self) -> None:
+        """The queries are answered in batch from each output format, and memoized."""
+        queries = [{'device': device, 'source': source, 'target': target}
+                   for device, groups in self.input.items()
+                   for source in range(0, len(groups), 3) for target in range(len(groups))]
+        distances = {}
+        for output_format, routes in (('pickle', False), ('csr', False), ('csr', True)):
+            self.config.step4_output_format = output_format
+            GraphCreationRunner(self.config).run(self.input)
+            if routes:
+                self.config.step5_sources = 'own'
+                RouteTableRunner(self.config).run(self.input.keys())
+            service = RouteService(self.config)
+
+            with patch.object(route_service, 'shortest_paths',
+                              wraps=route_service.shortest_paths) as shortest_paths:
+                answers = service.query_batch(queries)
+                # One run for each device, over the sources not in the route tables
+                self.assertEqual(shortest_paths.call_count, len(self.input))
+                for query, answer in zip(queries, answers):
+                    self.check_answer(answer, **query)
+                distances[output_format, routes] = [answer['distance'] for answer in answers]
+
+                answer = service.query(**queries[5])
+                self.assertIs(answer, answers[5])
+                self.assertEqual(shortest_paths.call_count, len(self.input))
+                # The paths from the groups of the device itself are in the route tables
+                device, source = queries[5]['device'], queries[5]['source'] + 1
+                stored = routes and device in self.input[device][source].members
+                service.query(device, source, 0)
+                self.assertEqual(shortest_paths.call_count, len(self.input) + (not stored))
+
+            errors = service.query_batch([{'device': 4, 'source': 0, 'target': 0},
+                                          {'device': 2, 'source': 0, 'target': 100},
+                                          {'device': 2, 'source': 'x'}])
+            self.assertTrue(all('error' in answer for answer in errors))
+        # The stored routes have the same precision of the routes computed by the service
+        self.assertListEqual(distances['csr', True], distances['csr', False])
+
+    def test_cache(self) -> None:
+        """The least recently used graphs are discarded when the cache is full."""
+        service = RouteService(self.config, cache_size=1, memo_size=2)
+        service.query(2, 0, 1)
+        service.query(6, 0, 1)
+        self.assertEqual(service.cached_graphs, 1)
+        self.check_answer(service.query(2, 1, 3), 2, 1, 3)
+        self.check_answer(service.query(2, 0, 1), 2, 0, 1)
+        unbounded = RouteService(self.config)
+        for device in self.input:
+            unbounded.query(device, 0, 1)
+        self.assertEqual(unbounded.cached_graphs, len(self.input))
+        self.assertGreater(unbounded.cached_bytes, service.cached_bytes)
+
+    def test_concurrent_devices(self) -> None:
+        """A graph being loaded does not block the queries of the other devices."""
+        service = RouteService(self.config)
+        service.query(6, 0, 1)
+        loading, release = threading.Event(), threading.Event()
+        read_graph = route_service.read_graph
+
+        def slow_read_graph(config, device, store=None):
+            if device == 2:
+                loading.set()
+                release.wait(10)
+            return read_graph(config, device, store)
+
+        with patch.object(route_service, 'read_graph', side_effect=slow_read_graph):
+            slow = threading.Thread(target=service.query, args=(2, 0, 1))
+            slow.start()
+            self.assertTrue(loading.wait(10))
+            answers = []
+            fast = threading.Thread(target=lambda: answers.extend(
+                [service.query(6, 0, 1), service.query(8, 1, 2)]))
+            fast.start()
+            fast.join(5)
+            self.assertFalse(fast.is_alive())
+            release.set()
+            slow.join()
+            self.check_answer(answers[0], 6, 0, 1)
+            self.check_answer(answers[1], 8, 1, 2)
+        self.check_answer(service.query(2, 0, 1), 2, 0, 1)
+        self.assertEqual(service.cached_graphs, len(self.input))
+
+    def test_invalid_devices(self) -> None:
+        """Unknown devices and damaged graphs are answered with errors."""
+        service = RouteService(self.config)
+        answers = service.query_batch([{'device': device, 'source': 0, 'target': 1}
+                                       for device in range(1000, 1100)])
+        self.assertTrue(all('Unknown device' in answer['error'] for answer in answers))
+        self.assertDictEqual(service._device_locks, {})
+
+        with open(path.join(self.directory, 'step4-node6.pickle'), 'wb') as output:
+            output.write(b'damaged')
+        answers = service.query_batch([{'device': 6, 'source': 0, 'target': 1},
+                                       {'device': 2, 'source': 0, 'target': 1}])
+        self.assertIn('error', answers[0])
+        self.check_answer(answers[1], 2, 0, 1)
+
+    def serve(self, server: RouteServer) -> None:
+        """Serve the requests in a thread until the test ends."""
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            thread.join()
+            server.close()
+        self.addCleanup(stop)
+
+    def test_unix_socket(self) -> None:
+        """The Unix socket answers a JSON document per line."""
+        socket_path = path.join(self.directory, 'routes.sock')
+        server = RouteServer(RouteService(self.config), socket_path)
+        self.serve(server)
+        self.assertEqual(server.address, f"unix:{socket_path}")
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            stream = client.makefile('rwb')
+            stream.write(b'{"device": 6, "source": 2, "target": 5}\n'
+                         b'[{"device": 8, "source": 1, "target": 0}, '
+                         b'{"device": 8, "source": 0, "target": 3}]\nnot json\n')
+            stream.flush()
+            self.check_answer(json.loads(stream.readline()), 6, 2, 5)
+            answers = json.loads(stream.readline())
+            self.check_answer(answers[0], 8, 1, 0)
+            self.check_answer(answers[1], 8, 0, 3)
+            self.assertIn('error', json.loads(stream.readline()))
+
+    def test_socket_path(self) -> None:
+        """Only socket files are replaced or removed at the socket path."""
+        socket_path = path.join(self.directory, 'routes.sock')
+        with open(socket_path, 'w') as output:
+            output.write('data')
+        with self.assertRaises(RuntimeError):
+            RouteServer(RouteService(self.config), socket_path)
+        with open(socket_path) as input:
+            self.assertEqual(input.read(), 'data')
+
+        os.remove(socket_path)
+        server = RouteServer(RouteService(self.config), socket_path)
+        server.close()
+        self.assertFalse(path.exists(socket_path))
+        # A stale socket is replaced, but a file created after it is kept on close
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(socket_path)
+        server = RouteServer(RouteService(self.config), socket_path)
+        os.remove(socket_path)
+        with open(socket_path, 'w') as output:
+            output.write('data')
+        server.close()
+        self.assertTrue(path.exists(socket_path))
+
+    def test_http(self) -> None:
+        """The HTTP port answers GET and POST requests."""
+        server = RouteServer(RouteService(self.config), port=0)
+        self.serve(server)
+        with urlopen(f"{server.address}?device=2&source=4&target=1") as response:
+            self.check_answer(json.load(response), 2, 4, 1)
+        body = json.dumps([{'device': 6, 'source': 3, 'target': 0}]).encode('utf8')
+        request = Request(server.address, data=body, headers={'Content-Type': 'application/json'})
+        with urlopen(request) as response:
+            self.check_answer(json.load(response)[0], 6, 3, 0)
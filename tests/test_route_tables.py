@@ -0,0 +1,118 @@
+"""
+Unit tests of the route tables step.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+import pickle
+from os import path
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+import networkx as nx
+import numpy as np
+from mgb.graph_creation import GraphCreationRunner, to_csr
+from mgb.route_tables import RouteTableRunner, RouteTables, route_table_runner, \
+    shortest_paths
+from mgb.shared import Configuration
+from helpers import random_groups
+
+
+class RouteTablesTests(TestCase):
+    """Route tables unit tests."""
+
+    def test_shortest_paths(self):
+        """The distances are the ones of Dijkstra's algorithm, over graphs with many components."""
+        rng = Random(6)
+        graph = nx.Graph()
+        graph.add_nodes_from(range(40))
+        for _ in range(70):
+            a, b = rng.sample(range(35), 2)
+            graph.add_edge(a, b, weight=rng.choice([0.0, rng.random(), rng.random() * 10]))
+        edges = np.array(list(graph.edges(data='weight')), dtype=np.float64)
+        indptr, indices, weights = to_csr(40, edges[:, 0].astype(np.int64),
+                                          edges[:, 1].astype(np.int64), edges[:, 2])
+        sources = np.array([3, 0, 39, 17, 3])
+        distances, predecessors = shortest_paths(indptr, indices, weights, sources)
+
+        for row, source in enumerate(sources.tolist()):
+            expected = nx.single_source_dijkstra_path_length(graph, source)
+            for target in range(40):
+                self.assertAlmostEqual(distances[row, target], expected.get(target, np.inf))
+                predecessor = predecessors[row, target]
+                if target == source or target not in expected:
+                    self.assertEqual(predecessor, -1)
+                else:
+                    self.assertAlmostEqual(expected[predecessor] +
+                                           graph[predecessor][target]['weight'],
+                                           expected[target])
+
+    def test_runner(self):
+        """The route tables give the shortest paths of the graphs of both output formats."""
+        rng = Random(8)
+        input = {uid: random_groups(rng, rng.randint(0, 25)) for uid in (4, 1, 9)}
+
+        with TemporaryDirectory() as output_dir:
+            tables = {}
+            for output_format, sources, workers in (('pickle', 'all', 1), ('csr', 'all', 2),
+                                                    ('csr', 'own', 1)):
+                # The worker processes receive the configuration, so it is not a mock
+                config = Configuration(path.join(path.dirname(__file__), '..',
+                                                 'default_config.ini'))
+                config.output_dir = output_dir
+                config.step4_output_prefix = f"{output_format}-"
+                config.step4_simulation_time = 1000
+                config.step4_message_ttl = 50
+                config.step4_output_format = output_format
+                config.step5_output_prefix = f"{output_format}-{sources}-"
+                config.step5_sources = sources
+                config.step5_workers = workers
+                GraphCreationRunner(config).run(input)
+                RouteTableRunner(config).run(input.keys())
+                if output_format == 'csr':
+                    # A worker process opens the store once, for all its devices
+                    route_table_runner._open_worker_store(config)
+                    with patch.object(route_table_runner, 'open_store') as open_store:
+                        for uid in input:
+                            route_table_runner._route_worker_device(config, uid)
+                        open_store.assert_not_called()
+                    route_table_runner._worker_store = None
+                tables[output_format, sources] = RouteTables(
+                    path.join(output_dir, f"{output_format}-{sources}-routes.mgbroute"))
+
+            for uid, groups in input.items():
+                with open(path.join(output_dir, f"pickle-node{uid}.pickle"), 'rb') as graph_file:
+                    graph = pickle.load(graph_file)
+                routes = tables['pickle', 'all'][uid]
+                self.assertListEqual(routes.sources.tolist(), list(range(len(groups))))
+                own = [group for group in range(len(groups)) if uid in groups[group].members]
+                self.assertListEqual(tables['csr', 'own'][uid].sources.tolist(), own)
+
+                lengths = dict(nx.all_pairs_dijkstra_path_length(graph))
+                for source in range(len(groups)):
+                    for target in range(len(groups)):
+                        path_found = routes.path(source, target)
+                        if target not in lengths[source]:
+                            self.assertListEqual(path_found, [])
+                            self.assertEqual(routes.distance(source, target), np.inf)
+                            continue
+                        self.assertEqual(path_found[0], source)
+                        self.assertEqual(path_found[-1], target)
+                        self.assertAlmostEqual(nx.path_weight(graph, path_found, 'weight'),
+                                               lengths[source][target])
+                        self.assertAlmostEqual(routes.distance(source, target),
+                                               lengths[source][target], places=5)
+                        self.assertListEqual(tables['csr', 'all'].path(uid, source, target),
+                                             path_found)
+                        if source in own:
+                            self.assertListEqual(tables['csr', 'own'][uid].path(source, target),
+                                                 path_found)
+                others = sorted(set(range(len(groups))) - set(own))
+                if others:
+                    with self.assertRaises(KeyError):
+                        tables['csr', 'own'][uid].path(others[0], 0)
+            del tables, routes
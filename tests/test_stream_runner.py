@@ -0,0 +1,131 @@
+"""
+Unit tests of StreamRunner and EventSource classes.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from unittest import TestCase
+from mgb.local_detection import Connection, DevicePool, EventSource, JsonLinesSink, \
+    StreamRunner, TraceReader
+from helpers import write_trace
+
+
+class StreamRunnerTests(TestCase):
+    """StreamRunner unit tests."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.trace_file = os.path.join(self.directory, 'trace.txt')
+        write_trace(self.trace_file, 8)
+        self.config = SimpleNamespace(nrof_nodes=10, friend_threshold=3, inactive_threshold=2,
+                                      scan_interval=60)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def expected_groups(self):
+        """Run the batch local detection over the trace file."""
+        events = TraceReader(self.trace_file).read()
+        periods, offsets = events.period_slices(60)
+        pool = DevicePool(10, self.config)
+        for period in range(1, periods[-1] + 1):
+            if period in periods.tolist():
+                index = periods.tolist().index(period)
+                begin, end = offsets[index], offsets[index + 1]
+                pool.apply(events.node1[begin:end], events.node2[begin:end],
+                           events.up[begin:end])
+            pool.run_local_detection(period * 60)
+        return sorted((uid, sorted(n.members), n.started, n.ended)
+                      for uid, groups in pool.archived.items() for n in groups)
+
+    def stream_groups(self, source: EventSource):
+        output = io.StringIO()
+        StreamRunner(self.config, JsonLinesSink(output)).run(source)
+        groups = [json.loads(line) for line in output.getvalue().splitlines()]
+        return sorted((g['node'], sorted(g['members']), g['started'], g['ended'])
+                      for g in groups)
+
+    def test_same_groups(self) -> None:
+        """The streaming detection emits the groups found by the batch detection."""
+        expected = self.expected_groups()
+        self.assertTrue(expected)
+        self.assertListEqual(self.stream_groups(EventSource(self.trace_file)), expected)
+
+    def test_follow(self) -> None:
+        """Lines appended to a followed file are processed, even when written in parts."""
+        expected = self.expected_groups()
+        with open(self.trace_file) as input:
+            content = input.read()
+        open(self.trace_file, 'w').close()
+
+        def append() -> None:
+            with open(self.trace_file, 'a') as output:
+                for begin in range(0, len(content), 1000):
+                    output.write(content[begin:begin + 1000])
+                    output.flush()
+                    time.sleep(0.01)
+
+        writer = threading.Thread(target=append)
+        writer.start()
+        source = EventSource(self.trace_file, follow=True, poll_interval=0.01, idle_timeout=0.5)
+        result = self.stream_groups(source)
+        writer.join()
+        self.assertListEqual(result, expected)
+
+    def test_idle_ticks(self) -> None:
+        """The periods advance on the idle ticks of the source, without later events."""
+        config = SimpleNamespace(nrof_nodes=4, friend_threshold=1, inactive_threshold=1,
+                                 scan_interval=0.05)
+        output = io.StringIO()
+        sink = JsonLinesSink(output)
+        archived_before_end = []
+
+        def source():
+            for uid in (1, 2, 3):
+                yield Connection(f"0.01 CONN 0 {uid} up")
+            time.sleep(0.2)
+            yield None
+            for uid in (1, 2, 3):
+                yield Connection(f"0.5 CONN 0 {uid} down")
+            time.sleep(0.2)
+            yield None
+            archived_before_end.append(sink.count)
+
+        StreamRunner(config, sink, delay=0).run(source())
+        self.assertListEqual(archived_before_end, [1])
+        self.assertEqual(sink.count, 1)
+
+    def test_socket_ticks(self) -> None:
+        """A socket source yields idle ticks while there is no data."""
+        socket_path = os.path.join(self.directory, 'trace.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen(1)
+
+            def send() -> None:
+                connection, _ = server.accept()
+                with connection:
+                    connection.sendall(b"1 CONN 1 2 up\n2 CONN 1")
+                    time.sleep(0.1)
+                    connection.sendall(b" 3 up\n")
+
+            writer = threading.Thread(target=send)
+            writer.start()
+            items = list(EventSource(f"unix:{socket_path}", poll_interval=0.02))
+            writer.join()
+        connections = [repr(item) for item in items if item is not None]
+        self.assertListEqual(connections, [repr(Connection("1 CONN 1 2 up")),
+                                           repr(Connection("2 CONN 1 3 up"))])
+        self.assertIn(None, items)
@@ -0,0 +1,109 @@
+"""
+Unit tests of TraceCache class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+import numpy as np
+from mgb.local_detection import ConnectionGenerator, TraceCache, TraceReader
+
+TRACE = """0 CONN 1 2 up
+1.00 CONN 28 37 UP
+60 CONN 1 2 down
+60.5 CONN 3 4 up
+250 CONN 28 37 down
+"""
+
+
+def read_connections(trace_file: str):
+    """Read all connections of a trace file with the ConnectionGenerator."""
+    result = []
+    period = 1
+    with ConnectionGenerator(trace_file, 60) as con_gen:
+        while not con_gen.has_finished:
+            for connection in con_gen:
+                result.append((period, repr(connection)))
+            period += 1
+    return result
+
+
+class TraceCacheTests(TestCase):
+    """TraceCache unit tests."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.trace_file = os.path.join(self.directory, 'trace.txt')
+        with open(self.trace_file, 'w') as output:
+            output.write(TRACE)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_build_and_load(self) -> None:
+        """The cached events are the same parsed from the text file."""
+        cache = TraceCache(self.trace_file)
+        self.assertIsNone(cache.load())
+        expected = TraceReader(self.trace_file).read()
+        # The trace is hashed in the same read that parses it
+        with patch.object(TraceCache, '_content_hash') as content_hash:
+            cache.build()
+            content_hash.assert_not_called()
+        self.assertTrue(os.path.exists(self.trace_file + '.mgbcache'))
+
+        events = cache.load(check_content=True)
+        self.assertIsInstance(events.time, np.memmap)
+        # The content hash is recorded in the cache, or computed when there is no cache
+        expected_hash = TraceCache(self.trace_file, os.path.join(self.directory, 'missing'))\
+            .content_hash()
+        with patch.object(TraceCache, '_content_hash') as content_hash:
+            self.assertEqual(cache.content_hash(), expected_hash)
+            content_hash.assert_not_called()
+        for column in ('time', 'node1', 'node2', 'up', 'idle', 'nodes'):
+            self.assertListEqual(getattr(events, column).tolist(),
+                                 getattr(expected, column).tolist())
+
+    def test_trace_changes(self) -> None:
+        """The cache is discarded when the trace content changes."""
+        cache = TraceCache(self.trace_file, os.path.join(self.directory, 'trace.cache'))
+        cache.build()
+
+        # Touching the file keeps the cache valid, since the content hash is the same, and the
+        # new modification time is recorded so the trace is not hashed again
+        stat = os.stat(self.trace_file)
+        os.utime(self.trace_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        with patch.object(TraceCache, '_content_hash', wraps=cache._content_hash) as content_hash:
+            self.assertIsNotNone(cache.load())
+            self.assertIsNotNone(cache.load())
+            self.assertEqual(content_hash.call_count, 1)
+
+        with open(self.trace_file, 'w') as output:
+            output.write(TRACE.replace('28 37', '28 36'))
+        self.assertIsNone(cache.load())
+        self.assertEqual(cache.load_or_build().node2.tolist(), [2, 36, 2, 4, 36])
+        self.assertIsNotNone(cache.load())
+
+    def test_empty_trace(self) -> None:
+        """Empty traces can be cached."""
+        open(self.trace_file, 'w').close()
+        events = TraceCache(self.trace_file).build()
+        self.assertEqual(len(events), 0)
+
+    def test_connection_generator(self) -> None:
+        """The connection generator reads the same connections from the cache."""
+        expected = read_connections(self.trace_file)
+        TraceCache(self.trace_file).build()
+
+        # Same size and modification time, so only the cache can provide the old content
+        stat = os.stat(self.trace_file)
+        with open(self.trace_file, 'w') as output:
+            output.write(TRACE.replace('28 37', '28 36'))
+        os.utime(self.trace_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertListEqual(read_connections(self.trace_file), expected)
@@ -0,0 +1,110 @@
+"""
+Unit tests of TraceReader and TraceEvents classes.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+from mgb.local_detection import ConnectionGenerator, ConnectionType, TraceReader
+
+TRACE = """0 CONN 1 2 up
+1.00 CONN 28 37 UP
+60 CONN 1 2 down
+60.5 CONN 3 4 Up
+59.0 CONN 5 6 up
+250 CONN 28 37 down
+"""
+
+
+class TraceReaderTests(TestCase):
+    """TraceReader and TraceEvents unit tests."""
+
+    def setUp(self) -> None:
+        handle, self.trace_file = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as output:
+            output.write(TRACE)
+
+    def tearDown(self) -> None:
+        os.remove(self.trace_file)
+
+    def test_columns(self) -> None:
+        """Each line is decoded in the columnar arrays."""
+        events = TraceReader(self.trace_file).read()
+        self.assertEqual(len(events), 6)
+        self.assertListEqual(events.time.tolist(), [0, 1, 60, 60.5, 59, 250])
+        self.assertListEqual(events.node1.tolist(), [1, 28, 1, 3, 5, 28])
+        self.assertListEqual(events.node2.tolist(), [2, 37, 2, 4, 6, 37])
+        self.assertListEqual(events.up.tolist(), [True, True, False, True, True, False])
+
+    def test_blocks(self) -> None:
+        """Small blocks produce the same result of a single block."""
+        expected = TraceReader(self.trace_file).read()
+        for block_size in (1, 7, 20, 1000):
+            events = TraceReader(self.trace_file, block_size).read()
+            self.assertListEqual(events.time.tolist(), expected.time.tolist())
+            self.assertListEqual(events.node2.tolist(), expected.node2.tolist())
+            self.assertListEqual(events.up.tolist(), expected.up.tolist())
+
+    def test_period_slices(self) -> None:
+        """Events are split by period as the ConnectionGenerator does."""
+        expected = {}
+        period = 1
+        with ConnectionGenerator(self.trace_file, 60) as con_gen:
+            while not con_gen.has_finished:
+                for connection in con_gen:
+                    expected.setdefault(period, []).append(
+                        (connection.node1, connection.con_type == ConnectionType.UP))
+                period += 1
+
+        events = TraceReader(self.trace_file).read()
+        periods, offsets = events.period_slices(60)
+        self.assertListEqual(periods.tolist(), [1, 2, 5])
+        result = {
+            period: list(zip(events.node1[begin:end].tolist(), events.up[begin:end].tolist()))
+            for period, begin, end in zip(periods.tolist(), offsets, offsets[1:])
+        }
+        self.assertDictEqual(result, expected)
+
+    def test_idle_points(self) -> None:
+        """Idle points are the events after which there are no open connections."""
+        events = TraceReader(self.trace_file).read()
+        self.assertListEqual(events.idle.tolist(), [])
+        closed = TraceReader(self.trace_file).read()[[0, 1, 2, 5, 3]]
+        self.assertListEqual(closed.idle.tolist(), [3])
+
+    def test_large_identifiers(self) -> None:
+        """Node identifiers that are not exact as doubles are decoded exactly."""
+        with open(self.trace_file, 'w') as output:
+            output.write(TRACE + f"300 CONN {2 ** 60} {2 ** 60 + 1} up\n")
+        for block_size in (1, 1000):
+            events = TraceReader(self.trace_file, block_size).read()
+            self.assertListEqual(events.node1.tolist(), [1, 28, 1, 3, 5, 28, 2 ** 60])
+            self.assertListEqual(events.node2.tolist(), [2, 37, 2, 4, 6, 37, 2 ** 60 + 1])
+        self.assertEqual(events.time[-1], 300)
+        with open(self.trace_file, 'w') as output:
+            output.write(TRACE + f"300 CONN {2 ** 64} 1 up\n")
+        with self.assertRaises(ValueError):
+            TraceReader(self.trace_file).read()
+
+    def test_invalid_data(self) -> None:
+        """Lines out of the expected format are rejected."""
+        for line in ("1 CONN 1 2\n", "1 CONN 1 2 sideways\n", "1 CONN 1 x up\n",
+                     "1 CONN 1.5 2 up\n", "hello\n"):
+            with open(self.trace_file, 'w') as output:
+                output.write(TRACE + line)
+            with self.assertRaises(ValueError):
+                TraceReader(self.trace_file).read()
+
+    def test_empty_file(self) -> None:
+        """An empty trace has no events."""
+        open(self.trace_file, 'w').close()
+        events = TraceReader(self.trace_file).read()
+        self.assertEqual(len(events), 0)
+        periods, offsets = events.period_slices(60)
+        self.assertEqual(len(periods), 0)
+        self.assertListEqual(offsets.tolist(), [0])
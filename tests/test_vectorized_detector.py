@@ -0,0 +1,178 @@
+"""
+Unit tests of VectorizedDetector class.
+
+Authors:
+    Michael D. Silva <micdoug.silva@gmail.com>
+Created: Oct 2026
+Modified: Oct 2026
+"""
+
+from random import Random
+from types import SimpleNamespace
+from unittest import TestCase
+import numpy as np
+from mgb.local_detection import Device, DevicePool, VectorizedDetector
+
+
+def random_periods(nrof_nodes: int, nrof_periods: int, seed: int, activity: float = 1.0):
+    """Generate a valid sequence of connection events split by scan period."""
+    rng = Random(seed)
+    connected = set()
+    periods = []
+    for _ in range(nrof_periods):
+        events = []
+        for _ in range(rng.randint(0, 4) if rng.random() < activity else 0):
+            pair = tuple(sorted(rng.sample(range(nrof_nodes), 2)))
+            events.append((pair[0], pair[1], pair not in connected))
+            connected.symmetric_difference_update({pair})
+        periods.append(events)
+    return periods
+
+
+def summary(archived):
+    """Convert archived neighborhoods into comparable values."""
+    return {
+        uid: [(sorted(n.members), n.started, n.ended) for n in neighborhoods]
+        for uid, neighborhoods in archived.items()
+    }
+
+
+class VectorizedDetectorTests(TestCase):
+    """VectorizedDetector unit tests."""
+
+    def check_same_groups(self, dense: bool) -> None:
+        config = SimpleNamespace(friend_threshold=3, inactive_threshold=2)
+        for seed in range(5):
+            pool = DevicePool(12, config)
+            detector = VectorizedDetector(12, config, dense=dense)
+            self.assertEqual(detector.is_dense, dense)
+            for period, events in enumerate(random_periods(12, 400, seed), start=1):
+                columns = [np.array(c) for c in zip(*events)] if events else [[], [], []]
+                pool.apply(*columns)
+                detector.apply(*columns)
+                pool.run_local_detection(period * 60)
+                detector.run_local_detection(period * 60)
+            expected = summary(pool.archived)
+            self.assertTrue(any(expected.values()))
+            self.assertDictEqual(summary(detector.archived), expected)
+
+    def test_dense_layout(self) -> None:
+        """The dense layout detects the same groups of the device objects."""
+        self.check_same_groups(dense=True)
+
+    def test_sparse_layout(self) -> None:
+        """The sparse layout detects the same groups of the device objects."""
+        self.check_same_groups(dense=False)
+
+    def test_last_event_wins(self) -> None:
+        """Only the last event of a pair in a batch is considered."""
+        config = SimpleNamespace(friend_threshold=1, inactive_threshold=1)
+        batches = [
+            ([0, 0, 0, 0, 1], [1, 2, 1, 3, 2], [True, True, False, True, True]),
+            ([0, 0], [1, 1], [True, False]),
+            ([0, 0, 1, 0], [2, 3, 2, 1], [False, False, False, True]),
+        ]
+        for dense in (True, False):
+            pool = DevicePool(4, config)
+            detector = VectorizedDetector(4, config, dense=dense)
+            for period in range(1, 10):
+                if period <= len(batches):
+                    columns = [np.array(c) for c in batches[period - 1]]
+                    pool.apply(*columns)
+                    detector.apply(*columns)
+                pool.run_local_detection(period)
+                detector.run_local_detection(period)
+            expected = summary(pool.archived)
+            self.assertTrue(any(expected.values()))
+            self.assertDictEqual(summary(detector.archived), expected)
+
+    def test_fast_forward(self) -> None:
+        """Fast forwarding periods without events gives the same result of running them."""
+        config = SimpleNamespace(friend_threshold=4, inactive_threshold=3)
+        periods = random_periods(10, 300, 7, activity=0.3)
+
+        def create_engines():
+            return [DevicePool(10, config), VectorizedDetector(10, config, dense=True),
+                    VectorizedDetector(10, config, dense=False)]
+
+        expected, engines = create_engines(), create_engines()
+        previous = 0
+        for period, events in enumerate(periods, start=1):
+            columns = [np.array(c) for c in zip(*events)] if events else [[], [], []]
+            for engine in expected:
+                engine.apply(*columns)
+                engine.run_local_detection(period * 60)
+            if not events and period < len(periods):
+                continue
+            for engine in engines:
+                if period - previous > 1:
+                    engine.fast_forward((previous + 1) * 60, period - previous - 1, 60)
+                engine.apply(*columns)
+                engine.run_local_detection(period * 60)
+            previous = period
+
+        for engine, reference in zip(engines, expected):
+            self.assertTrue(any(summary(reference.archived).values()))
+            self.assertDictEqual(summary(engine.archived), summary(reference.archived))
+
+    def test_devices_with_own_clock(self) -> None:
+        """Devices with their own scan clock detect the same groups of the shared clock pool."""
+        config = SimpleNamespace(friend_threshold=3, inactive_threshold=4)
+        pool = DevicePool(8, config)
+        devices = [Device(uid, config) for uid in range(8)]
+        for period, events in enumerate(random_periods(8, 300, 3, activity=0.5), start=1):
+            columns = [np.array(c) for c in zip(*events)] if events else [[], [], []]
+            pool.apply(*columns)
+            pool.run_local_detection(period * 60)
+            for uid1, uid2, is_up in events:
+                for device, other in ((devices[uid1], uid2), (devices[uid2], uid1)):
+                    if is_up:
+                        device.add_connection(other)
+                    else:
+                        device.remove_connection(other)
+            for device in devices:
+                device.run_local_detection(period * 60)
+
+        expected = summary(pool.archived)
+        self.assertTrue(any(expected.values()))
+        self.assertDictEqual(summary({d.uid: d.archived for d in devices}), expected)
+        with self.assertRaises(RuntimeError):
+            pool.devices[0].fast_forward(0, 1, 60)
+
+    def test_device_subset(self) -> None:
+        """Engines simulating a subset of the devices find the same groups for them."""
+        config = SimpleNamespace(friend_threshold=3, inactive_threshold=2)
+        uids = [1, 4, 5, 9]
+        engines = [DevicePool(12, config), DevicePool(12, config, uids),
+                   VectorizedDetector(12, config, dense=True, uids=uids),
+                   VectorizedDetector(12, config, dense=False, uids=uids)]
+        for period, events in enumerate(random_periods(12, 400, 11), start=1):
+            columns = [np.array(c) for c in zip(*events)] if events else [[], [], []]
+            for engine in engines:
+                engine.apply(*columns)
+                engine.run_local_detection(period * 60)
+
+        expected = {uid: groups for uid, groups in summary(engines[0].archived).items()
+                    if uid in uids}
+        self.assertTrue(any(expected.values()))
+        for engine in engines[1:]:
+            self.assertDictEqual(summary(engine.archived), expected)
+
+    def test_interned_members(self) -> None:
+        """Equal members sets archived by different devices are the same object."""
+        config = SimpleNamespace(friend_threshold=1, inactive_threshold=1)
+        for engine in (DevicePool(4, config), VectorizedDetector(4, config, dense=True),
+                       VectorizedDetector(4, config, dense=False)):
+            engine.apply(np.array([0, 0, 1]), np.array([1, 2, 2]), np.array([True] * 3))
+            for period in range(1, 4):
+                engine.run_local_detection(period * 60)
+            engine.apply(np.array([0, 0, 1]), np.array([1, 2, 2]), np.array([False] * 3))
+            for period in range(4, 8):
+                engine.run_local_detection(period * 60)
+
+            groups = [group for uid in range(3) for group in engine.archived[uid]]
+            self.assertEqual(len(groups), 3)
+            self.assertEqual(groups[0].members, frozenset({0, 1, 2}))
+            self.assertTrue(all(group.members is groups[0].members for group in groups))
+            with self.assertRaises(AttributeError):
+                groups[0].members = frozenset()